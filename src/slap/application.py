@@ -35,9 +35,12 @@ class Command(_BaseCommand):
     description: str
 
     def __init_subclass__(cls) -> None:
-        if not cls.help:
-            first_line, remainder = (cls.__doc__ or "").partition("\n")[::2]
+        # NOTE: The help and description are taken from the docstring of the class itself, not from a base class.
+        if "help" not in cls.__dict__ and cls.__doc__:
+            first_line, remainder = cls.__doc__.partition("\n")[::2]
             cls.help = (first_line.strip() + "\n" + textwrap.dedent(remainder)).strip()
+            if "description" not in cls.__dict__:
+                cls.description = cls.help.splitlines()[0]
         cls.description = cls.description or (cls.help.strip().splitlines()[0] if cls.help else None) or ""
 
         # TODO (@NiklasRosenstein): Implement automatic wrapping of description text, but we
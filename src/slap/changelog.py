@@ -4,6 +4,11 @@ import abc
 import copy
 import dataclasses
 import datetime
+import functools
+import json
+import logging
+import os
+import re
 import typing as t
 import uuid
 from pathlib import Path
@@ -13,10 +18,22 @@ from databind.core.settings import Alias
 from slap.util.weak_property import weak_property
 
 if t.TYPE_CHECKING:
+    from databind.core import ObjectMapper
+    from databind.core.schema import Schema
     from poetry.core.constraints.version import Version  # type: ignore[import]
+    from typeapi import TypeHint
 
     from slap.repository import RepositoryHost
 
+logger = logging.getLogger(__name__)
+
+#: The minimum number of changelog files that need to be parsed for #ChangelogManager.preload() to use worker
+#: processes. Below that, starting the processes takes longer than parsing the files.
+PARALLEL_LOAD_THRESHOLD = 32
+
+#: Matches the name of an entry file without its suffix, see #ChangelogManager.get_entry_path().
+ENTRY_FILENAME_REGEX = re.compile(r"\d{8}T\d{12}Z-(?P<id>.+)")
+
 
 def is_url(s: str) -> bool:
     return s.startswith("http://") or s.startswith("https://")
@@ -47,11 +64,42 @@ class Changelog:
     entries: list[ChangelogEntry] = dataclasses.field(default_factory=list)
     release_date: t.Annotated[datetime.date | None, Alias("release-date")] = None
 
+    #: An index of the positions of the #entries by their ID, see #find_entry(). It is built for a specific list of
+    #: entries and the number of entries in that list that it covers.
+    _entry_index: tuple[list[ChangelogEntry], int, dict[str, int]] | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def find_entry(self, entry_id: str) -> ChangelogEntry | None:
-        for entry in self.entries:
-            if entry.id == entry_id:
-                return entry
-        return None
+        """Returns the first entry with the given ID.
+
+        Lookups use an index of the positions of the entries, which is extended when entries are appended and rebuilt
+        when #entries is assigned a new list or becomes shorter. Other in-place modifications of #entries must be
+        followed by a call to #invalidate_entry_index()."""
+
+        position = self._get_entry_positions().get(entry_id)
+        if position is not None and self.entries[position].id != entry_id:
+            self.invalidate_entry_index()
+            position = self._get_entry_positions().get(entry_id)
+        return None if position is None else self.entries[position]
+
+    def _get_entry_positions(self) -> dict[str, int]:
+        """Internal. Returns the positions of the #entries by their ID, indexing the entries that were appended since
+        the last call."""
+
+        index = self._entry_index
+        if index is None or index[0] is not self.entries or index[1] > len(self.entries):
+            index = (self.entries, 0, {})
+        entries, count, positions = index
+        for position in range(count, len(entries)):
+            positions.setdefault(entries[position].id, position)
+        self._entry_index = (entries, len(entries), positions)
+        return positions
+
+    def invalidate_entry_index(self) -> None:
+        """Discards the index that is used by #find_entry()."""
+
+        self._entry_index = None
 
 
 class ChangelogDeser(abc.ABC):
@@ -67,31 +115,92 @@ class ChangelogDeser(abc.ABC):
     @abc.abstractmethod
     def dump_entry(self, entry: ChangelogEntry) -> str: ...
 
+    def dump_appended_entry(self, entry: ChangelogEntry, text: str) -> str | None:  # noqa: ARG002
+        """Returns the text to append to the serialized changelog *text* such that it contains the *entry* as well,
+        or `None` if that is not possible. The caller must then dump the whole changelog instead."""
+
+        return None
+
+
+@functools.cache
+def _get_dataclass_schema(type_: type) -> Schema:
+    from databind.core.schema import convert_to_schema
+    from typeapi import TypeHint
+
+    return convert_to_schema(TypeHint(type_))
+
+
+def _convert_changelog_to_schema(hint: TypeHint) -> Schema:
+    type_ = getattr(hint, "type", None)
+    if type_ in (Changelog, ChangelogEntry):
+        return _get_dataclass_schema(type_)
+    raise ValueError(f"not a changelog type: {hint}")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_object_mapper() -> ObjectMapper[t.Any, t.Any]:
+    """Returns a JSON object mapper that reuses the schemas of #Changelog and #ChangelogEntry. Databind converts the
+    dataclass to a schema again for every object that it de/serializes, which is most of the time spent on loading
+    a changelog otherwise."""
+
+    import databind.json
+    from databind.json.converters import SchemaConverter
+
+    mapper = databind.json.get_object_mapper()
+    mapper.module.register(SchemaConverter(convert_to_schema=_convert_changelog_to_schema), first=True)
+    return mapper
+
 
 class TomlChangelogDeser(ChangelogDeser):
     def load(self, fp: t.TextIO, filename: str) -> Changelog:
-        import databind.json
         import tomli
 
-        return databind.json.load(tomli.loads(fp.read()), Changelog, filename=filename)
+        return t.cast(Changelog, _get_object_mapper().deserialize(tomli.loads(fp.read()), Changelog, filename))
 
     def dump(self, changelog: Changelog) -> str:
-        import databind.json
         import tomli_w
         from databind.core.settings import SerializeDefaults
 
-        data = databind.json.dump(changelog, Changelog, settings=[SerializeDefaults(False)])
+        data = _get_object_mapper().serialize(changelog, Changelog, settings=[SerializeDefaults(False)])
         return tomli_w.dumps(t.cast(dict, data))
 
     def dump_entry(self, entry: ChangelogEntry) -> str:
-        import databind.json
         import tomli_w
         from databind.core.settings import SerializeDefaults
 
         return tomli_w.dumps(
-            t.cast(dict, databind.json.dump(entry, ChangelogEntry, settings=[SerializeDefaults(False)]))
+            t.cast(dict, _get_object_mapper().serialize(entry, ChangelogEntry, settings=[SerializeDefaults(False)]))
         )
 
+    def dump_appended_entry(self, entry: ChangelogEntry, text: str) -> str | None:
+        import tomli
+
+        # An inline array of entries cannot be continued with an array of tables.
+        if re.search(r"^\s*entries\s*=", text, re.MULTILINE):
+            return None
+
+        fragment = "[[entries]]\n" + self.dump_entry(entry)
+        if _get_object_mapper().deserialize(tomli.loads(fragment), Changelog).entries != [entry]:
+            return None
+        if text:
+            fragment = ("\n" if text.endswith("\n") else "\n\n") + fragment
+        return fragment
+
+
+def _load_changelog_file(deser: ChangelogDeser, path: Path) -> Changelog | None:
+    """Loads the changelog at *path*. Returns `None` if the file cannot be read, decoded or converted to a #Changelog,
+    so that the error is raised again when the changelog is loaded. Other errors are raised. Used in worker
+    processes."""
+
+    from databind.core.converter import ConversionError
+
+    try:
+        with path.open("r") as fp:
+            return deser.load(fp, str(fp.name))
+    except (OSError, ValueError, TypeError, ConversionError) as exc:
+        logger.debug("Could not load changelog %s: %s", path, exc)
+        return None
+
 
 class ManagedChangelog:
     _manager: "ChangelogManager" = weak_property("_ManagedChangelog__manager")
@@ -111,13 +220,70 @@ class ManagedChangelog:
         return self.load()
 
     def exists(self) -> bool:
-        return self.path.exists()
+        return self.path.exists() or bool(self.entry_paths())
+
+    def entry_paths(self) -> list[Path]:
+        """Returns the files in the #ChangelogManager.unreleased_dirname directory, which contain unreleased entries
+        in addition to the unreleased changelog file. They are sorted by name, which is the order in which the entries
+        were added (see #ChangelogManager.get_entry_path()). Released changelogs have no entry files."""
+
+        if self.version is not None:
+            return []
+        return sorted((self._manager.directory / self._manager.unreleased_dirname).glob("*.toml"))
+
+    def files(self) -> list[Path]:
+        """Returns the existing files that make up the changelog."""
+
+        return ([self.path] if self.path.exists() else []) + self.entry_paths()
 
     def load(self, reload: bool = False) -> Changelog:
         if self._content is None or reload:
-            self._content = self._manager.load(self.path)
+            entry_paths = self.entry_paths()
+            if entry_paths:
+                self._content = self.aggregate({path: self._manager.load(path) for path in self.files()})
+            else:
+                self._content = self._manager.load(self.path)
         return self._content
 
+    def aggregate(self, contents: t.Mapping[Path, Changelog]) -> Changelog:
+        """Combines the contents of the changelog file and of the entry files into one changelog. The entries are
+        appended in the order of *contents*."""
+
+        changelog = copy.copy(contents[self.path]) if self.path in contents else Changelog()
+        changelog.entries = list(changelog.entries)
+        for path, content in contents.items():
+            if path != self.path:
+                changelog.entries += content.entries
+        return changelog
+
+    def add_entry(self, entry: ChangelogEntry) -> Path:
+        """Adds an *entry* to the unreleased changelog without rewriting the existing entries. If
+        #ChangelogManager.entry_files is enabled, the entry is written to its own file. Otherwise it is appended to
+        the changelog file, unless the #ChangelogDeser does not support that for the file. Returns the path of the
+        file that was written."""
+
+        if self.version is not None:
+            raise RuntimeError("entries can only be added to the unreleased changelog")
+
+        path = self._write_new_entry(entry)
+        if self._content is not None:
+            self._content.entries.append(entry)
+        return path
+
+    def _write_new_entry(self, entry: ChangelogEntry) -> Path:
+        """Internal. Writes an *entry* that is not yet contained in any of the #files() like #add_entry()."""
+
+        if self._manager.entry_files:
+            path = self._manager.get_entry_path(entry)
+            self._manager.save(Changelog([entry]), path)
+        else:
+            path = self.path
+            if not self._manager.append_entry(entry, path):
+                changelog = self._manager.load(path) if path.exists() else Changelog()
+                changelog.entries.append(entry)
+                self._manager.save(changelog, path)
+        return path
+
     def save(self, changelog: Changelog | None) -> None:
         if changelog is None:
             if self._content is None:
@@ -129,7 +295,67 @@ class ManagedChangelog:
             )
         if changelog.release_date is not None and self.path.name == self._manager.unreleased_fn:
             raise RuntimeError(f"changelog with release date must be a version (but is {self.path.name})")
-        self._manager.save(changelog, self.path)
+
+        if self.version is None and (self._manager.entry_files or self.entry_paths()):
+            self._save_entries(changelog)
+        else:
+            self._manager.save(changelog, self.path)
+
+    def _save_entries(self, changelog: Changelog) -> None:
+        """Internal. Saves the unreleased *changelog* when its entries may be spread over the changelog file and entry
+        files. Every entry is written back to the file that it was loaded from, and only files whose entries changed
+        are written. Files of entries that were removed from the *changelog* are deleted, except for the changelog
+        file. Entries that are not contained in any file yet are added like with #add_entry(). Because the order of
+        the entries is given by their files, entries cannot be reordered this way."""
+
+        contents = {path: self._manager.load(path) for path in self.files()}
+        paths_by_id: dict[str, Path] = {}
+        for path, content in contents.items():
+            for entry in content.entries:
+                paths_by_id.setdefault(entry.id, path)
+
+        new_contents = {path: dataclasses.replace(content, entries=[]) for path, content in contents.items()}
+        new_entries = []
+        for entry in changelog.entries:
+            if entry.id in paths_by_id:
+                new_contents[paths_by_id[entry.id]].entries.append(entry)
+            else:
+                new_entries.append(entry)
+
+        for path, content in new_contents.items():
+            if content == contents[path]:
+                continue
+            if content.entries or path == self.path:
+                self._manager.save(content, path)
+            else:
+                self._manager.remove(path)
+        for entry in new_entries:
+            self._write_new_entry(entry)
+
+    def migrate_to_entry_files(self) -> list[Path]:
+        """Moves the entries of the unreleased changelog file into entry files and removes the changelog file, keeping
+        the order of all entries. Entries that are already in an entry file keep it, unless that would change their
+        order. Returns the entry files that were written."""
+
+        if self.version is not None:
+            raise RuntimeError("only the unreleased changelog has entry files")
+
+        changelog = self.load(reload=True)
+        stale = set(self.files())
+        paths_by_id = {_get_entry_id(path): path for path in self.entry_paths()}
+        written = []
+        previous = ""
+        for entry in changelog.entries:
+            path = paths_by_id.get(entry.id)
+            if path is None or path.name <= previous:
+                path = self._manager.get_entry_path(entry)
+                self._manager.save(Changelog([entry]), path)
+                written.append(path)
+            stale.discard(path)
+            previous = path.name
+        for path in sorted(stale):
+            self._manager.remove(path)
+        return written
 
     def release(self, version: str) -> None:
         """Releases the changelog as the specified version."""
@@ -141,7 +367,142 @@ class ManagedChangelog:
         content.release_date = datetime.date.today()
         target = self._manager.version(version)
         target.save(content)
-        self.path.unlink()
+        for path in self.files():
+            self._manager.remove(path)
+
+
+def _get_entry_id(path: Path) -> str:
+    """Internal. Returns the ID of the changelog entry that is stored in the entry file at *path*."""
+
+    match = ENTRY_FILENAME_REGEX.fullmatch(path.stem)
+    return match.group("id") if match else path.stem
+
+
+@functools.cache
+def _get_entry_value_types() -> dict[str, tuple[type, bool]]:
+    """Internal. Returns the type of the value of every #ChangelogEntry field, which is `str` or `list` (of strings),
+    and whether the field accepts `None`. Raises a #TypeError if a field has a type that #_changelog_from_index_data()
+    does not support."""
+
+    import types
+
+    result: dict[str, tuple[type, bool]] = {}
+    hints = t.get_type_hints(ChangelogEntry)
+    for field in dataclasses.fields(ChangelogEntry):
+        hint: t.Any = hints[field.name]
+        optional = False
+        if isinstance(hint, types.UnionType) and type(None) in t.get_args(hint):
+            (hint,) = (arg for arg in t.get_args(hint) if arg is not type(None))
+            optional = True
+        if hint is str:
+            result[field.name] = (str, optional)
+        elif t.get_origin(hint) is list and t.get_args(hint) == (str,):
+            result[field.name] = (list, optional)
+        else:
+            raise TypeError(f"unsupported type for changelog entry field {field.name!r}: {hint}")
+    return result
+
+
+def _changelog_from_index_data(data: t.Any) -> Changelog:
+    """Internal. Creates a #Changelog from the JSON that #_get_object_mapper() serialized it to. This is much faster
+    than deserializing it with the mapper, which takes about as long as parsing the changelog file in the first place.
+    The values of the entries are validated against the types of the #ChangelogEntry fields. Raises a #ValueError if
+    *data* does not have the expected structure."""
+
+    value_types = _get_entry_value_types()
+    if (
+        not isinstance(data, dict)
+        or data.keys() != {"entries", "release-date"}
+        or not isinstance(data["entries"], list)
+    ):
+        raise ValueError("invalid changelog data")
+
+    entries = []
+    for item in data["entries"]:
+        if not isinstance(item, dict) or item.keys() != value_types.keys():
+            raise ValueError("invalid changelog entry data")
+        values: dict[str, t.Any] = {}
+        for key, value in item.items():
+            value_type, optional = value_types[key]
+            if value is None and optional:
+                values[key] = None
+            elif value_type is str and isinstance(value, str):
+                values[key] = value
+            elif value_type is list and isinstance(value, list) and all(isinstance(v, str) for v in value):
+                values[key] = list(value)
+            else:
+                raise ValueError(f"invalid value for changelog entry field {key!r}: {value!r}")
+        entries.append(ChangelogEntry(**values))
+
+    release_date = data["release-date"]
+    return Changelog(entries, datetime.date.fromisoformat(release_date) if release_date is not None else None)
+
+
+class ChangelogIndex:
+    """A cache of the deserialized contents of the changelog files in a directory. Entries are keyed by the path of
+    the file relative to the directory and are only valid as long as the file's modification time and size did not
+    change, so only changed files need to be parsed again. The index is stored as a JSON file, so reading an index
+    that was tampered with can not execute code."""
+
+    #: The version of the file format. Index files with a different version are ignored.
+    FORMAT = 2
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._entries: dict[str, tuple[int, int, t.Any]] = {}
+        self._dirty = False
+
+        try:
+            with path.open(encoding="utf-8") as fp:
+                data = json.load(fp)
+            if data["format"] == self.FORMAT:
+                self._entries = {
+                    key: (int(mtime_ns), int(size), changelog)
+                    for key, (mtime_ns, size, changelog) in data["entries"].items()
+                }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.debug("Ignoring invalid changelog index %s: %s", path, exc)
+
+    def get(self, key: str, stat: os.stat_result) -> Changelog | None:
+        """Returns a new copy of the cached changelog for the file *key* if it is up to date with its *stat*."""
+
+        entry = self._entries.get(key)
+        if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+            return None
+        try:
+            return _changelog_from_index_data(entry[2])
+        except (ValueError, TypeError) as exc:
+            logger.debug("Ignoring invalid changelog index entry %s: %s", key, exc)
+            return None
+
+    def put(self, key: str, stat: os.stat_result, changelog: Changelog) -> None:
+        self._entries[key] = (stat.st_mtime_ns, stat.st_size, _get_object_mapper().serialize(changelog, Changelog))
+        self._dirty = True
+
+    def prune(self, keys: t.Collection[str]) -> None:
+        """Removes entries for files that are not in *keys*."""
+
+        for key in self._entries.keys() - set(keys):
+            del self._entries[key]
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Writes the index to disk if it was modified."""
+
+        from slap.util.fs import atomic_write
+
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self.path, "w", None) as fp:
+                json.dump({"format": self.FORMAT, "entries": self._entries}, fp)
+        except OSError as exc:
+            logger.warning("Could not write changelog index %s: %s", self.path, exc)
+        else:
+            self._dirty = False
 
 
 @dataclasses.dataclass
@@ -157,6 +518,13 @@ class ChangelogManager:
     #: The name of the file that contains the unreleased changes.
     unreleased_fn: str = "_unreleased.toml"
 
+    #: The name of the directory that contains unreleased entries in separate files, in addition to the unreleased
+    #: changelog file. Keeping entries in separate files avoids merge conflicts in busy repositories.
+    unreleased_dirname: str = "_unreleased"
+
+    #: If enabled, new unreleased entries are written to their own file in the #unreleased_dirname directory.
+    entry_files: bool = False
+
     #: The template to describe the filenames of released changedlogs.
     version_fn_template: str = "{version}.toml"
 
@@ -169,12 +537,54 @@ class ChangelogManager:
     #: If enabled, write operations to the changelog directory are disabled.
     readonly: bool = False
 
+    #: A directory in which the parsed changelogs are cached in a #ChangelogIndex. If not set, changelogs are
+    #: always parsed from their files. This should not be located in the repository, as the index would otherwise
+    #: be shared with anyone that can commit to it. The index is not written by a #readonly manager.
+    cache_directory: Path | None = None
+
+    _index: ChangelogIndex | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
+    #: The timestamp of the last path returned by #get_entry_path().
+    _last_entry_timestamp: datetime.datetime | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def load(self, file: Path | t.TextIO) -> Changelog:
         if isinstance(file, Path):
-            with file.open("r") as fp:
-                return self.load(fp)
+            index = self._get_index()
+            key = self._get_index_key(file)
+            if index is None or key is None:
+                with file.open("r") as fp:
+                    return self.load(fp)
+
+            # NOTE: The file is stat'ed before it is read, such that changes while reading invalidate the entry.
+            stat = file.stat()
+            changelog = index.get(key, stat)
+            if changelog is None:
+                with file.open("r") as fp:
+                    changelog = self.load(fp)
+                index.put(key, stat, changelog)
+            return changelog
+
         return self.deser.load(file, str(file))
 
+    def _get_index(self) -> ChangelogIndex | None:
+        if self.cache_directory is None:
+            return None
+        if self._index is None:
+            import hashlib
+
+            digest = hashlib.sha256(str(self.directory.resolve()).encode()).hexdigest()[:16]
+            self._index = ChangelogIndex(self.cache_directory / "changelog-index" / f"{digest}.json")
+        return self._index
+
+    def _get_index_key(self, file: Path) -> str | None:
+        if file.parent == self.directory:
+            return file.name
+        if file.parent == self.directory / self.unreleased_dirname:
+            return f"{self.unreleased_dirname}/{file.name}"
+        return None
+
     def save(self, changelog: Changelog, file: Path | t.TextIO) -> None:
         if self.readonly:
             raise RuntimeError(f'"{self.directory}" is readonly')
@@ -185,6 +595,40 @@ class ChangelogManager:
         else:
             self.deser.save(changelog, file, str(file))
 
+    def append_entry(self, entry: ChangelogEntry, file: Path) -> bool:
+        """Appends the *entry* to the changelog *file* without reading the existing entries. Returns `False` if the
+        #deser cannot append to the file, in which case it is not modified."""
+
+        if self.readonly:
+            raise RuntimeError(f'"{self.directory}" is readonly')
+        text = file.read_text() if file.exists() else ""
+        fragment = self.deser.dump_appended_entry(entry, text)
+        if fragment is None:
+            return False
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with file.open("a") as fp:
+            fp.write(fragment)
+        return True
+
+    def remove(self, file: Path) -> None:
+        if self.readonly:
+            raise RuntimeError(f'"{self.directory}" is readonly')
+        file.unlink()
+
+    def get_entry_path(self, entry: ChangelogEntry) -> Path:
+        """Returns a new path for the file of an unreleased *entry* in the #unreleased_dirname directory. The filename
+        starts with the current time in UTC, so sorting the entry files by name keeps the entries in the order in which
+        they were added. Every call returns a name that sorts after the one returned by the previous call."""
+
+        if not re.fullmatch(r"[\w.-]+", entry.id):
+            raise ValueError(f"changelog entry ID cannot be used as a filename: {entry.id!r}")
+
+        timestamp = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        if self._last_entry_timestamp is not None and timestamp <= self._last_entry_timestamp:
+            timestamp = self._last_entry_timestamp + datetime.timedelta(microseconds=1)
+        self._last_entry_timestamp = timestamp
+        return self.directory / self.unreleased_dirname / f"{timestamp:%Y%m%dT%H%M%S%f}Z-{entry.id}.toml"
+
     def unreleased(self) -> ManagedChangelog:
         return ManagedChangelog(self, self.directory / self.unreleased_fn, None)
 
@@ -202,8 +646,68 @@ class ChangelogManager:
         unreleased = self.unreleased()
         if unreleased.exists():
             changelogs.insert(0, unreleased)
+
+        # Drop files that no longer exist from the index. It is written back by #preload().
+        index = self._get_index()
+        if index is not None:
+            index.prune(
+                [t.cast(str, self._get_index_key(path)) for changelog in changelogs for path in changelog.files()]
+            )
+
         return changelogs
 
+    def preload(self, changelogs: t.Sequence[ManagedChangelog], jobs: int | None = None) -> None:
+        """Loads the contents of all *changelogs* that are not loaded yet. If there are enough files that are not
+        in the #ChangelogIndex, they are parsed in a pool of *jobs* worker processes (defaults to the number of
+        CPUs). Files that cannot be parsed are left unloaded, so the error is raised by #ManagedChangelog.load().
+        Unless the manager is #readonly, the index is written back once at the end."""
+
+        index = self._get_index()
+        unloaded = [changelog for changelog in changelogs if changelog._content is None]
+        contents: dict[Path, Changelog | None] = {}
+        pending: list[tuple[Path, str | None, os.stat_result | None]] = []
+        for changelog in unloaded:
+            for path in changelog.files():
+                key = self._get_index_key(path)
+                if index is None or key is None:
+                    pending.append((path, None, None))
+                    continue
+                try:
+                    path_stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                contents[path] = index.get(key, path_stat)
+                if contents[path] is None:
+                    pending.append((path, key, path_stat))
+
+        paths = [path for path, _, _ in pending]
+        jobs = min(jobs or os.cpu_count() or 1, len(paths))
+        if jobs > 1 and len(paths) >= PARALLEL_LOAD_THRESHOLD:
+            import itertools
+            from concurrent.futures import ProcessPoolExecutor
+
+            logger.debug("Parsing %d changelog files in %d worker processes", len(paths), jobs)
+            with ProcessPoolExecutor(jobs) as executor:
+                chunksize = max(1, len(paths) // (jobs * 4))
+                results = list(
+                    executor.map(_load_changelog_file, itertools.repeat(self.deser), paths, chunksize=chunksize)
+                )
+        else:
+            results = [_load_changelog_file(self.deser, path) for path in paths]
+
+        for (path, key, stat), content in zip(pending, results, strict=True):
+            contents[path] = content
+            if content is not None and index is not None and key is not None and stat is not None:
+                index.put(key, stat, content)
+
+        for changelog in unloaded:
+            files = changelog.files()
+            if files and all(contents.get(path) is not None for path in files):
+                changelog._content = changelog.aggregate({path: t.cast(Changelog, contents[path]) for path in files})
+
+        if index is not None and not self.readonly:
+            index.flush()
+
     def make_entry(
         self,
         change_type: str,
@@ -223,9 +727,9 @@ class ChangelogManager:
             raise ValueError(f"invalid change type: {change_type}")
 
         if pr is not None and self.repository_host:
-            pr = self.repository_host.get_pull_request_by_reference(pr).url
+            pr = self.repository_host.resolve_pull_request(pr).url
         if issues is not None and self.repository_host:
-            issues = [self.repository_host.get_issue_by_reference(i).url or i for i in issues]
+            issues = [self.repository_host.resolve_issue(i).url or i for i in issues]
 
         changelog_id = str(uuid.uuid4())
         return ChangelogEntry(
@@ -249,6 +753,27 @@ class ChangelogManager:
             raise ValueError("empty string in author(s)")
         if self.repository_host:
             if entry.pr:
-                entry.pr = self.repository_host.get_pull_request_by_reference(entry.pr).url
+                entry.pr = self.repository_host.resolve_pull_request(entry.pr).url
             if entry.issues:
-                entry.issues = [self.repository_host.get_issue_by_reference(issue).url for issue in entry.issues]
+                entry.issues = [self.repository_host.resolve_issue(issue).url for issue in entry.issues]
+
+    def validate_entries(self, entries: t.Sequence[ChangelogEntry]) -> list[ValueError | None]:
+        """Validates all *entries* like #validate_entry(). The PR and issue references of all entries are resolved
+        in one batch through the #repository_host first. Returns the validation error for each entry, or `None` if
+        the entry is valid."""
+
+        if self.repository_host:
+            self.repository_host.resolve_references(
+                issues=[issue for entry in entries for issue in entry.issues or ()],
+                pull_requests=[entry.pr for entry in entries if entry.pr],
+            )
+
+        errors: list[ValueError | None] = []
+        for entry in entries:
+            try:
+                self.validate_entry(entry)
+            except ValueError as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+        return errors
@@ -89,7 +89,7 @@ class AddCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             dependencies[dependency.name] = dependency
 
         python = PythonEnvironment.of(get_active_python_bin(self))
-        distributions = python.get_distributions(dependencies.keys())
+        distributions = python.get_distributions_metadata(dependencies.keys())
         where = "dev" if self.option("dev") else (self.option("extra") or "run")
 
         to_install = (
@@ -113,7 +113,7 @@ class AddCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             if status_code != 0:
                 return status_code
 
-        distributions.update(python.get_distributions({k for k in distributions if distributions[k] is None}))
+        distributions.update(python.get_distributions_metadata({k for k in distributions if distributions[k] is None}))
         for dep_name, dependency in dependencies.items():
             dist = distributions[dep_name]
             if not dist:
@@ -65,6 +65,11 @@ class ChangelogConfig:
         default_factory=lambda: list(DEFAULT_VALID_TYPES)
     )
 
+    #: Whether to write new unreleased changelog entries to their own file in the `_unreleased/` directory inside
+    #: the changelog directory, instead of appending them to the `_unreleased.toml` file. This avoids merge
+    #: conflicts when many branches add changelog entries at the same time.
+    entry_files: t.Annotated[bool, Alias("entry-files")] = False
+
 
 class BaseChangelogCommand(Command):
     def __init__(self, app: Application, manager: ChangelogManager) -> None:
@@ -193,10 +198,7 @@ class ChangelogAddCommand(BaseChangelogCommand):
             return 1
 
         entry = self.manager.make_entry(change_type, description, author, pr, issues, component)
-        unreleased = self.manager.unreleased()
-        changelog = unreleased.content if unreleased.exists() else Changelog()
-        changelog.entries.append(entry)
-        unreleased.save(changelog)
+        path = self.manager.unreleased().add_entry(entry)
 
         print(toml_highlight(self.manager.deser.dump_entry(entry)))
 
@@ -208,7 +210,7 @@ class ChangelogAddCommand(BaseChangelogCommand):
             if relative != Path("."):
                 prefix = str(relative).replace("\\", "/").strip("/")
                 commit_message = f"{prefix}/: {commit_message}"
-            vcs.commit_files([unreleased.path], commit_message)
+            vcs.commit_files([path], commit_message)
 
         return 0
 
@@ -300,39 +302,68 @@ class ChangelogDiffBaseCommand(Command):
     def get_diff(self, manager: ChangelogManager) -> ChangelogDiff:
         """Calculates the difference in the unreleased changelogs for the given changelog manager."""
 
-        changelog_path = manager.unreleased().path
+        return self.get_diffs([manager])[0]
+
+    def get_diffs(self, managers: t.Sequence[ChangelogManager]) -> list[ChangelogDiff]:
+        """Calculates the difference in the unreleased changelogs for each of the given changelog managers. The
+        changelog files at the base and head revision are listed and read from the VCS all at once."""
 
-        # Load the old changelog contents.
-        old_changelog: Changelog | None = None
-        old_data = self.vcs.get_file_contents(changelog_path, self.base_ref)
-        if old_data is not None:
-            old_changelog = manager.load(io.StringIO(old_data.decode()))
+        revisions = [self.base_ref] if self.head_ref is None else [self.base_ref, self.head_ref]
+        entry_directories = [manager.directory / manager.unreleased_dirname for manager in managers]
+        files_at_revision = {
+            revision: set(self.vcs.get_files_at_revision(revision, entry_directories)) for revision in revisions
+        }
 
-        # Load the new changelog contents.
-        new_changelog: Changelog | None = None
-        if self.head_ref:
-            new_data = self.vcs.get_file_contents(changelog_path, self.head_ref)
-            if new_data is not None:
-                new_changelog = manager.load(io.StringIO(new_data.decode()))
-        elif changelog_path.is_file():
-            new_changelog = manager.load(changelog_path)
+        # Collect the changelog file and the entry files of each manager at each revision.
+        requests: list[tuple[Path, str]] = []
+        groups: dict[tuple[int, str], range] = {}
+        for index, (manager, entry_directory) in enumerate(zip(managers, entry_directories, strict=True)):
+            for revision in revisions:
+                entry_paths = sorted(p for p in files_at_revision[revision] if p.parent == entry_directory)
+                start = len(requests)
+                requests += [(manager.unreleased().path, revision)]
+                requests += [(path, revision) for path in entry_paths if path.suffix == ".toml"]
+                groups[index, revision] = range(start, len(requests))
+        contents = self.vcs.get_files_contents(requests)
+
+        def load(index: int, revision: str) -> Changelog | None:
+            changelogs = {
+                requests[i][0]: managers[index].load(io.StringIO(data.decode()))
+                for i in groups[index, revision]
+                if (data := contents[i]) is not None
+            }
+            return managers[index].unreleased().aggregate(changelogs) if changelogs else None
+
+        diffs = []
+        for index, manager in enumerate(managers):
+            old_changelog = load(index, self.base_ref)
+            new_changelog: Changelog | None = None
+            if self.head_ref:
+                new_changelog = load(index, self.head_ref)
+            elif manager.unreleased().exists():
+                new_changelog = manager.unreleased().load()
+            diffs.append(self._diff_changelogs(old_changelog, new_changelog))
+
+        return diffs
+
+    @staticmethod
+    def _diff_changelogs(old_changelog: Changelog | None, new_changelog: Changelog | None) -> ChangelogDiff:
+        """Compares the entries of two changelogs by their ID. Added, updated and unchanged entries are in the order
+        of the new changelog, removed entries in the order of the old changelog."""
 
         old_entries = {e.id: e for e in old_changelog.entries} if old_changelog else {}
         new_entries = {e.id: e for e in new_changelog.entries} if new_changelog else {}
 
         diff = ChangelogDiff()
-        for entry_id in {*old_entries, *new_entries}:
-            if entry_id in old_entries and entry_id in new_entries:
-                if old_entries[entry_id] == new_entries[entry_id]:
-                    diff.unchanged_entries.append(old_entries[entry_id])
-                else:
-                    diff.updated_entries.append((old_entries[entry_id], new_entries[entry_id]))
-            elif entry_id not in new_entries:
-                diff.removed_entries.append(old_entries[entry_id])
-            elif entry_id not in old_entries:
-                diff.added_entries.append(new_entries[entry_id])
+        for entry_id, new_entry in new_entries.items():
+            old_entry = old_entries.get(entry_id)
+            if old_entry is None:
+                diff.added_entries.append(new_entry)
+            elif old_entry == new_entry:
+                diff.unchanged_entries.append(old_entry)
             else:
-                assert False, "whaat?"
+                diff.updated_entries.append((old_entry, new_entry))
+        diff.removed_entries += [entry for entry_id, entry in old_entries.items() if entry_id not in new_entries]
 
         return diff
 
@@ -381,14 +412,11 @@ class ChangelogDiffUpdatePrCommand(ChangelogDiffBaseCommand):
         total_updates = 0
         changed_files: list[Path] = []
 
-        for manager in self.managers.values():
+        managers = [manager for manager in self.managers.values() if manager.unreleased().exists()]
+        for manager, diff in zip(managers, self.get_diffs(managers), strict=True):
             changelog_ref = manager.unreleased()
-            if not changelog_ref.exists():
-                continue
-
             num_updates = 0
             changelog = changelog_ref.load()
-            diff = self.get_diff(manager)
             for entry_id in (e.id for e in diff.added_entries):
                 entry = changelog.find_entry(entry_id)
                 if entry is None:
@@ -404,8 +432,9 @@ class ChangelogDiffUpdatePrCommand(ChangelogDiffBaseCommand):
 
             if not self.option("dry") and num_updates > 0:
                 self.line(f"updated <i>{num_updates}</i> entries in <fg=yellow>{changelog_ref.path}</fg>", "info")
+                files_before = changelog_ref.files()
                 changelog_ref.save(changelog)
-                changed_files.append(changelog_ref.path)
+                changed_files += dict.fromkeys([*files_before, *changelog_ref.files()])
 
         if total_updates == 0:
             self.line("no entries to update", "info")
@@ -428,8 +457,7 @@ class ChangelogDiffAssertCommand(ChangelogDiffBaseCommand):
     def handle(self) -> int:
         self.validate_arguments()
         added: list[ChangelogEntry] = []
-        for manager in self.managers.values():
-            diff = self.get_diff(manager)
+        for diff in self.get_diffs(list(self.managers.values())):
             added += diff.added_entries
         if not added:
             self.line_error(f"no changelog entries have been added in <code>{self.ref_range}</code>", "error")
@@ -467,6 +495,7 @@ class ChangelogFormatCommand(BaseChangelogCommand):
 
         if self.option("all"):
             changelogs = self.manager.all()
+            self.manager.preload(changelogs)
         elif version := self.argument("version"):
             changelogs = [self.manager.version(version)]
             if not changelogs[0].exists():
@@ -475,6 +504,14 @@ class ChangelogFormatCommand(BaseChangelogCommand):
         else:
             changelogs = [self.manager.unreleased()]
 
+        if self.option("markdown") and self.manager.repository_host:
+            # Resolve the references of all entries up front, so that each distinct reference is resolved only once.
+            entries = [entry for changelog in changelogs if changelog.exists() for entry in changelog.content.entries]
+            self.manager.repository_host.resolve_references(
+                issues=[issue for entry in entries for issue in entry.issues or ()],
+                pull_requests=[entry.pr for entry in entries if entry.pr],
+            )
+
         for changelog in changelogs:
             if self.option("markdown"):
                 self._render_markdown(changelog)
@@ -528,9 +565,9 @@ class ChangelogFormatCommand(BaseChangelogCommand):
         if self.manager.repository_host:
             try:
                 if type == "pr":
-                    item: Issue | PullRequest = self.manager.repository_host.get_pull_request_by_reference(ref)
+                    item: Issue | PullRequest = self.manager.repository_host.resolve_pull_request(ref)
                 else:
-                    item = self.manager.repository_host.get_issue_by_reference(ref)
+                    item = self.manager.repository_host.resolve_issue(ref)
             except ValueError as exc:
                 self.line_error(f"warning: {exc}", "error")
                 url = ref
@@ -669,6 +706,31 @@ class ChangelogConvertCommand(BaseChangelogCommand):
         return match.group(2) if match else None, match.group(1).strip() if match else description
 
 
+class ChangelogMigrateEntryFilesCommand(BaseChangelogCommand):
+    """Move the entries of the unreleased changelog file into entry files.
+
+    Saving the unreleased changelog writes every entry back to the file that it was loaded from. Use this command
+    once after enabling the <opt>entry-files</opt> option to move the existing entries out of <u>_unreleased.toml</u>.
+    """
+
+    name = "changelog migrate-entry-files"
+
+    def handle(self) -> int:
+        if not self.manager.entry_files:
+            self.line_error("error: the <opt>entry-files</opt> option is not enabled", "error")
+            return 1
+
+        unreleased = self.manager.unreleased()
+        if not unreleased.exists():
+            self.line("no unreleased changelog entries to migrate", "info")
+            return 0
+
+        paths = unreleased.migrate_to_entry_files()
+        directory = self.manager.directory / self.manager.unreleased_dirname
+        self.line(f"moved <i>{len(paths)}</i> entries to <fg=yellow>{directory}</fg>", "info")
+        return 0
+
+
 class ChangelogCommandPlugin(ApplicationPlugin):
     def load_configuration(self, app: Application) -> ChangelogManager:
         return get_changelog_manager(app.repository, app.main_project())
@@ -679,11 +741,14 @@ class ChangelogCommandPlugin(ApplicationPlugin):
         app.cleo.add(ChangelogDiffAssertCommand(app))
         app.cleo.add(ChangelogFormatCommand(app, config))
         app.cleo.add(ChangelogConvertCommand(app, config))
+        app.cleo.add(ChangelogMigrateEntryFilesCommand(app, config))
 
 
 def get_changelog_manager(repository: Repository, project: Project | None) -> ChangelogManager:
     import databind.json
 
+    from slap.util.cache import get_user_cache_directory
+
     config = databind.json.load((project or repository).raw_config().get("changelog", {}), ChangelogConfig)
     if config.enabled is None and project:
         config.enabled = project.is_python_project
@@ -693,4 +758,6 @@ def get_changelog_manager(repository: Repository, project: Project | None) -> Ch
         repository_host=repository.host(),
         valid_types=config.valid_types,
         readonly=not config.enabled,
+        entry_files=config.entry_files,
+        cache_directory=get_user_cache_directory(),
     )
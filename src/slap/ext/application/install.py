@@ -16,7 +16,7 @@ from slap.plugins import ApplicationPlugin
 from slap.project import Project
 
 if t.TYPE_CHECKING:
-    from slap.install.installer import Indexes
+    from slap.install.installer import Indexes, InstallOptions, PipInstaller, UvSyncInstaller, UvSyncOptions
     from slap.python.dependency import Dependency
     from slap.python.environment import PythonEnvironment
 
@@ -83,11 +83,43 @@ class InstallConfig:
     dev_extras: t.Annotated[list[str] | None, Alias("dev-extras")] = None
 
 
+def load_install_config(app: Application) -> dict[Configuration, InstallConfig]:
+    """Loads the #InstallConfig for every configuration (i.e. projects and the repository) of the application."""
+
+    from databind.json import load
+
+    result: dict[Configuration, InstallConfig] = {}
+    for obj in app.configurations():
+        result[obj] = load(obj.raw_config().get("install", {}), InstallConfig, filename=str(obj))
+    return result
+
+
+def update_indexes_from_specs(indexes: Indexes, specs: t.Iterable[str]) -> None:
+    """Updates *indexes* from index specs passed on the command-line via `--index` (see #IndexSpec.parse())."""
+
+    from slap.install.installer import IndexSpec
+
+    for extra in specs:
+        spec = IndexSpec.parse(extra)
+        if spec.name in indexes.urls:
+            spec.url = spec.url or indexes.urls[spec.name]
+        else:
+            logger.warning('passed an --index option for a source that does not exist (source: "%s")', spec.name)
+        indexes.urls[spec.name] = spec.url_with_auth
+
+
 class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
-    """Install your project and its dependencies via Pip."""
+    """Install your project and its dependencies via Pip.
+
+    If the repository (or the single project being installed) has a <s>uv.lock</s> file and the target is a virtual
+    environment, the dependencies are installed from the lockfile with <s>uv sync --frozen</s> instead. Use
+    <opt>--no-sync</opt> to install with Pip regardless.
+    """
 
     app: Application
     name = "install"
+    _project_dependencies_memo: dict[Path, list[Dependency]]
+    _projects_by_name: dict[str, Project] | None
     options = VenvAwareCommand.options + [
         option(
             "--installer",
@@ -151,15 +183,38 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             flag=False,
             multiple=True,
         ),
+        option(
+            "--locked",
+            description="Install the dependencies from the <s>slap.lock</s> file created with <opt>slap lock</opt> "
+            "instead of resolving them.",
+        ),
+        option(
+            "--wheelhouse",
+            description="Download or build wheels for all dependencies into the given directory first, then install "
+            "from it without accessing a package index.",
+            flag=False,
+        ),
+        option(
+            "--from-wheelhouse",
+            description="Install from a directory of wheels created with <opt>--wheelhouse</opt> without accessing "
+            "a package index.",
+            flag=False,
+        ),
+        option(
+            "--no-sync",
+            description="Do not install with <s>uv sync</s> even if the project or repository has a "
+            "<s>uv.lock</s> file.",
+        ),
         python_option,
     ]
 
-    def load_configuration(self, app: Application) -> None:
-        from databind.json import load
+    def __init__(self, app: Application) -> None:
+        super().__init__(app)
+        self._project_dependencies_memo = {}
+        self._projects_by_name = None
 
-        self.config: dict[Configuration, InstallConfig] = {}
-        for obj in app.configurations():
-            self.config[obj] = load(obj.raw_config().get("install", {}), InstallConfig, filename=str(obj))
+    def load_configuration(self, app: Application) -> None:
+        self.config = load_install_config(app)
         return None
 
     def activate(self, app: Application, config: None) -> None:
@@ -171,8 +226,6 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
         Installs the requirements of the package using Pip.
         """
 
-        from nr.stream import Stream
-
         from slap.install.installer import InstallOptions, PipInstaller, get_indexes_for_projects
         from slap.python.dependency import PathDependency, PypiDependency, parse_dependencies
         from slap.python.environment import PythonEnvironment
@@ -180,6 +233,9 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
         if not self._validate_args():
             return 1
 
+        self._project_dependencies_memo = {}
+        self._projects_by_name = None
+
         result = super().handle()
         if result != 0:
             return result
@@ -199,18 +255,20 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
         if not projects:
             return 1
 
+        install_extras = self._get_extras_to_install()
+
+        # Projects that are covered by a `uv.lock` file are installed directly from the lockfile.
+        if uv_sync := self._get_uv_sync_installer(projects, install_extras, python_environment):
+            sync_installer, sync_options = uv_sync
+            status_code = sync_installer.sync(python_environment, sync_options)
+            if status_code == 0 and self.option("link"):
+                self._link_projects(self._get_projects_plus_dependencies(projects))
+            return status_code
+
         # Get a list of the projects that need to be installed that also includes all the projects required through
         # interdependencies between the projects.
-        projects_plus_dependencies = (
-            Stream(projects)
-            .map(lambda p: p.get_interdependencies(self.app.repository.projects(), recursive=True))
-            .concat()
-            .append(projects)
-            .distinct()
-            .collect()
-        )
+        projects_plus_dependencies = self._get_projects_plus_dependencies(projects)
 
-        install_extras = self._get_extras_to_install()
         discovered_extras = {"dev"}  # Not discovering a 'dev' extra should not trigger a warning
         dependencies: list[Dependency] = []
 
@@ -297,9 +355,30 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
                 use_uv = False
 
         installer = PipInstaller(use_uv=use_uv, symlink_helper=self)
-        status_code = installer.install(dependencies, python_environment, options)
-        if status_code != 0:
-            return status_code
+
+        if wheelhouse := self.option("wheelhouse"):
+            status_code = self._build_wheelhouse(
+                installer, Path(wheelhouse), dependencies, projects_plus_dependencies, python_environment, options
+            )
+            if status_code != 0:
+                return status_code
+
+        if wheelhouse := self.option("wheelhouse") or self.option("from-wheelhouse"):
+            # Install only from the wheelhouse, without accessing any package index.
+            options.no_index = True
+            options.find_links = [Path(wheelhouse).absolute()]
+
+        if self.option("locked"):
+            # Install the pinned dependencies from the lockfile, then the projects themselves without dependencies.
+            if (status_code := self._install_lockfile(installer, python_environment, options)) != 0:
+                return status_code
+            options.no_deps = True
+            dependencies = [dependency for dependency in dependencies if isinstance(dependency, PathDependency)]
+
+        if dependencies:
+            status_code = installer.install(dependencies, python_environment, options)
+            if status_code != 0:
+                return status_code
 
         if self.option("link"):
             self._link_projects(projects_plus_dependencies)
@@ -309,7 +388,17 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
     def _validate_args(self) -> bool:
         """Validate combinations of command-line args and options."""
 
-        for a, b in [("only-extras", "extras"), ("no-root", "link"), ("only-extras", "link")]:
+        for a, b in [
+            ("only-extras", "extras"),
+            ("no-root", "link"),
+            ("only-extras", "link"),
+            ("locked", "upgrade"),
+            ("locked", "only-extras"),
+            # The lockfile contains the dependencies of all projects, including development dependencies and extras.
+            ("locked", "only"),
+            ("locked", "no-dev"),
+            ("wheelhouse", "from-wheelhouse"),
+        ]:
             if self.option(a) and self.option(b):
                 self.line_error(f"error: conflicting options <opt>--{a}</opt> and <opt>--{b}</opt>", "error")
                 return False
@@ -322,6 +411,20 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
         from_path = self.option("from")
         return self.app.get_target_projects(self.option("only"), Path(from_path).resolve() if from_path else None)
 
+    def _get_projects_plus_dependencies(self, projects: list[Project]) -> list[Project]:
+        """Return the *projects* and all projects in the repository that they depend on."""
+
+        from nr.stream import Stream
+
+        return (
+            Stream(projects)
+            .map(lambda p: p.get_interdependencies(self.app.repository.projects(), recursive=True))
+            .concat()
+            .append(projects)
+            .distinct()
+            .collect()
+        )
+
     def _get_extras_to_install(self) -> set[str]:
         """Return a set of the extras that should be installed."""
 
@@ -337,27 +440,165 @@ class InstallCommandPlugin(VenvAwareCommand, ApplicationPlugin):
 
         return extras
 
-    def _update_indexes_from_cli(self, indexes: Indexes) -> None:
-        from slap.install.installer import IndexSpec
+    def _get_uv_sync_installer(
+        self, projects: list[Project], install_extras: set[str], target: PythonEnvironment
+    ) -> tuple[UvSyncInstaller, UvSyncOptions] | None:
+        """Returns a #UvSyncInstaller if the projects to install are covered by a `uv.lock` file, the *target* is a
+        virtual environment and the command-line options can be expressed with `uv sync`. Otherwise, `None` is
+        returned and Slap collects the dependencies itself."""
+
+        from slap.install.installer import UvSyncInstaller, UvSyncOptions
+
+        if self.option("no-sync") or self.option("installer") == "pip":
+            return None
+
+        # NOTE: uv sync treats the target as the project environment, which it may recreate or remove packages from.
+        if not target.is_venv():
+            logger.info(
+                "Not installing with <subj>uv sync</subj> because <val>%s</val> is not a virtual environment",
+                target.executable,
+            )
+            return None
+
+        for opt in ("upgrade", "only-extras", "index", "extra-index", "wheelhouse", "from-wheelhouse", "locked"):
+            if self.option(opt):
+                logger.info("Not installing with <subj>uv sync</subj> because <val>--%s</val> was specified", opt)
+                return None
+
+        repository = self.app.repository
+        if (repository.directory / "uv.lock").is_file():
+            directory = repository.directory
+        elif len(projects) == 1 and (projects[0].directory / "uv.lock").is_file():
+            directory = projects[0].directory
+        else:
+            return None
+
+        options = UvSyncOptions(
+            no_dev=bool(self.option("no-dev")),
+            no_install_workspace=bool(self.option("no-root") or self.option("link")),
+            quiet=bool(self.option("quiet")),
+        )
 
-        for extra in (*self.option("extra-index"), *self.option("index")):
-            spec = IndexSpec.parse(extra)
-            if spec.name in indexes.urls:
-                spec.url = spec.url or indexes.urls[spec.name]
+        if directory == repository.directory and repository.is_monorepo:
+            if set(projects) == set(repository.projects()):
+                options.all_packages = True
             else:
-                logger.warning('passed an --index option for a source that does not exist (source: "%s")', spec.name)
-            indexes.urls[spec.name] = spec.url_with_auth
+                options.packages = [project.dist_name() or project.id for project in projects]
+
+        for project in projects:
+            project_extras = set(install_extras)
+            if not self.option("no-dev") and self.config[project].dev_extras is not None:
+                project_extras.update(self.config[project].dev_extras or [])
+            project_extras.discard("dev")  # The `dev` group is installed by default unless --no-dev is set.
+
+            optional_dependencies = project.pyproject_toml.get("project", {}).get("optional-dependencies", {})
+            dependency_groups = project.pyproject_toml.get("dependency-groups", {})
+            for extra in project_extras:
+                if extra in optional_dependencies:
+                    options.extras.add(extra)
+                elif extra in dependency_groups:
+                    options.groups.add(extra)
+                else:
+                    logger.info(
+                        "Not installing with <subj>uv sync</subj> because extra <val>%s</val> is not known to uv",
+                        extra,
+                    )
+                    return None
+
+        return UvSyncInstaller(directory), options
+
+    def _update_indexes_from_cli(self, indexes: Indexes) -> None:
+        update_indexes_from_specs(indexes, (*self.option("extra-index"), *self.option("index")))
+
+    def _install_lockfile(self, installer: PipInstaller, target: PythonEnvironment, options: InstallOptions) -> int:
+        """Installs the dependencies pinned in the repository lockfile without resolving them."""
+
+        from slap.ext.application.lock import (
+            get_lock_dependencies,
+            get_lock_requirements,
+            get_lockfile,
+            get_requirements_digest,
+            read_lockfile_digest,
+        )
+
+        lockfile = get_lockfile(self.app.repository)
+        if not lockfile.is_file():
+            self.line_error(f"error: <s>{lockfile}</s> does not exist, run <opt>slap lock</opt> first", "error")
+            return 1
+
+        requirements = get_lock_requirements(get_lock_dependencies(self.app, self.config))
+        if read_lockfile_digest(lockfile) != get_requirements_digest(requirements):
+            self.line_error(f"warning: <s>{lockfile}</s> is outdated, run <opt>slap lock</opt> to update it", "warning")
+
+        return installer.install([], target, dataclasses.replace(options, requirements_files=[lockfile], no_deps=True))
+
+    def _build_wheelhouse(
+        self,
+        installer: PipInstaller,
+        wheelhouse: Path,
+        dependencies: list[Dependency],
+        projects: list[Project],
+        target: PythonEnvironment,
+        options: InstallOptions,
+    ) -> int:
+        """Builds wheels for the *dependencies* into the *wheelhouse*. The build requirements of the *projects* are
+        included as well, such that the projects themselves can be built from source without a package index."""
+
+        from slap.ext.application.lock import get_lockfile
+
+        build_dependencies = [dependency for project in projects for dependency in project.dependencies().build]
+        requirements_files = [get_lockfile(self.app.repository)] if self.option("locked") else []
+        return installer.build_wheels(
+            dependencies + build_dependencies,
+            target,
+            dataclasses.replace(options, requirements_files=requirements_files),
+            wheelhouse,
+        )
 
     def _link_projects(self, projects: list[Project]) -> None:
         from slap.ext.application.link import link_repository
 
-        link_repository(self.io, projects, python=get_active_python_bin(self))
+        # NOTE: The dependencies of the linked projects are installed by this command already.
+        link_repository(self.io, projects, python=get_active_python_bin(self), install_dependencies=False)
 
     # SymlinkHelper
 
     def get_dependencies_for_project(self, project: Path) -> list[Dependency]:
-        # TODO (@NiklasRosenstein): Implement this method
-        raise NotImplementedError
+        """Returns the run dependencies of the project in the given directory. Dependencies on other projects in the
+        repository are returned as #PathDependency#s with #PathDependency.link enabled, such that the #PipInstaller
+        links them as well and collects their dependencies in turn. It visits every project only once, which also
+        breaks cycles in the dependency graph. The result is memoized for the duration of the command."""
+
+        from slap.python.dependency import PathDependency
+
+        directory = project.resolve()
+        if directory in self._project_dependencies_memo:
+            return self._project_dependencies_memo[directory]
+
+        if self._projects_by_name is None:
+            self._projects_by_name = {name: p for p in self.app.repository.projects() if (name := p.dist_name())}
+
+        result: list[Dependency] = []
+        for dependency in self.app.repository.get_project_by_directory(directory).dependencies().run:
+            if isinstance(dependency, PathDependency):
+                # Path dependencies are relative to the project that declares them.
+                result.append(dataclasses.replace(dependency, path=(directory / dependency.path).resolve()))
+            elif dependency.name in self._projects_by_name:
+                result.append(
+                    PathDependency(
+                        name=dependency.name,
+                        path=self._projects_by_name[dependency.name].directory.resolve(),
+                        link=True,
+                        extras=dependency.extras,
+                        python=dependency.python,
+                        markers=dependency.markers,
+                    )
+                )
+            else:
+                result.append(dependency)
+
+        self._project_dependencies_memo[directory] = result
+        return result
 
     def link_project(self, path: Path) -> None:
         project = self.app.repository.get_project_by_directory(path)
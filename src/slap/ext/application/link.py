@@ -1,9 +1,20 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+import hashlib
+import json
+import logging
 import os
 import shutil
+import sys
 import textwrap
+import threading
 import typing as t
 from pathlib import Path
 
+from cleo.io.outputs.output import Verbosity  # type: ignore[import]
+
 from slap.application import IO, Application, option
 from slap.ext.application.venv import VenvAwareCommand
 from slap.plugins import ApplicationPlugin
@@ -11,6 +22,8 @@ from slap.project import Project
 
 from .install import get_active_python_bin, python_option, venv_check
 
+logger = logging.getLogger(__name__)
+
 
 class LinkCommandPlugin(VenvAwareCommand, ApplicationPlugin):
     """
@@ -21,9 +34,9 @@ class LinkCommandPlugin(VenvAwareCommand, ApplicationPlugin):
     useful if your project is using a <u>PEP 517 [1]</u> compatible build system that does
     not support editable installs.
 
-    When you run this command, the <u>pyproject.toml</u> will be temporarily rewritten such
-    that Flit can understand it. The following ways to describe a Python project are
-    currently supported be the rewriter:
+    When you run this command, a Flit configuration is generated in memory from the
+    <u>pyproject.toml</u>. The following ways to describe a Python project are currently
+    supported be the rewriter:
 
     1. <u>Poetry [2]</u>
 
@@ -37,6 +50,10 @@ class LinkCommandPlugin(VenvAwareCommand, ApplicationPlugin):
       <i>Since the <opt>link</opt> command relies on Flit, no subset of configuration neeeds to be
       explicitly supported.</i>
 
+    Linked packages are recorded in a <u>slap-links.json</u> file in the virtual environment. Projects
+    whose configuration did not change since they were last linked are skipped, unless
+    <opt>--force</opt> is passed. Independent projects are linked concurrently.
+
     <b>Example usage:</b>
 
       <fg=yellow>$</fg> slap link
@@ -68,6 +85,16 @@ class LinkCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             "--dump-pyproject",
             description="Dump the updated pyproject.toml and do not actually do the linking.",
         ),
+        option(
+            "--force",
+            description="Link all projects, even if they are already linked with the same configuration.",
+        ),
+        option(
+            "--jobs",
+            "-j",
+            description="The maximum number of projects to link concurrently.",
+            flag=False,
+        ),
     ]
 
     def load_configuration(self, app: Application) -> None:
@@ -96,26 +123,55 @@ class LinkCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             self.app.repository.get_projects_ordered(),
             self.option("dump-pyproject"),
             get_active_python_bin(self),
+            force=self.option("force"),
+            jobs=int(self.option("jobs")) if self.option("jobs") else None,
         )
         return 0
 
 
-def link_repository(io: IO, projects: list[Project], dump_pyproject: bool = False, python: str | None = None) -> None:
+def link_repository(
+    io: IO,
+    projects: list[Project],
+    dump_pyproject: bool = False,
+    python: str | None = None,
+    install_dependencies: bool = True,
+    force: bool = False,
+    jobs: int | None = None,
+) -> None:
+    """Symlinks the packages of the given *projects* into the Python environment using Flit.
+
+    Args:
+      io: The IO to write status messages to.
+      projects: The projects to link.
+      dump_pyproject: Print the Flit configuration that would be used for every package instead of linking it.
+      python: The Python executable of the environment to link into.
+      install_dependencies: Let Flit install the dependencies of projects that need to be (re-)linked.
+      force: Link all projects even if the link manifest says that they are already linked. The manifest is only
+        kept for virtual environments, all projects are linked into other environments.
+      jobs: The maximum number of projects to link concurrently.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+
     from flit.install import Installer  # type: ignore[import]
+    from flit_core.config import prep_toml_config  # type: ignore[import]
 
-    from slap.util.fs import atomic_swap
+    from slap.python.environment import PythonEnvironment
     from slap.util.pygments import toml_highlight
 
     # We need to pass an absolute path to Python to make sure the scripts have an absolute shebang.
     python_bin = shutil.which(python or "python")
     if not python_bin:
         raise Exception(f"Could not find Python executable from {python_bin!r}")
+    python_bin = str(Path(python_bin).absolute())
 
     # Without this set, the installer will complain about installing as the root user. If we want to
     # have a similar check in Slap, we must do it in the install command as well, otherwise you end
     # up installing as root but then just the linking step fails.
     os.environ["FLIT_ROOT_INSTALL"] = "1"
 
+    # Generate the Flit configuration for every package in memory.
+    links: dict[str, list[_Link]] = {}
     for project in projects:
         if not project.is_python_project:
             continue
@@ -125,7 +181,7 @@ def link_repository(io: IO, projects: list[Project], dump_pyproject: bool = Fals
             continue
 
         for package in packages:
-            config = project.pyproject_toml.value()
+            config = copy.deepcopy(project.pyproject_toml.value())
             dist_name = project.dist_name() or project.directory.resolve().name
             _setup_flit_config(package.name, dist_name, config)
 
@@ -134,21 +190,155 @@ def link_repository(io: IO, projects: list[Project], dump_pyproject: bool = Fals
                 io.write_line(toml_highlight(config))
                 continue
 
-            with atomic_swap(project.pyproject_toml.path, "w", always_revert=True) as fp:
-                fp.close()
-                project.pyproject_toml.value(config)
-                project.pyproject_toml.save()
-                installer = Installer.from_ini_path(
-                    project.pyproject_toml.path, python=str(Path(python_bin).absolute()), symlink=True
-                )
-                io.write_line(f"symlinking <info>{dist_name}</info>")
-                installer.install()
+            links.setdefault(dist_name, []).append(_Link(dist_name, package.name, project.pyproject_toml.path, config))
+
+    if not links:
+        return
+
+    environment = PythonEnvironment.of(python_bin)
+
+    # NOTE: The manifest is only kept for virtual environments, as the prefix of other environments (e.g. `/usr`)
+    #       is usually not writable.
+    manifest = LinkManifest.load(Path(environment.prefix) / LinkManifest.FILENAME) if environment.is_venv() else None
+
+    installers: dict[str, list[tuple[_Link, t.Any]]] = {}
+    for dist_name, project_links in links.items():
+        if (
+            not force
+            and manifest is not None
+            and all(manifest.is_up_to_date(link, python_bin) for link in project_links)
+        ):
+            io.write_line(f"<info>{dist_name}</info> is already linked", verbosity=Verbosity.VERBOSE)
+            continue
+        installers[dist_name] = [
+            (
+                link,
+                Installer(
+                    link.pyproject_toml.parent,
+                    prep_toml_config(link.config, link.pyproject_toml),
+                    user=False if environment.is_venv() else None,
+                    python=python_bin,
+                    symlink=True,
+                ),
+            )
+            for link in project_links
+        ]
+
+    # Dependencies are installed with Pip, which must not run concurrently in the same environment.
+    for project_installers in installers.values():
+        for _link, installer in project_installers:
+            _install_requirements(installer, install_dependencies)
+
+    def _link_project(project_installers: list[tuple[_Link, t.Any]]) -> None:
+        # NOTE: Packages of the same project share the same `.dist-info` directory, so they are linked sequentially.
+        for link, installer in project_installers:
+            installer.install_directly()
+            if manifest is not None:
+                manifest.record(link, python_bin, installer.installed_files)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_link_project, value): key for key, value in installers.items()}
+        for future, dist_name in futures.items():
+            future.result()
+            io.write_line(f"symlinked <info>{dist_name}</info>")
+
+    if manifest is not None:
+        try:
+            manifest.save()
+        except OSError as exc:
+            # The packages are linked nonetheless, they will only be linked again the next time.
+            logger.warning("Could not write link manifest <val>%s</val>: %s", manifest.path, exc)
+
+
+def _install_requirements(installer: t.Any, install_dependencies: bool) -> None:
+    """Internal. Installs the requirements of the package of the Flit *installer* into the target environment if
+    *install_dependencies* is enabled and, if Flit needs to import the package to read its metadata, into the
+    environment that Flit runs in. Afterwards, the installer is told not to install the requirements again, so that
+    #Installer.install_directly() does not run Pip.
+
+    The installer's `deps` is only changed once both steps succeeded, because with `deps="none"`, Flit raises an
+    #ImportError instead of installing the requirements that it needs to import the package."""
+
+    if install_dependencies:
+        installer.install_requirements()
+    if installer.python != sys.executable:
+        installer.install_reqs_my_python_if_needed()
+    installer.deps = "none"
+
+
+@dataclasses.dataclass
+class _Link:
+    dist_name: str
+    module: str
+    pyproject_toml: Path
+    config: dict[str, t.Any]
+
+    @property
+    def key(self) -> str:
+        return f"{self.dist_name}:{self.module}"
+
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self.config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class LinkManifest:
+    """Records the packages that have been linked into a virtual environment with `slap link`, such that packages
+    whose configuration did not change since they were last linked can be skipped. The manifest is stored in the root
+    of the environment, next to the `slap.json` file of Slap-managed virtual environments."""
+
+    FILENAME = "slap-links.json"
+
+    def __init__(self, path: Path, entries: dict[str, dict[str, t.Any]]) -> None:
+        self.path = path
+        self.entries = entries
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> LinkManifest:
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            entries = {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring invalid link manifest <val>%s</val>: %s", path, exc)
+            entries = {}
+        return cls(path, entries)
+
+    def save(self) -> None:
+        from slap.util.fs import atomic_write
+
+        with atomic_write(self.path, "w", None) as fp:
+            json.dump(self.entries, fp, indent=2, sort_keys=True)
+
+    def is_up_to_date(self, link: _Link, python: str) -> bool:
+        """Returns `True` if *link* was recorded from the same project directory with the same configuration and all of
+        the files that were installed for it still exist. A symlink whose target no longer exists (e.g. because the
+        project was moved) does not count as existing."""
+
+        entry = self.entries.get(link.key)
+        if (
+            entry is None
+            or entry.get("source") != str(link.pyproject_toml.parent.resolve())
+            or entry["digest"] != link.digest()
+            or entry["python"] != python
+        ):
+            return False
+        return all(os.path.exists(path) for path in entry["installed_files"])
+
+    def record(self, link: _Link, python: str, installed_files: t.Sequence[str | Path]) -> None:
+        with self._lock:
+            self.entries[link.key] = {
+                "source": str(link.pyproject_toml.parent.resolve()),
+                "digest": link.digest(),
+                "python": python,
+                "installed_files": [str(path) for path in installed_files],
+            }
 
 
 def _setup_flit_config(module: str, dist_name: str, data: dict[str, t.Any]) -> None:
     """Internal. Makes sure the configuration in *data* is compatible with Flit."""
 
-    poetry = data["tool"].get("poetry", {})
+    poetry = data.setdefault("tool", {}).get("poetry", {})
     flit = data["tool"].setdefault("flit", {})
     plugins = poetry.get("plugins", {})
     scripts = poetry.get("scripts", {})
@@ -162,6 +352,7 @@ def _setup_flit_config(module: str, dist_name: str, data: dict[str, t.Any]) -> N
     # TODO (@NiklasRosenstein): Do we need to support gui-scripts as well?
 
     project["name"] = dist_name
-    project["version"] = poetry["version"]
+    if "version" in poetry:
+        project["version"] = poetry["version"]
     project["description"] = ""
     flit["module"] = {"name": module}
@@ -0,0 +1,239 @@
+"""Implements the `slap lock` command that resolves the dependencies of all projects into a pinned constraints file
+which can then be installed with `slap install --locked`."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import shlex
+import subprocess as sp
+import typing as t
+from pathlib import Path
+
+from slap.application import Application, option
+from slap.ext.application.install import get_active_python_bin, load_install_config, python_option
+from slap.ext.application.venv import VenvAwareCommand
+from slap.plugins import ApplicationPlugin
+
+if t.TYPE_CHECKING:
+    from cleo.io.inputs.option import Option  # type: ignore[import]
+
+    from slap.configuration import Configuration
+    from slap.ext.application.install import InstallConfig
+    from slap.python.dependency import Dependency
+    from slap.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+#: The name of the lockfile in the repository root directory.
+LOCKFILE_NAME = "slap.lock"
+
+#: The prefix of the line in the lockfile that records the digest of the requirements that it was compiled from.
+DIGEST_PREFIX = "# slap-requirements-digest: "
+
+
+def get_lockfile(repository: Repository) -> Path:
+    """Returns the path to the lockfile of the *repository*."""
+
+    return repository.directory / LOCKFILE_NAME
+
+
+def get_lock_dependencies(app: Application, config: dict[Configuration, InstallConfig]) -> list[Dependency]:
+    """Collects the run, development and extra dependencies of all projects in the repository, plus the extras defined
+    in the Slap install configuration. Dependencies on projects in the same repository and path dependencies are not
+    included as they are installed from source."""
+
+    from slap.python.dependency import PathDependency, parse_dependencies
+
+    projects = app.repository.projects()
+    project_names = {project.dist_name() for project in projects}
+
+    dependencies: list[Dependency] = []
+    for project in projects:
+        deps = project.dependencies()
+        dependencies += deps.run
+        dependencies += deps.dev
+        for extra_deps in deps.extra.values():
+            dependencies += extra_deps
+
+    for install_config in config.values():
+        for extra_deps_config in install_config.extras.values():
+            dependencies += parse_dependencies(extra_deps_config)
+
+    return [
+        dependency
+        for dependency in dependencies
+        if dependency.name not in project_names and not isinstance(dependency, PathDependency)
+    ]
+
+
+def get_lock_requirements(dependencies: t.Iterable[Dependency]) -> list[str]:
+    """Converts *dependencies* to a sorted list of requirement lines. The environment markers and Python version
+    constraints of the dependencies are kept, such that the lockfile can be compiled for all platforms at once and
+    the requirements (and thus their digest) do not depend on the environment that they are collected in."""
+
+    from slap.install.installer import PipInstaller
+    from slap.python.dependency import MultiDependency
+
+    def collect(dependencies: t.Iterable[Dependency], parent_markers: str | None) -> t.Iterator[str]:
+        for dependency in dependencies:
+            combined = _join_markers(parent_markers, get_dependency_markers(dependency))
+            if isinstance(dependency, MultiDependency):
+                # The alternatives inherit the markers of the dependency that they belong to.
+                yield from collect(dependency.dependencies, combined)
+                continue
+
+            # Hashes are not accepted before markers in a requirement line. The lockfile pins its own hashes anyway.
+            requirement = " ".join(
+                PipInstaller.dependency_to_pip_arguments(dataclasses.replace(dependency, hashes=None))
+            )
+            yield f"{requirement} ; {combined}" if combined else requirement
+
+    return sorted(set(collect(dependencies, None)))
+
+
+def get_dependency_markers(dependency: Dependency) -> str | None:
+    """Returns the PEP 508 environment markers for the #Dependency.markers and #Dependency.python of *dependency*."""
+
+    python_markers = None
+    if dependency.python:
+        from poetry.core.constraints.version import parse_constraint  # type: ignore[import]
+        from poetry.core.packages.utils.utils import create_nested_marker  # type: ignore[import]
+
+        python_markers = create_nested_marker("python_version", parse_constraint(str(dependency.python)))
+    return _join_markers(python_markers, dependency.markers)
+
+
+def _join_markers(*markers: str | None) -> str | None:
+    """Internal. Combines the given environment markers with `and`, ignoring `None` values."""
+
+    present = [marker for marker in markers if marker]
+    if len(present) <= 1:
+        return present[0] if present else None
+    return " and ".join(f"({marker})" for marker in present)
+
+
+def get_requirements_digest(requirements: t.Iterable[str]) -> str:
+    """Returns a digest of the *requirements* used to detect if a lockfile is outdated."""
+
+    return hashlib.sha256("\n".join(sorted(requirements)).encode()).hexdigest()
+
+
+def read_lockfile_digest(lockfile: Path) -> str | None:
+    """Reads the requirements digest from the *lockfile*. Returns `None` if the file has no digest."""
+
+    with lockfile.open(encoding="utf-8") as fp:
+        for line in fp:
+            if line.startswith(DIGEST_PREFIX):
+                return line[len(DIGEST_PREFIX) :].strip()
+            if not line.startswith("#"):
+                break
+    return None
+
+
+class LockCommandPlugin(VenvAwareCommand, ApplicationPlugin):
+    """Resolve the dependencies of all projects into a pinned and hashed constraints file.
+
+    The run, development and extra dependencies of all projects in the repository are resolved
+    once with <s>uv pip compile --universal</s> for all platforms and Python versions and written
+    to the <s>slap.lock</s> file in the repository root. Use <opt>slap install --locked</opt> to install
+    from the lockfile without resolving the dependencies again.
+    """
+
+    app: Application
+    name = "lock"
+    options: t.ClassVar[list[Option]] = [
+        *VenvAwareCommand.options,
+        option(
+            "--upgrade",
+            description="Allow upgrading packages that are already pinned in the lockfile.",
+        ),
+        option(
+            "--check",
+            description="Do not update the lockfile, only check if it is up to date with the project dependencies. "
+            "Exit with status code 1 if it is not.",
+        ),
+        option(
+            "--index",
+            description="Set an index URL to resolve from. Same as for <opt>slap install</opt>.",
+            flag=False,
+            multiple=True,
+        ),
+        python_option,
+    ]
+
+    def load_configuration(self, app: Application) -> None:
+        self.config = load_install_config(app)
+
+    def activate(self, app: Application, _config: None) -> None:
+        self.app = app
+        app.cleo.add(self)
+
+    def handle(self) -> int:
+        from slap.ext.application.install import update_indexes_from_specs
+        from slap.ext.application.venv import UvVenv
+        from slap.install.installer import get_indexes_for_projects
+        from slap.python.environment import PythonEnvironment
+
+        result = super().handle()
+        if result != 0:
+            return result
+
+        python_environment = PythonEnvironment.of(get_active_python_bin(self))
+        requirements = get_lock_requirements(get_lock_dependencies(self.app, self.config))
+        digest = get_requirements_digest(requirements)
+        lockfile = get_lockfile(self.app.repository)
+
+        if self.option("check"):
+            if not lockfile.is_file():
+                self.line_error(f"error: <s>{lockfile}</s> does not exist", "error")
+                return 1
+            if read_lockfile_digest(lockfile) != digest:
+                self.line_error(f"error: <s>{lockfile}</s> is outdated, run <opt>slap lock</opt>", "error")
+                return 1
+            self.line(f"<s>{lockfile}</s> is up to date", "info")
+            return 0
+
+        indexes = get_indexes_for_projects(self.app.repository.projects())
+        update_indexes_from_specs(indexes, self.option("index"))
+
+        command = [
+            str(UvVenv.find_uv_bin()),
+            "pip",
+            "compile",
+            "-",
+            "--generate-hashes",
+            "--universal",
+            "--no-header",
+            "--python",
+            python_environment.executable,
+            "--output-file",
+            str(lockfile),
+        ]
+        if indexes.default is not None and indexes.default not in indexes.urls:
+            self.line_error(f"error: PyPI index <s>{indexes.default}</s> is not configured", "error")
+            return 1
+        if indexes.default is not None:
+            command += ["--index-url", indexes.urls[indexes.default]]
+        for index_name in sorted(indexes.urls.keys() - {indexes.default}):
+            command += ["--extra-index-url", indexes.urls[index_name]]
+        if self.option("upgrade"):
+            command += ["--upgrade"]
+        if self.option("quiet"):
+            command += ["-q"]
+
+        logger.info("Resolving dependencies using command <subj>$ %s</subj>", " ".join(map(shlex.quote, command)))
+        returncode = sp.run(command, input="\n".join(requirements).encode(), check=False).returncode
+        if returncode != 0:
+            self.line_error(f"error: resolving the dependencies failed (exit code {returncode})", "error")
+            return returncode
+
+        lockfile.write_text(
+            "# This file was generated by `slap lock`. Install it with `slap install --locked`.\n"
+            f"{DIGEST_PREFIX}{digest}\n{lockfile.read_text(encoding='utf-8')}",
+            encoding="utf-8",
+        )
+
+        self.line(f"wrote <s>{lockfile}</s> ({len(requirements)} requirements)", "info")
+        return 0
@@ -1,10 +1,13 @@
 """Commands that produce reports."""
 
+from __future__ import annotations
+
 import json
 import logging
+import sys
 import typing as t
-
-from importlib_metadata import Distribution
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
 
 from slap.application import Application, option
 from slap.ext.application.venv import VenvAwareCommand
@@ -12,6 +15,7 @@ from slap.plugins import ApplicationPlugin
 
 if t.TYPE_CHECKING:
     from slap.python.dependency import Dependency
+    from slap.python.environment import DistributionGraph
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +31,15 @@ class ReportDependenciesCommand(VenvAwareCommand):
             flag=False,
         ),
         option("with-license-text", description="Include license text in the output."),
+        option(
+            "ndjson",
+            description="Write one JSON object per line for every distribution instead of a single JSON document.",
+        ),
     ]
 
+    #: The number of distributions for which the license text is read concurrently with --ndjson.
+    NDJSON_CHUNK_SIZE = 64
+
     def handle(self) -> int:
         import databind.json
         import tqdm  # type: ignore[import]
@@ -50,37 +61,90 @@ class ReportDependenciesCommand(VenvAwareCommand):
             for extra in extras:
                 requirements += project.dependencies().extra.get(extra, [])
 
-        dists_cache: dict[str, Distribution | None] = {}
         python_environment = PythonEnvironment.of("python")
         requirements = filter_dependencies(requirements, python_environment.pep508, extras)
+
+        if self.option("ndjson"):
+            # NOTE: Every level of the graph is written as soon as it has been resolved.
+            with ThreadPoolExecutor() as executor:
+                build_distribution_graph(
+                    env=python_environment,
+                    dependencies=requirements,
+                    expanded_callback=lambda graph, dist_names: self._write_ndjson(graph, dist_names, executor),
+                )
+            return 0
+
         with tqdm.tqdm(desc="Resolving requirements graph") as progress:
             graph = build_distribution_graph(
                 env=python_environment,
                 dependencies=requirements,
                 resolved_callback=lambda d: progress.update(len(d)),
-                dists_cache=dists_cache,
             )
 
         graph.sort()
+
         output = t.cast(dict[str, t.Any], databind.json.dump(graph, DistributionGraph))
 
         # Retrieve the license text from the distributions.
         if self.option("with-license-text"):
-            for dist_name, dist_data in output["metadata"].items():
-                if (dist := dists_cache[dist_name]) is None:
-                    continue
-
-                dist_data["license_text"] = None
-                for file in dist.files or []:
-                    if not file.parent.name.endswith(".dist-info"):
-                        continue
-                    if file.name == "LICENSE" or file.name.startswith("LICENSE."):
-                        dist_data["license_text"] = file.read_text()
-                        break
+            with ThreadPoolExecutor() as executor:
+                dists_data = list(output["metadata"].values())
+                for dist_data, license_text in zip(
+                    dists_data, executor.map(read_license_text, (d["location"] for d in dists_data)), strict=True
+                ):
+                    dist_data["license_text"] = license_text
 
         print(json.dumps(output, indent=2, sort_keys=True))
         return 0
 
+    def _write_ndjson(self, graph: DistributionGraph, dist_names: list[str], executor: Executor) -> None:
+        """Writes one JSON object per line for each of the *dist_names* in the *graph* and flushes the output. License
+        texts are read concurrently in chunks and written out immediately, so they are never all held in memory at
+        the same time."""
+
+        import databind.json
+
+        from slap.python.environment import DistributionMetadata
+
+        with_license_text = self.option("with-license-text")
+
+        for offset in range(0, len(dist_names), self.NDJSON_CHUNK_SIZE):
+            chunk = dist_names[offset : offset + self.NDJSON_CHUNK_SIZE]
+            locations = {name: graph.metadata[name].location for name in chunk if name in graph.metadata}
+            license_texts: dict[str, str | None] = {}
+            if with_license_text:
+                license_texts.update(zip(locations, executor.map(read_license_text, locations.values()), strict=True))
+
+            for dist_name in chunk:
+                if dist_name not in graph.metadata:
+                    sys.stdout.write(json.dumps({"name": dist_name, "missing": True}) + "\n")
+                    continue
+                metadata = t.cast(dict[str, t.Any], databind.json.dump(graph.metadata[dist_name], DistributionMetadata))
+                if with_license_text:
+                    metadata["license_text"] = license_texts[dist_name]
+                record = {
+                    "name": dist_name,
+                    "metadata": metadata,
+                    "dependencies": sorted(graph.dependencies.get(dist_name, [])),
+                }
+                sys.stdout.write(json.dumps(record, sort_keys=True) + "\n")
+            sys.stdout.flush()
+
+
+def read_license_text(location: str | None) -> str | None:
+    """Reads the license text from the `.dist-info` directory at *location*. Returns `None` if there is no license
+    file."""
+
+    if not (location or "").endswith(".dist-info"):
+        return None
+
+    # NOTE: Since PEP 639, license files are stored in the `licenses/` subdirectory.
+    dist_info = Path(t.cast(str, location))
+    for file in sorted(dist_info.glob("LICENSE*")) + sorted(dist_info.glob("licenses/LICENSE*")):
+        if file.name == "LICENSE" or file.name.startswith("LICENSE."):
+            return file.read_text()
+    return None
+
 
 class ReportPlugin(ApplicationPlugin):
     def load_configuration(self, app: Application) -> None:
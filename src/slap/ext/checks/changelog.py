@@ -22,20 +22,24 @@ class ChangelogValidationCheckPlugin(CheckPlugin):
         from databind.core.converter import ConversionError
 
         manager = get_changelog_manager(project.repository, project)
+        changelogs = manager.all()
+        manager.preload(changelogs)
+
         bad_files = []
         bad_changelogs = []
-        count = 0
-        for changelog in manager.all():
-            count += 1
+        entries = []
+        for changelog in changelogs:
             try:
-                for entry in changelog.load().entries:
-                    try:
-                        manager.validate_entry(entry)
-                    except (ConversionError, ValueError) as exc:
-                        bad_changelogs.append((changelog.path.name, str(exc), entry.id))
+                entries += [(changelog.path.name, entry) for entry in changelog.load().entries]
             except (tomli.TOMLDecodeError, ConversionError) as exc:
                 bad_files.append((changelog.path.name, str(exc)))
 
+        errors = manager.validate_entries([entry for _, entry in entries])
+        for (filename, entry), error in zip(entries, errors, strict=True):
+            if error is not None:
+                bad_changelogs.append((filename, str(error), entry.id))
+
+        count = len(changelogs)
         if not count:
             return CheckResult.SKIPPED, None, None
 
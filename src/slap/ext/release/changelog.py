@@ -8,7 +8,8 @@ from slap.repository import Repository
 
 
 class ChangelogReleasePlugin(ReleasePlugin):
-    """Renames the `_unreleased.toml` file when a release is created."""
+    """Renames the `_unreleased.toml` file when a release is created. Entries in the `_unreleased/` directory are
+    moved into the released changelog as well."""
 
     def create_release(
         self, repository: Repository, project: Project | None, target_version: str, dry: bool
@@ -22,12 +23,13 @@ class ChangelogReleasePlugin(ReleasePlugin):
         for project in config_sources:
             manager = get_changelog_manager(repository, project)
             unreleased = manager.unreleased()
-            if unreleased.path in changed_files:
+            new_version = manager.version(target_version)
+            if new_version.path in changed_files:
                 # We hit this case in a single-project repository, where "None" and the single project will
                 # both return the same changelog manager.
                 continue
-            new_version = manager.version(target_version)
             if unreleased.exists():
+                unreleased_files = unreleased.files()
                 cwd = Path.cwd()
                 old = unreleased.path.relative_to(cwd)
                 new = new_version.path.relative_to(cwd)
@@ -36,5 +38,5 @@ class ChangelogReleasePlugin(ReleasePlugin):
                 self.io.write_line(f"  <fg=cyan>{old}</fg> → <b>{new}</b>")
                 if not dry:
                     unreleased.release(target_version)
-                changed_files += [unreleased.path, new_version.path]
+                changed_files += [*unreleased_files, new_version.path]
         return changed_files
@@ -1,20 +1,32 @@
+import dataclasses
+import hashlib
+import json
 import logging
 import os
 import re
 import subprocess as sp
+import typing as t
 from dataclasses import dataclass
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from textwrap import dedent
 
 import requests
+from git.exc import GitCommandError
+from git.remote import Remote
 from git.repo import Repo
 from git.util import Actor
 
 from slap.plugins import RepositoryCIPlugin
+from slap.util.cache import get_user_cache_directory, prune_cache_directory
+from slap.util.fs import atomic_write
+from slap.util.http import get_session
 
 logger = logging.getLogger()
 
+#: The number of seconds after which GitHub API responses that were not used again are removed from the cache.
+RESPONSE_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
 
 def parse_pull_request_id(github_ref: str) -> str | None:
     """
@@ -30,6 +42,62 @@ def parse_pull_request_id(github_ref: str) -> str | None:
     return match.group(1)
 
 
+@dataclass
+class FetchOptions:
+    """
+    Controls how the base and head ref of a pull request are fetched. By default, their full history is fetched,
+    which can take a long time for large repositories.
+    """
+
+    #: Fetch only this many commits from the tip of each ref (`git fetch --depth`).
+    depth: int | None = None
+
+    #: A partial clone filter, e.g. `blob:none`, to fetch file contents only when they are needed (`git fetch
+    #: --filter`). The remote must support partial clones, which GitHub does.
+    filter: str | None = None
+
+    #: When fetching with a #depth, deepen the history of the base and head ref until their merge base is reachable.
+    #: If it is still not reachable after #MAX_DEEPEN_STEPS, the full history is fetched.
+    merge_base: bool = False
+
+    #: The maximum number of times that the history is deepened to find the merge base. The number of commits to
+    #: deepen by doubles with every step.
+    MAX_DEEPEN_STEPS: t.ClassVar[int] = 8
+
+    @staticmethod
+    def from_environ(environ: t.Mapping[str, str]) -> "FetchOptions":
+        """
+        Reads the fetch options from the `GIT_FETCH_DEPTH`, `GIT_FETCH_FILTER` and `GIT_FETCH_MERGE_BASE` environment
+        variables.
+        """
+
+        depth = environ.get("GIT_FETCH_DEPTH", "")
+        try:
+            depth_value = int(depth) if depth else None
+        except ValueError:
+            raise RuntimeError(f"GIT_FETCH_DEPTH must be an integer, got {depth!r}") from None
+        if depth_value is not None and depth_value < 1:
+            raise RuntimeError(f"GIT_FETCH_DEPTH must be a positive integer, got {depth!r}")
+
+        return FetchOptions(
+            depth=depth_value,
+            filter=environ.get("GIT_FETCH_FILTER") or None,
+            merge_base=environ.get("GIT_FETCH_MERGE_BASE", "").lower() in ("1", "true", "yes"),
+        )
+
+    def to_fetch_kwargs(self) -> dict[str, t.Any]:
+        """
+        Returns the keyword arguments for #git.remote.Remote.fetch().
+        """
+
+        kwargs: dict[str, t.Any] = {}
+        if self.depth is not None:
+            kwargs["depth"] = self.depth
+        if self.filter is not None:
+            kwargs["filter"] = self.filter
+        return kwargs
+
+
 class SimpleGithubClient:
     @dataclass
     class PullRequest:
@@ -42,24 +110,43 @@ class SimpleGithubClient:
         id: str
         body: str
 
-    def __init__(self, github_api_url: str, token: str) -> None:
+    @dataclass
+    class _CachedResponse:
+        etag: str
+        data: t.Any
+        next_url: str | None
+
+    #: The number of items per page for paginated API responses. This is the maximum supported by GitHub.
+    PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        github_api_url: str,
+        token: str,
+        session: requests.Session | None = None,
+        cache_directory: Path | None = None,
+    ) -> None:
         """
         :param github_api_url: The URL of the GitHub server, e.g. https://api.github.com. In GitHub CI, this is
             available as the environment variable `GITHUB_API_URL`.
         :param token: The token for the GitHub API. In GitHub CI, this is available as the environment variable
             `GITHUB_TOKEN`.
+        :param session: The session to send requests with. Defaults to the session shared in the process (see
+            #slap.util.http.get_session()), which pools connections and retries failed requests.
+        :param cache_directory: The directory in which responses are cached with their `ETag`, so that requests for
+            the same URL, also by later invocations, are conditional. Defaults to the `github-api` directory in the
+            user cache directory (see #slap.util.cache.get_user_cache_directory()).
         """
 
         self._github_api_url = github_api_url
         self._token = token
-        self._session = requests.Session()
-        self._session.headers.update(
-            {
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28",
-                "Authorization": f"Bearer {self._token}",
-            }
-        )
+        self._session = session or get_session()
+        self._headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "Authorization": f"Bearer {self._token}",
+        }
+        self._cache_directory = cache_directory or get_user_cache_directory() / "github-api"
 
     def get_pull_request(self, repository: str, pull_request_id: str) -> PullRequest:
         """
@@ -73,9 +160,7 @@ class SimpleGithubClient:
         See https://docs.github.com/en/actions/learn-github-actions/variables for more information.
         """
 
-        response = self._session.get(f"{self._github_api_url}/repos/{repository}/pulls/{pull_request_id}")
-        self._raise_for_status(response)
-        data = response.json()
+        data = self._get(f"{self._github_api_url}/repos/{repository}/pulls/{pull_request_id}").data
 
         return self.PullRequest(
             html_url=data["html_url"],
@@ -85,27 +170,35 @@ class SimpleGithubClient:
 
     def get_pr_comments(self, repository: str, pull_request_id: str) -> list[Comment]:
         """
-        Fetches the comments on a GitHub Pull Request.
+        Fetches all comments on a GitHub Pull Request, following the pagination of the API.
         """
 
-        response = self._session.get(f"{self._github_api_url}/repos/{repository}/issues/{pull_request_id}/comments")
-        self._raise_for_status(response)
-        data = response.json()
+        url: str | None = (
+            f"{self._github_api_url}/repos/{repository}/issues/{pull_request_id}/comments?per_page={self.PAGE_SIZE}"
+        )
+        comments = []
+        while url is not None:
+            response = self._get(url)
+            comments += [
+                self.Comment(
+                    id=comment["id"],
+                    body=comment["body"],
+                )
+                for comment in response.data
+            ]
+            url = response.next_url
 
-        return [
-            self.Comment(
-                id=comment["id"],
-                body=comment["body"],
-            )
-            for comment in data
-        ]
+        return comments
 
     def delete_pr_comment(self, repository: str, comment_id: str) -> None:
         """
         Deletes a comment on a GitHub Pull Request.
         """
 
-        response = self._session.delete(f"{self._github_api_url}/repos/{repository}/issues/comments/{comment_id}")
+        response = self._session.delete(
+            f"{self._github_api_url}/repos/{repository}/issues/comments/{comment_id}",
+            headers=self._headers,
+        )
         self._raise_for_status(response)
 
     def create_pr_comment(self, repository: str, pull_request_id: str, body: str) -> Comment:
@@ -116,6 +209,7 @@ class SimpleGithubClient:
         response = self._session.post(
             f"{self._github_api_url}/repos/{repository}/issues/{pull_request_id}/comments",
             json={"body": body},
+            headers=self._headers,
         )
         self._raise_for_status(response)
         data = response.json()
@@ -124,6 +218,62 @@ class SimpleGithubClient:
             body=data["body"],
         )
 
+    def _get(self, url: str) -> _CachedResponse:
+        """Internal. Sends a GET request to *url*. If a response for the URL is cached, the request is conditional on
+        its `ETag`, and the cached response is returned if the server reports that it has not been modified. Such
+        requests do not count against the GitHub API rate limit."""
+
+        headers = dict(self._headers)
+        cache_file = self._get_cache_file(url)
+        cached = self._load_cached_response(cache_file)
+        if cached is not None:
+            headers["If-None-Match"] = cached.etag
+
+        response = self._session.get(url, headers=headers)
+        if cached is not None and response.status_code == 304:
+            logger.debug("Not modified: %s", url)
+            try:
+                os.utime(cache_file)
+            except OSError:
+                pass
+            return cached
+
+        self._raise_for_status(response)
+        result = self._CachedResponse(
+            etag=response.headers.get("ETag", ""),
+            data=response.json(),
+            next_url=response.links.get("next", {}).get("url"),
+        )
+        if result.etag:
+            self._save_cached_response(cache_file, result)
+        return result
+
+    def _get_cache_file(self, url: str) -> Path:
+        """Internal. Returns the file in which the response for *url* is cached. Responses are not keyed by the token,
+        as the token in GitHub Actions changes with every run. The server only confirms that a response was not
+        modified if the request is authorized to read it."""
+
+        return self._cache_directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _load_cached_response(self, cache_file: Path) -> _CachedResponse | None:
+        try:
+            with cache_file.open(encoding="utf-8") as fp:
+                return self._CachedResponse(**json.load(fp))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as exc:
+            logger.debug("Ignoring invalid GitHub API response cache %s: %s", cache_file, exc)
+            return None
+
+    def _save_cached_response(self, cache_file: Path, response: _CachedResponse) -> None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(cache_file, "w", None) as fp:
+                json.dump(dataclasses.asdict(response), fp)
+        except OSError as exc:
+            logger.debug("Could not write GitHub API response cache %s: %s", cache_file, exc)
+        prune_cache_directory(self._cache_directory, RESPONSE_CACHE_MAX_AGE)
+
     def _raise_for_status(self, response: requests.Response) -> None:
         try:
             response.raise_for_status()
@@ -163,6 +313,13 @@ class GithubActionsRepositoryCIPlugin(RepositoryCIPlugin):
     * `GIT_USER_EMAIL` (defaults to `github-action@users.noreply.github.com`)
     * `GIT_COMMIT_MESSAGE` (defaults to `Update changelog PR references`)
 
+    Environment variables to fetch less of the history of the base and head ref (see #FetchOptions):
+
+    * `GIT_FETCH_DEPTH` -- Fetch only this many commits of each ref, e.g. `1`.
+    * `GIT_FETCH_FILTER` -- A partial clone filter, e.g. `blob:none`.
+    * `GIT_FETCH_MERGE_BASE` -- If set to `true`, deepen a fetch with `GIT_FETCH_DEPTH` until the merge base of the
+        base and head ref is reachable.
+
     Important: This does not currently work properly when the head ref is from a fork instead of the same repository.
     This is because the `GITHUB_TOKEN` does not have the permissions to push back to the forked repository, even if
     you as an individual would be able to. Configuring a GitHub Personl Access Token would also not work because in
@@ -204,6 +361,7 @@ class GithubActionsRepositoryCIPlugin(RepositoryCIPlugin):
         self._repository = os.environ["GITHUB_REPOSITORY"]
         self._ref = os.environ["GITHUB_REF"]
         self._event_name = os.environ["GITHUB_EVENT_NAME"]
+        self._fetch_options = FetchOptions.from_environ(os.environ)
 
         # This information is only available when we're in a pull request workflow..
         self._base_ref: tuple[str, str] | None = None
@@ -259,9 +417,9 @@ class GithubActionsRepositoryCIPlugin(RepositoryCIPlugin):
                 self._base_ref[1],
             )
 
-            logger.info("Fetching base ref '%s/%s'", *self._base_ref)
+            logger.info("Fetching base ref '%s/%s' (%s)", *self._base_ref, self._fetch_options)
             base_remote = self._repo.remote(self._base_ref[0])
-            base_remote.fetch(self._base_ref[1])
+            base_remote.fetch(self._base_ref[1], **self._fetch_options.to_fetch_kwargs())
 
             # Make sure that there is a remote for the fork.
             try:
@@ -281,9 +439,12 @@ class GithubActionsRepositoryCIPlugin(RepositoryCIPlugin):
                 )
                 head_remote.set_url(self._pull_request.head_html_url)
 
-            logger.info("Fetching head ref '%s/%s'", *self._head_ref)
+            logger.info("Fetching head ref '%s/%s' (%s)", *self._head_ref, self._fetch_options)
             head_remote = self._repo.remote(self._head_ref[0])
-            head_remote.fetch(self._head_ref[1] + ":" + self._head_branch)
+            head_remote.fetch(self._head_ref[1] + ":" + self._head_branch, **self._fetch_options.to_fetch_kwargs())
+
+            if self._fetch_options.merge_base and self._fetch_options.depth is not None:
+                self._deepen_to_merge_base(base_remote, head_remote)
 
             logger.info("Checking out '%s/%s' as '%s'.", *self._head_ref, self._head_branch)
             self._repo.git.checkout(self._head_branch)  # "/".join(self._head_ref[:2]), "-b", self._head_branch)
@@ -292,6 +453,48 @@ class GithubActionsRepositoryCIPlugin(RepositoryCIPlugin):
         else:
             logger.info("This is not a GitHub pull request.")
 
+    def _deepen_to_merge_base(self, base_remote: Remote, head_remote: Remote) -> None:
+        """
+        Deepens the shallow history of the base and head ref until their merge base is reachable. This must be called
+        before the head branch is checked out, as Git refuses to fetch into the current branch.
+        """
+
+        assert self._base_ref is not None
+        assert self._head_ref is not None
+        assert self._head_branch is not None
+        assert self._fetch_options.depth is not None
+
+        refspecs = [(base_remote, self._base_ref[1]), (head_remote, self._head_ref[1] + ":" + self._head_branch)]
+        deepen = self._fetch_options.depth
+        for _ in range(FetchOptions.MAX_DEEPEN_STEPS):
+            merge_base = self._get_merge_base()
+            if merge_base is not None:
+                logger.info("Merge base of '%s' and '%s' is %s", self.get_base_ref(), self._head_branch, merge_base)
+                return
+            logger.info("Merge base is not reachable, deepening history by %d commits", deepen)
+            for remote, refspec in refspecs:
+                remote.fetch(refspec, deepen=deepen)
+            deepen *= 2
+
+        if self._get_merge_base() is None:
+            logger.info("Merge base is still not reachable, fetching the full history")
+            for remote, refspec in refspecs:
+                # Git refuses to unshallow a repository that is already complete.
+                if self._repo.git.rev_parse("--is-shallow-repository") == "true":
+                    remote.fetch(refspec, unshallow=True)
+
+    def _get_merge_base(self) -> str | None:
+        """
+        Returns the merge base of the base ref and the head branch, or None if it is not reachable in the fetched
+        history.
+        """
+
+        assert self._head_branch is not None
+        try:
+            return str(self._repo.git.merge_base(self.get_base_ref(), self._head_branch))
+        except GitCommandError:
+            return None
+
     def get_base_ref(self) -> str:
         if self._pull_request_id is None:
             raise RuntimeError("Not in a pull request")
@@ -1,26 +1,76 @@
 import dataclasses
 import functools
+import hashlib
+import json
 import logging
 import re
+import time
+import typing as t
 from pathlib import Path
 
-import requests
-
 from slap.changelog import is_url
 from slap.repository import Issue, PullRequest, Repository, RepositoryHost
+from slap.util.cache import get_user_cache_directory
+from slap.util.fs import atomic_write
+from slap.util.http import get_session
 
 logger = logging.getLogger(__name__)
 
 
+#: The number of seconds for which the GitHub username found for an email address is cached on disk.
+USERNAME_CACHE_TTL = 7 * 24 * 60 * 60
+
+#: The number of seconds for which it is cached on disk that no GitHub user was found for an email address.
+USERNAME_NEGATIVE_CACHE_TTL = 24 * 60 * 60
+
+#: The timeout in seconds for the GitHub user search. Callers fall back to the email address if it expires.
+USERNAME_LOOKUP_TIMEOUT = 3.0
+
+
 @functools.lru_cache()
 def github_get_username_from_email(api_base_url: str, email: str) -> str | None:
+    """Searches for the GitHub user with the given *email* address. The result is cached on disk for
+    #USERNAME_CACHE_TTL seconds, or #USERNAME_NEGATIVE_CACHE_TTL seconds if no user was found, as the search API is
+    heavily rate limited. Errors from the API are raised and not cached."""
+
     assert email, "no email address"
-    response = requests.get(f"{api_base_url}/search/users", params={"q": email})
+
+    cache_file = _get_username_cache_file(api_base_url, email)
+    try:
+        with cache_file.open() as fp:
+            cached = json.load(fp)
+        ttl = USERNAME_CACHE_TTL if cached["login"] is not None else USERNAME_NEGATIVE_CACHE_TTL
+        if 0 <= time.time() - cached["time"] < ttl:
+            return t.cast("str | None", cached["login"])
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.debug("Ignoring invalid GitHub username cache <val>%s</val>: %s", cache_file, exc)
+
+    # NOTE: Connecting is not retried, so that an unreachable API does not hold up the caller for multiple timeouts.
+    response = get_session(retry_connect=False).get(
+        f"{api_base_url}/search/users", params={"q": email}, timeout=USERNAME_LOOKUP_TIMEOUT
+    )
     response.raise_for_status()
     results = response.json()
-    if not results["items"]:
-        return None
-    return results["items"][0]["login"]
+    login: str | None = results["items"][0]["login"] if results["items"] else None
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(cache_file, "w", None) as fp:
+            json.dump({"login": login, "time": time.time()}, fp)
+    except OSError as exc:
+        logger.debug("Could not write GitHub username cache <val>%s</val>: %s", cache_file, exc)
+
+    return login
+
+
+def _get_username_cache_file(api_base_url: str, email: str) -> Path:
+    """Internal. Returns the cache file for the GitHub username of *email*. The email address is hashed, so that it
+    does not appear in the cache directory."""
+
+    digest = hashlib.sha256(f"{api_base_url}\0{email}".encode()).hexdigest()
+    return get_user_cache_directory() / "github-usernames" / f"{digest}.json"
 
 
 @dataclasses.dataclass
@@ -92,6 +92,20 @@ class InstallOptions:
     quiet: bool
     upgrade: bool
 
+    #: Requirements files to install from in addition to the dependencies passed to the installer.
+    requirements_files: list[Path] = dataclasses.field(default_factory=list)
+
+    #: Do not install the dependencies of the installed packages. This is used when the packages to install are
+    #: already fully resolved, for example when installing from a lockfile.
+    no_deps: bool = False
+
+    #: Directories or URLs to look for distributions in, for example a wheelhouse built with
+    #: #PipInstaller.build_wheels().
+    find_links: list[Path] = dataclasses.field(default_factory=list)
+
+    #: Do not use any package index, only #find_links.
+    no_index: bool = False
+
 
 class Installer(abc.ABC):
     """An installer for dependencies into a #PythonEnvironment."""
@@ -125,12 +139,87 @@ class PipInstaller(Installer):
         self.symlink_helper = symlink_helper
 
     def install(self, dependencies: t.Sequence[Dependency], target: PythonEnvironment, options: InstallOptions) -> int:
+        pip_arguments, link_projects = self._get_pip_arguments(dependencies, target, options)
+
+        # Construct the Pip command to run.
+        environ = os.environ.copy()
+        if self.use_uv:
+            from slap.ext.application.venv import UvVenv
+
+            assert target.base_prefix, target
+            pip_command = [str(UvVenv.find_uv_bin()), "pip", "install", "--python", target.executable, *pip_arguments]
+            environ["VIRTUAL_ENV"] = target.base_prefix
+        else:
+            pip_command = [target.executable, "-m", "pip", "install", *pip_arguments]
+        if options.quiet:
+            pip_command += ["-q"]
+        if options.upgrade:
+            pip_command += ["--upgrade"]
+        if options.no_deps:
+            pip_command += ["--no-deps"]
+
+        logger.info(
+            "Installing with %s using command <subj>$ %s</subj>",
+            "UV" if self.use_uv else "Pip",
+            " ".join(map(shlex.quote, pip_command)),
+        )
+        if (res := sp.call(pip_command)) != 0:
+            return res
+
+        # Symlink all projects that need to be linked.
+        for project_path in link_projects:
+            assert self.symlink_helper is not None
+            self.symlink_helper.link_project(project_path)
+
+        return 0
+
+    def build_wheels(
+        self,
+        dependencies: t.Sequence[Dependency],
+        target: PythonEnvironment,
+        options: InstallOptions,
+        wheel_directory: Path,
+    ) -> int:
+        """Downloads or builds wheels for the *dependencies* and all of their dependencies into *wheel_directory* using
+        `pip wheel`. The directory can then be used as #InstallOptions.find_links together with #InstallOptions.no_index
+        to install the dependencies without accessing a package index. Projects that would be symlinked are not built,
+        but their dependencies are."""
+
+        pip_arguments, _link_projects = self._get_pip_arguments(dependencies, target, options)
+
+        # NOTE: Uv has no equivalent of `pip wheel`, and Uv-created environments usually don't have Pip installed,
+        #   so we run Pip in a temporary environment for the same Python interpreter instead.
+        if self.use_uv:
+            from slap.ext.application.venv import UvVenv
+
+            pip_command = [str(UvVenv.find_uv_bin()), "tool", "run", "--python", target.executable, "pip", "wheel"]
+        else:
+            pip_command = [target.executable, "-m", "pip", "wheel"]
+        pip_command += ["--wheel-dir", str(wheel_directory), *pip_arguments]
+        if options.quiet:
+            pip_command += ["-q"]
+        if options.no_deps:
+            pip_command += ["--no-deps"]
+
+        wheel_directory.mkdir(parents=True, exist_ok=True)
+        logger.info("Building wheels using command <subj>$ %s</subj>", " ".join(map(shlex.quote, pip_command)))
+        return sp.call(pip_command)
+
+    def _get_pip_arguments(
+        self,
+        dependencies: t.Sequence[Dependency],
+        target: PythonEnvironment,
+        options: InstallOptions,
+    ) -> tuple[list[str], list[Path]]:
+        """Returns the Pip arguments to install *dependencies* and the paths of projects that need to be linked."""
+
         from slap.python.dependency import PathDependency, PypiDependency, UrlDependency
 
         # Collect the Pip arguments and the dependencies that need to be installed through other methods.
         supports_hashes = {PypiDependency, UrlDependency}
         unsupported_hashes: dict[type[Dependency], list[Dependency]] = {}
         link_projects: list[Path] = []
+        seen_link_projects: set[Path] = set()
         pip_arguments: list[str] = []
         # used_indexes: set[str] = set()
         dependencies = list(dependencies)
@@ -147,6 +236,10 @@ class PipInstaller(Installer):
                 unsupported_hashes.setdefault(type(dependency), []).append(dependency)
 
             if isinstance(dependency, PathDependency) and dependency.link:
+                # The same project may be reached through multiple paths in the dependency graph (or in a cycle).
+                if dependency.path.resolve() in seen_link_projects:
+                    continue
+                seen_link_projects.add(dependency.path.resolve())
                 logger.info("Collecting recursive dependencies for project <val>%s</val>", dependency.path)
                 if self.symlink_helper is None:
                     raise Exception(
@@ -172,52 +265,39 @@ class PipInstaller(Installer):
             # if isinstance(dependency, PypiDependency) and dependency.source:
             #     used_indexes.add(dependency.source)
 
+        if options.no_index:
+            pip_arguments += ["--no-index"]
+        else:
+            pip_arguments += self._get_index_arguments(options.indexes)
+
+        for find_links in options.find_links:
+            pip_arguments += ["--find-links", str(find_links)]
+
+        for requirements_file in options.requirements_files:
+            pip_arguments += ["-r", str(requirements_file)]
+
+        return pip_arguments, link_projects
+
+    @staticmethod
+    def _get_index_arguments(indexes: Indexes) -> list[str]:
         # Add the extra index URLs.
         # TODO (@NiklasRosenstein): Inject credentials for index URLs.
         # NOTE (@NiklasRosenstein): While the dependency configuration allows you to specify exactly for each
         #   dependency where it should be fetched from, with the Pip CLI we cannot currently have that level
         #   of control.
+        pip_arguments: list[str] = []
         try:
-            if options.indexes.default is not None:
-                pip_arguments += ["--index-url", options.indexes.urls[options.indexes.default]]
-            # for index_name in used_indexes - {options.indexes.default}:
+            if indexes.default is not None:
+                pip_arguments += ["--index-url", indexes.urls[indexes.default]]
+            # for index_name in used_indexes - {indexes.default}:
             # NOTE (@NiklasRosenstein): For now we just pass all indexes to Pip. When you run `slap install` without
             #       the `--link` option, the package will be installed directly with Pip, thus the runtime dependencies
             #       are not passed here and we would not recognize the extra indexes required for those dependencies.
-            for index_name in options.indexes.urls.keys() - {options.indexes.default}:
-                pip_arguments += ["--extra-index-url", options.indexes.urls[index_name]]
+            for index_name in indexes.urls.keys() - {indexes.default}:
+                pip_arguments += ["--extra-index-url", indexes.urls[index_name]]
         except KeyError as exc:
             raise Exception(f"PyPI index {exc} is not configured")
-
-        # Construct the Pip command to run.
-        environ = os.environ.copy()
-        if self.use_uv:
-            from slap.ext.application.venv import UvVenv
-
-            assert target.base_prefix, target
-            pip_command = [str(UvVenv.find_uv_bin()), "pip", "install"] + pip_arguments
-            environ["VIRTUAL_ENV"] = target.base_prefix
-        else:
-            pip_command = [target.executable, "-m", "pip", "install"] + pip_arguments
-        if options.quiet:
-            pip_command += ["-q"]
-        if options.upgrade:
-            pip_command += ["--upgrade"]
-
-        logger.info(
-            "Installing with %s using command <subj>$ %s</subj>",
-            "UV" if self.use_uv else "Pip",
-            " ".join(map(shlex.quote, pip_command)),
-        )
-        if (res := sp.call(pip_command)) != 0:
-            return res
-
-        # Symlink all projects that need to be linked.
-        for project_path in link_projects:
-            assert self.symlink_helper is not None
-            self.symlink_helper.link_project(project_path)
-
-        return 0
+        return pip_arguments
 
     @staticmethod
     def dependency_to_pip_arguments(dependency: Dependency) -> list[str]:
@@ -266,6 +346,82 @@ class PipInstaller(Installer):
         return pip_arguments
 
 
+@dataclasses.dataclass
+class UvSyncOptions:
+    #: The names of extras (from `project.optional-dependencies`) to install.
+    extras: set[str] = dataclasses.field(default_factory=set)
+
+    #: The names of dependency groups (from `dependency-groups`) to install in addition to the default groups.
+    groups: set[str] = dataclasses.field(default_factory=set)
+
+    #: Do not install the `dev` dependency group.
+    no_dev: bool = False
+
+    #: Do not install the workspace members themselves, only their dependencies.
+    no_install_workspace: bool = False
+
+    #: Sync all packages of the workspace. Takes precedence over #packages.
+    all_packages: bool = False
+
+    #: The names of the workspace members to sync. If empty, uv syncs the project in the lockfile directory.
+    packages: list[str] = dataclasses.field(default_factory=list)
+
+    quiet: bool = False
+
+
+class UvSyncInstaller:
+    """Installs the dependencies of a uv-managed project or workspace exactly as recorded in its `uv.lock` file using
+    `uv sync --frozen`. Unlike the #PipInstaller, this does not require Slap to collect dependencies at all."""
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Args:
+          directory: The directory that contains the `uv.lock` file.
+        """
+
+        self.directory = directory
+
+    def get_command(self, target: PythonEnvironment, options: UvSyncOptions) -> list[str]:
+        from slap.ext.application.venv import UvVenv
+
+        # NOTE: We use --inexact because `slap install` has never removed packages from the target environment.
+        command = [str(UvVenv.find_uv_bin()), "sync", "--frozen", "--inexact", "--python", target.executable]
+        for extra in sorted(options.extras):
+            command += ["--extra", extra]
+        for group in sorted(options.groups):
+            command += ["--group", group]
+        if options.no_dev:
+            command += ["--no-dev"]
+        if options.no_install_workspace:
+            command += ["--no-install-workspace"]
+        if options.all_packages:
+            command += ["--all-packages"]
+        else:
+            for package in options.packages:
+                command += ["--package", package]
+        if options.quiet:
+            command += ["-q"]
+        return command
+
+    def sync(self, target: PythonEnvironment, options: UvSyncOptions) -> int:
+        """Sync the lockfile into the *target* environment, which must be a virtual environment. Returns the exit code
+        of `uv sync`."""
+
+        if not target.is_venv():
+            raise ValueError(f"uv sync can only install into a virtual environment, not {target.executable!r}")
+
+        command = self.get_command(target, options)
+        environ = os.environ.copy()
+        environ["UV_PROJECT_ENVIRONMENT"] = target.prefix
+
+        logger.info(
+            "Installing with UV from lockfile <val>%s</val> using command <subj>$ %s</subj>",
+            self.directory / "uv.lock",
+            " ".join(map(shlex.quote, command)),
+        )
+        return sp.call(command, cwd=self.directory, env=environ)
+
+
 def get_indexes_for_projects(projects: t.Sequence[Project]) -> Indexes:
     """Combines the indexes configuration from each project into one index."""
 
@@ -15,6 +15,7 @@ References:
 from __future__ import annotations
 
 import dataclasses
+import functools
 import re
 import typing as t
 from pathlib import Path
@@ -25,16 +26,31 @@ from typing_extensions import TypeAlias
 
 T = TypeVar("T")
 
+#: Matches a plain PyPI requirement of the form `name[extras] <constraint> ; <markers>` in one pass. Requirements
+#: that do not match (e.g. because they contain a URL) are parsed by the slower, more lenient code path.
+_PYPI_REQUIREMENT_RE = re.compile(
+    r"\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*"
+    r"(?:\[\s*(?P<extras>[A-Za-z0-9._-]+(?:\s*,\s*[A-Za-z0-9._-]+)*)\s*\])?\s*"
+    r"(?P<constraint>(?:[<>=!~\^\(\*][^;@]*?)?)\s*(?:;\s*(?P<markers>[^@]*?))?\s*$"
+)
+
+#: Matches the package name (and extras) at the start of a PyPI requirement, up to the version constraint.
+_PYPI_NAME_RE = re.compile(r"\s*[^<>=!~\^\(\)\*]+")
+
+#: Matches a package name with optional extras, see #split_package_name_with_extras().
+_NAME_WITH_EXTRAS_RE = re.compile(r"\s*([^\[\]]+?)?\s*(?:\[([^\[\]]+)\])?\s*$")
+
+#: Matches Pip options like `--hash=...` at the end of a dependency string.
+_OPTION_RE = re.compile(r"\s--(\w+)=(.*)(\s|$)")
+
 
 class VersionSpec:
     """Represents a version specification, which is either a [PEP 440][] version number, a [PEP 508][]
     dependency specification, or a [Poetry Dependencies][] specification string."""
 
     def __init__(self, version_spec: str) -> None:
-        from poetry.core.packages.dependency import Dependency as _PoetryDependency  # type: ignore[import]
-
         self.__original = version_spec.strip()
-        self.__dependency = _PoetryDependency("", self.__original)
+        self.__constraint, self.__pep_508 = _parse_version_spec(self.__original)
 
     def __bool__(self) -> bool:
         """Returns `True` if the version spec is initialized from an empty string. Note that it will otherwise
@@ -50,19 +66,44 @@ class VersionSpec:
 
     def __eq__(self, other: t.Any) -> bool:
         if isinstance(other, VersionSpec):
-            return self.__dependency == other.__dependency and bool(self) == bool(other)
+            return self.__constraint == other.__constraint and bool(self) == bool(other)
         return False
 
     def to_pep_508(self) -> str:
-        # NOTE (@NiklasRosenstein): Removes parentheses around the spec.
-        return self.__dependency.to_pep_508().strip()[1:-1]
+        return self.__pep_508
 
     def accepts(self, version: str) -> bool:
         """Tests if the version spec accepts the given version string."""
 
-        from poetry.core.constraints.version import Version  # type: ignore[import]
+        return bool(self.__constraint.allows(_parse_version(version)))
+
+
+#: The maximum number of version specs and versions for which the parsed result is cached.
+PARSE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_version_spec(version_spec: str) -> tuple[t.Any, str]:
+    """Internal. Parses a version spec with Poetry and returns its version constraint and its [PEP 508][] form. The
+    result is cached process-wide because the same specs are parsed over and over again (e.g. from the `Requires-Dist`
+    metadata of many distributions). Only the constraint, which Poetry does not modify after it was created, is
+    shared instead of the mutable Poetry `Dependency`."""
+
+    from poetry.core.packages.dependency import Dependency as _PoetryDependency  # type: ignore[import]
+
+    dependency = _PoetryDependency("", version_spec)
+    # NOTE (@NiklasRosenstein): Removes parentheses around the spec.
+    return dependency.constraint, dependency.to_pep_508().strip()[1:-1]
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_version(version: str) -> t.Any:
+    """Internal. Parses a version string into a Poetry `Version` object, which is immutable. Cached like
+    #_parse_version_spec()."""
+
+    from poetry.core.constraints.version import Version  # type: ignore[import]
 
-        return self.__dependency.constraint.allows(Version.parse(version))
+    return Version.parse(version)
 
 
 @dataclasses.dataclass
@@ -156,9 +197,23 @@ class PypiDependency(Dependency, _PypiDependency):
     def parse(value: str) -> PypiDependency:
         """Parses a package name and its version spec from a string."""
 
+        # Fast path for the common case of a plain `name[extras] <spec> ; <markers>` requirement.
+        match = _PYPI_REQUIREMENT_RE.match(value)
+        if match:
+            name, extras_string, constraint, markers = match.group("name", "extras", "constraint", "markers")
+            constraint = constraint or "*"
+            extras = None
+            if extras_string is not None:
+                extras = [x.strip() for x in extras_string.split(",")]
+            if constraint.startswith("("):
+                if not constraint.endswith(")"):
+                    raise ValueError(f"invalid version constraint {constraint!r}")
+                constraint = constraint[1:-1].strip()
+            return PypiDependency(name=name, version=VersionSpec(constraint), extras=extras, markers=markers or None)
+
         value, markers = value.partition(";")[::2]
 
-        match = re.match(r"\s*[^<>=!~\^\(\)\*]+", value)
+        match = _PYPI_NAME_RE.match(value)
         if match:
             name = match.group(0)
             constraint = value[match.end() :].strip() or "*"
@@ -210,7 +265,7 @@ DependencyConfig: TypeAlias = "str | dict[str, t.Any] | list[dict[str, t.Any]]"
 def split_package_name_with_extras(value: str) -> tuple[str, list[str] | None]:
     """Splits *value* as a string that contains a package name and optionally its extras into components."""
 
-    match = re.match(r"\s*([^\[\]]+?)?\s*(?:\[([^\[\]]+)\])?\s*$", value)
+    match = _NAME_WITH_EXTRAS_RE.match(value)
     if not match:
         raise ValueError(f"invalid package name with extras: {value!r}")
 
@@ -251,7 +306,8 @@ def parse_dependency_string(value: str) -> Dependency:
             hashes.append(match.group(2))
         return ""
 
-    value = re.sub(r"\s--(\w+)=(.*)(\s|$)", handle_option, value)
+    if "--" in value:
+        value = _OPTION_RE.sub(handle_option, value)
 
     # Check if it's a dependency of the form `<name> @ <package>`. This can be either a
     # #UrlDependency or #GitDependency.
@@ -415,3 +471,26 @@ def parse_dependencies(dependencies: list[str] | dict[str, DependencyConfig]) ->
 
     else:
         raise TypeError(type(dependencies))
+
+
+def parse_dependencies_bulk(lines: t.Iterable[str], memo: dict[str, Dependency] | None = None) -> list[Dependency]:
+    """Parses many dependency strings with #parse_dependency_string(), e.g. the `Requires-Dist` entries of all
+    distributions in an environment. Identical lines are parsed only once and share the same #Dependency object, so
+    the returned objects must not be modified.
+
+    Args:
+      lines: The dependency strings to parse.
+      memo: A dictionary to look up and store parsed dependencies in. Pass the same dictionary to share the parsed
+        dependencies across multiple calls.
+    """
+
+    if memo is None:
+        memo = {}
+
+    result = []
+    for line in lines:
+        dependency = memo.get(line)
+        if dependency is None:
+            dependency = memo[line] = parse_dependency_string(line)
+        result.append(dependency)
+    return result
@@ -4,7 +4,9 @@ import dataclasses
 import functools
 import json
 import logging
+import os
 import pickle
+import re
 import shutil
 import subprocess as sp
 import textwrap
@@ -22,6 +24,16 @@ if t.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+#: Version of the format of the files that cache the introspection of a Python environment. Must be incremented when
+#: the data returned by #_introspect() changes.
+_INTROSPECTION_CACHE_FORMAT = 2
+
+#: The environment variables that change the `sys.path` of a Python interpreter, and thus its introspection.
+_INTROSPECTION_ENVIRONMENT_VARIABLES = ("PYTHONPATH", "PYTHONHOME", "PYTHONNOUSERSITE", "PYTHONUSERBASE")
+
+#: The number of seconds after which an unused introspection cache file is removed.
+INTROSPECTION_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
 
 @dataclasses.dataclass
 class PythonEnvironment:
@@ -37,6 +49,13 @@ class PythonEnvironment:
     pep508: pep508.Pep508Environment
     _has_pkg_resources: bool | None = None
 
+    #: The `sys.path` of the environment that is searched for distributions by #get_distributions(). This is `None`
+    #: if the environment uses custom distribution finders, in which case distributions must be looked up by the
+    #: Python interpreter of the environment itself.
+    distribution_paths: list[str] | None = None
+
+    _worker: _IntrospectionWorker | None = dataclasses.field(default=None, repr=False, compare=False)
+
     def is_venv(self) -> bool:
         """Checks if the Python environment is a virtual environment."""
 
@@ -46,16 +65,17 @@ class PythonEnvironment:
         """Checks if the Python environment has the `importlib_metadata` module available."""
 
         if self._has_pkg_resources is None:
-            code = textwrap.dedent(
-                """
-                try: import importlib_metadata
-                except ImportError: print('false')
-                else: print('true')
-                """
-            )
-            self._has_pkg_resources = json.loads(sp.check_output([self.executable, "-c", code]).decode())
+            self._has_pkg_resources = t.cast(bool, self.get_worker().call("has_importlib_metadata"))
         return self._has_pkg_resources
 
+    def get_worker(self) -> _IntrospectionWorker:
+        """Returns the worker process that runs introspection queries with the Python interpreter of this environment.
+        The process is started on first use and shared by all queries until the program exits."""
+
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = _IntrospectionWorker(self.executable)
+        return self._worker
+
     @staticmethod
     @functools.lru_cache()
     def of(python: str | t.Sequence[str]) -> "PythonEnvironment":
@@ -73,31 +93,27 @@ class PythonEnvironment:
         if full_path:
             python = [full_path] + list(python[1:])
 
-        # We ensure that the Pep508 module is importable.
-        pep508_path = str(Path(pep508.__file__).parent)
-
-        code = textwrap.dedent(
-            f"""
-            import sys, platform, json, pickle
-            sys.path.append({pep508_path!r})
-            import pep508
-            try: import importlib_metadata as metadata
-            except ImportError: metadata = None
-            print(json.dumps({{
-                "executable": sys.executable,
-                "version": sys.version,
-                "version_tuple": sys.version_info[:3],
-                "platform": platform.platform(),
-                "prefix": sys.prefix,
-                "base_prefix": getattr(sys, 'base_prefix', None),
-                "real_prefix": getattr(sys, 'real_prefix', None),
-                "pep508": pep508.Pep508Environment.current().as_json(),
-                "_has_pkg_resources": metadata is not None,
-            }}))
-            """
-        )
-
-        payload = json.loads(sp.check_output(list(python) + ["-c", code]).decode())
+        cache_file = _get_introspection_cache_file(python[0]) if len(python) == 1 else None
+        payload = None
+        if cache_file is not None:
+            try:
+                payload = json.loads(cache_file.read_text())
+                # Installing packages may add `.pth` files, which changes the `sys.path` of the environment.
+                if _get_mtimes(payload["site_directories"]) != payload["site_directories"]:
+                    payload = None
+                else:
+                    # Mark the cache file as used, so that it is not pruned (see #prune_cache_directory()).
+                    os.utime(cache_file)
+            except (OSError, ValueError, KeyError, TypeError):
+                payload = None
+
+        if payload is None:
+            payload = _introspect(python)
+            if cache_file is not None:
+                _write_introspection_cache_file(cache_file, payload)
+
+        payload = dict(payload)
+        payload.pop("site_directories")
         payload["version_tuple"] = tuple(payload["version_tuple"])
         payload["pep508"] = pep508.Pep508Environment(**payload["pep508"])
         return PythonEnvironment(**payload)
@@ -109,27 +125,282 @@ class PythonEnvironment:
 
     def get_distributions(self, distributions: t.Collection[str]) -> dict[str, Distribution | None]:
         """Query the details for the given distributions in the Python environment with
-        #importlib_metadata.distribution()."""
+        #importlib_metadata.distribution().
+
+        The `.dist-info` and `.egg-info` directories are searched in-process in the #distribution_paths of the
+        environment. Only if the environment uses custom distribution finders, the query is delegated to the Python
+        interpreter of the environment."""
+
+        from importlib_metadata import DistributionFinder, MetadataPathFinder
+
+        if self.distribution_paths is None:
+            return self._get_distributions_from_interpreter(distributions)
+
+        result: dict[str, Distribution | None] = {}
+        for name in distributions:
+            context = DistributionFinder.Context(name=name, path=self.distribution_paths)
+            result[name] = next(iter(MetadataPathFinder.find_distributions(context)), None)
+        return result
+
+    def get_distributions_metadata(self, distributions: t.Collection[str]) -> dict[str, DistributionMetadata | None]:
+        """Query the metadata for the given distributions in the Python environment. Uses the #DistributionIndex of the
+        environment if it has one (see #get_distribution_index()), otherwise the distributions are looked up with
+        #get_distributions()."""
+
+        index = self.get_distribution_index()
+        if index is not None:
+            return {name: index.get(name) for name in distributions}
+
+        return {
+            name: None if dist is None else get_distribution_metadata(dist)
+            for name, dist in self.get_distributions(distributions).items()
+        }
+
+    def get_distribution_index(self) -> DistributionIndex | None:
+        """Returns the #DistributionIndex of the environment. The index is only maintained for virtual environments
+        managed by Slap (i.e. that contain a `slap.json` file), otherwise `None` is returned. The index is rebuilt if
+        any of the directories on the #distribution_paths changed since it was written."""
+
+        if self.distribution_paths is None or not Path(self.prefix, "slap.json").is_file():
+            return None
+
+        index_file = Path(self.prefix, DistributionIndex.FILENAME)
+        index = DistributionIndex.load(index_file)
+        mtimes = _get_mtimes(self.distribution_paths)
+        if index is None or index.mtimes != mtimes:
+            index = DistributionIndex.build(self.distribution_paths, mtimes)
+            try:
+                index.save(index_file)
+            except OSError as exc:
+                logger.warning("Could not write distribution index <val>%s</val>: %s", index_file, exc)
+        return index
+
+    def _get_distributions_from_interpreter(self, distributions: t.Collection[str]) -> dict[str, Distribution | None]:
+        # NOTE: The worker returns the path of a distribution's metadata directory instead of the distribution object
+        #       where it can. The unpickled object would be a distribution of the interpreter's `importlib.metadata`
+        #       module, whose location #get_distribution_metadata() cannot determine.
+        keys = list(distributions)
+        result = self.get_worker().call("distributions", keys)
+        return {key: PathDistribution(Path(dist)) if isinstance(dist, str) else dist for key, dist in zip(keys, result)}
+
 
-        code = textwrap.dedent(
-            """
-            import sys, pickle
+class _IntrospectionWorker:
+    """Internal. A Python process that runs introspection queries for a foreign Python interpreter, such that the
+    interpreter startup is paid only once. Requests and responses are pickled and sent over the process' stdin and
+    stdout, each prefixed with its length as a 4-byte big-endian integer. The process terminates when its stdin is
+    closed, which happens at the latest when the program exits."""
+
+    CODE = textwrap.dedent(
+        """
+        import pathlib, pickle, struct, sys, traceback
+
+        def distributions(names):
             try: import importlib.metadata as metadata
             except ImportError: import importlib_metadata as metadata
             result = []
-            for arg in sys.argv[1:]:
+            for name in names:
                 try:
-                    dist = metadata.distribution(arg)
+                    dist = metadata.distribution(name)
                 except metadata.PackageNotFoundError:
-                    dist = None
-                result.append(dist)
-            sys.stdout.buffer.write(pickle.dumps(result))
-            """
-        )
+                    result.append(None)
+                    continue
+                path = getattr(dist, "_path", None)
+                result.append(str(path) if isinstance(path, pathlib.Path) else dist)
+            return result
+
+        def has_importlib_metadata():
+            try: import importlib_metadata
+            except ImportError: return False
+            return True
+
+        METHODS = {"distributions": distributions, "has_importlib_metadata": has_importlib_metadata}
+
+        # Keep the protocol stream clean from anything that is printed while handling a request.
+        stdin, stdout, sys.stdout = sys.stdin.buffer, sys.stdout.buffer, sys.stderr
+        while True:
+            header = stdin.read(4)
+            if len(header) < 4:
+                break
+            method, args = pickle.loads(stdin.read(struct.unpack(">I", header)[0]))
+            try:
+                response = (True, METHODS[method](*args))
+            except Exception:
+                response = (False, traceback.format_exc())
+            data = pickle.dumps(response, protocol=2)
+            stdout.write(struct.pack(">I", len(data)) + data)
+            stdout.flush()
+        """
+    )
 
-        keys = list(distributions)
-        result = pickle.loads(sp.check_output([self.executable, "-c", code] + keys))
-        return dict(zip(keys, result))
+    def __init__(self, executable: str) -> None:
+        import atexit
+        import threading
+
+        self.executable = executable
+        self._lock = threading.Lock()
+        self._process = sp.Popen([executable, "-c", self.CODE], stdin=sp.PIPE, stdout=sp.PIPE)
+        atexit.register(self.close)
+
+    def call(self, method: str, *args: t.Any) -> t.Any:
+        """Runs the function *method* in the worker process and returns its result.
+
+        Raises:
+          RuntimeError: If the function raised an exception or the worker process terminated unexpectedly.
+        """
+
+        data = pickle.dumps((method, args), protocol=2)
+        with self._lock:
+            try:
+                ok, result = pickle.loads(self._exchange(data))
+            except (OSError, EOFError) as exc:
+                raise RuntimeError(f"introspection worker for {self.executable!r} terminated unexpectedly") from exc
+
+        if not ok:
+            raise RuntimeError(f"introspection query {method!r} failed in {self.executable!r}:\n{result}")
+        return result
+
+    def _exchange(self, data: bytes) -> bytes:
+        """Sends the message *data* to the worker process and returns its response. Raises #EOFError if the worker
+        process closed its output before the response was complete."""
+
+        import struct
+
+        stdin, stdout = self._process.stdin, self._process.stdout
+        assert stdin is not None
+        assert stdout is not None
+        stdin.write(struct.pack(">I", len(data)) + data)
+        stdin.flush()
+        header = stdout.read(4)
+        if len(header) < 4:
+            raise EOFError
+        return stdout.read(struct.unpack(">I", header)[0])
+
+    def is_alive(self) -> bool:
+        return self._process.poll() is None
+
+    def close(self) -> None:
+        """Terminates the worker process."""
+
+        if self._process.poll() is not None:
+            return
+        assert self._process.stdin is not None
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, sp.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+
+
+def _introspect(python: t.Sequence[str]) -> dict[str, t.Any]:
+    """Internal. Runs the Python interpreter to retrieve the data for a #PythonEnvironment."""
+
+    # We ensure that the Pep508 module is importable.
+    pep508_path = str(Path(pep508.__file__).parent)
+
+    code = textwrap.dedent(
+        f"""
+        import sys, platform, json, pickle, os, site
+        sys_path = [p for p in sys.path if p]
+        sys.path.append({pep508_path!r})
+        import pep508
+        try: import importlib_metadata as metadata
+        except ImportError: metadata = None
+        finders = [f if isinstance(f, type) else type(f) for f in sys.meta_path if hasattr(f, "find_distributions")]
+        standard_finders = all(f.__module__ in ("_frozen_importlib_external", "importlib_metadata") for f in finders)
+        site_directories = getattr(site, "getsitepackages", lambda: [])()
+        if site.ENABLE_USER_SITE:
+            site_directories.append(site.getusersitepackages())
+        print(json.dumps({{
+            "executable": sys.executable,
+            "version": sys.version,
+            "version_tuple": sys.version_info[:3],
+            "platform": platform.platform(),
+            "prefix": sys.prefix,
+            "base_prefix": getattr(sys, 'base_prefix', None),
+            "real_prefix": getattr(sys, 'real_prefix', None),
+            "pep508": pep508.Pep508Environment.current().as_json(),
+            "_has_pkg_resources": metadata is not None,
+            "distribution_paths": sys_path if standard_finders else None,
+            "site_directories": [d for d in site_directories if os.path.isdir(d)],
+        }}))
+        """
+    )
+
+    payload = json.loads(sp.check_output(list(python) + ["-c", code]).decode())
+    payload["site_directories"] = _get_mtimes(payload["site_directories"])
+    return t.cast(dict[str, t.Any], payload)
+
+
+def _get_mtimes(paths: t.Iterable[str]) -> dict[str, int | None]:
+    """Internal. Returns the modification times of the given *paths*, or `None` for paths that do not exist."""
+
+    result: dict[str, int | None] = {}
+    for path in paths:
+        try:
+            result[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            result[path] = None
+    return result
+
+
+def _get_introspection_cache_file(executable: str) -> Path | None:
+    """Internal. Returns the path to the file that caches the result of #_introspect() for the given Python
+    *executable*. The cache key includes the path of the executable, the inode and modification time of the
+    interpreter it points to, the `pyvenv.cfg` of the environment and the environment variables that change the
+    `sys.path` of the interpreter, so that a changed or recreated environment does not hit a stale cache entry.
+    Returns `None` if the executable does not exist or is a script (like a Pyenv shim), as the interpreter that a
+    script dispatches to may depend on the environment."""
+
+    import hashlib
+
+    from slap import __version__
+    from slap.util.cache import get_user_cache_directory
+
+    path = Path(executable).absolute()
+    try:
+        resolved_path = path.resolve()
+        stat = resolved_path.stat()
+        with resolved_path.open("rb") as fp:
+            if fp.read(2) == b"#!":
+                return None
+    except OSError:
+        return None
+
+    try:
+        pyvenv_cfg = (path.parent.parent / "pyvenv.cfg").read_text()
+    except OSError:
+        pyvenv_cfg = None
+
+    key = json.dumps(
+        [
+            _INTROSPECTION_CACHE_FORMAT,
+            __version__,
+            str(path),
+            str(resolved_path),
+            stat.st_ino,
+            stat.st_mtime_ns,
+            pyvenv_cfg,
+            [os.getenv(name) for name in _INTROSPECTION_ENVIRONMENT_VARIABLES],
+        ]
+    )
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return get_user_cache_directory() / "python-environments" / f"{digest}.json"
+
+
+def _write_introspection_cache_file(cache_file: Path, payload: dict[str, t.Any]) -> None:
+    from slap.util.cache import prune_cache_directory
+    from slap.util.fs import atomic_write
+
+    # Every environment that was ever introspected leaves a file behind, so old files are removed whenever a new one
+    # is written.
+    prune_cache_directory(cache_file.parent, INTROSPECTION_CACHE_MAX_AGE)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(cache_file, "w", None) as fp:
+            json.dump(payload, fp)
+    except OSError as exc:
+        logger.debug("Could not write Python environment cache <val>%s</val>: %s", cache_file, exc)
 
 
 @dataclasses.dataclass
@@ -159,6 +430,77 @@ def get_distribution_metadata(dist: Distribution) -> DistributionMetadata:
     )
 
 
+def normalize_distribution_name(name: str) -> str:
+    """Normalizes a distribution name according to [PEP 503](https://peps.python.org/pep-0503/#normalized-names)."""
+
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@dataclasses.dataclass
+class DistributionIndex:
+    """An index of the metadata of all distributions installed in a Python environment, so that querying the installed
+    distributions is a single file read instead of a scan of all `.dist-info` directories."""
+
+    #: The name of the file in the environment's prefix that the index is stored in.
+    FILENAME: t.ClassVar[str] = "slap-distributions.json"
+
+    #: The version of the file format. Indexes stored with a different version are ignored.
+    FORMAT: t.ClassVar[int] = 1
+
+    #: The modification times of the directories that were scanned to build the index.
+    mtimes: dict[str, int | None]
+
+    #: Maps the normalized distribution names to their metadata.
+    distributions: dict[str, DistributionMetadata]
+
+    def get(self, name: str) -> DistributionMetadata | None:
+        return self.distributions.get(normalize_distribution_name(name))
+
+    @staticmethod
+    def build(paths: list[str], mtimes: dict[str, int | None]) -> DistributionIndex:
+        """Scans the *paths* for distributions. If a distribution is found multiple times, the first one wins, just
+        like it would when importing from these paths."""
+
+        from importlib_metadata import DistributionFinder, MetadataPathFinder
+
+        distributions: dict[str, DistributionMetadata] = {}
+        for dist in MetadataPathFinder.find_distributions(DistributionFinder.Context(path=paths)):
+            name = dist.metadata["Name"]
+            if name is not None:
+                distributions.setdefault(normalize_distribution_name(name), get_distribution_metadata(dist))
+        return DistributionIndex(mtimes, distributions)
+
+    @staticmethod
+    def load(path: Path) -> DistributionIndex | None:
+        """Loads the index from *path*. Returns `None` if the file does not exist or cannot be read."""
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data["format"] != DistributionIndex.FORMAT:
+                return None
+            distributions = {
+                name: DistributionMetadata(**{**meta, "extras": set(meta["extras"])})
+                for name, meta in data["distributions"].items()
+            }
+            return DistributionIndex(data["mtimes"], distributions)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        from slap.util.fs import atomic_write
+
+        data = {
+            "format": self.FORMAT,
+            "mtimes": self.mtimes,
+            "distributions": {
+                name: {**dataclasses.asdict(meta), "extras": sorted(meta.extras)}
+                for name, meta in self.distributions.items()
+            },
+        }
+        with atomic_write(path, "w", None) as fp:
+            json.dump(data, fp)
+
+
 @dataclasses.dataclass
 class DistributionGraph:
     """Represents a resolved graph of distributions, their metadata and dependencies in a Python environment."""
@@ -187,79 +529,79 @@ class DistributionGraph:
 def build_distribution_graph(
     env: PythonEnvironment,
     dependencies: list[Dependency],
-    resolved_callback: t.Callable[[dict[str, Distribution | None]], t.Any] | None = None,
-    dists_cache: dict[str, Distribution | None] | None = None,
+    resolved_callback: t.Callable[[dict[str, DistributionMetadata | None]], t.Any] | None = None,
+    metadata_cache: dict[str, DistributionMetadata | None] | None = None,
+    expanded_callback: t.Callable[[DistributionGraph, list[str]], t.Any] | None = None,
 ) -> DistributionGraph:
     """Builds a #DistributionGraph in the given #PythonEnvironment using the given dependencies.
 
+    The graph is built breadth-first: the distributions of every level of the dependency tree are looked up with a
+    single call to #PythonEnvironment.get_distributions_metadata(). Every distribution is expanded only once, unless
+    it is required again with extras that it was not yet expanded with.
+
     Args:
       env: The Python environment in which to resolve the dependencies.
       dependencies: The dependencies to resolve. Note that this list should already be filtered by its markers.
       resolved_callback: A callback that is invoked with the list of dependencies that have been successfully
         resolved. This is useful for progress reporting.
+      metadata_cache: A dictionary to look up and store the metadata of the distributions found in the environment.
+      expanded_callback: A callback that is invoked after every level of the dependency tree with the graph built so
+        far and the sorted names of the distributions that were expanded in that level, including the missing ones.
+        The graph entries of these distributions are complete, unless they are expanded again with new extras in a
+        later level. This is useful to stream the graph while it is being built.
     """
 
-    from slap.python.dependency import parse_dependencies
+    from slap.python.dependency import parse_dependencies_bulk
     from slap.python.pep508 import filter_dependencies
 
     graph = DistributionGraph({}, {}, set())
 
-    if dists_cache is None:
-        dists_cache = {}
-
-    logger.info("Fetching requirements: <val>%s</val>", dependencies)
-
-    # TODO (@NiklasRosenstein): Should we warn here if the dependencies map is smaller than the dependencies list?
-    dependencies_map = {dependency.name: dependency for dependency in dependencies}
-
-    # Resolve the distributions available in the Python environment.
-    distributions = {dist_name: dists_cache[dist_name] for dist_name in dependencies_map if dist_name in dists_cache}
-    fetch_distributions = dependencies_map.keys() - distributions.keys()
-    if fetch_distributions:
-        fetched_distributions = env.get_distributions(fetch_distributions)
-        distributions.update(fetched_distributions)
-        dists_cache.update(fetched_distributions)
-
-    if resolved_callback:
-        resolved_callback(distributions)
-
-    # Parse the dependencies of the distributions.
-    prefetch_distributions: set[str] = set()
-    metadata: dict[str, tuple[DistributionMetadata, list[Dependency]]] = {}
-    for dist_name, dist in distributions.items():
-        if dist is None:
-            graph.missing.add(dist_name)
-        else:
-            dist_meta = get_distribution_metadata(dist)
-            dist_extras = set(dependencies_map[dist_name].extras or [])
+    if metadata_cache is None:
+        metadata_cache = {}
+
+    # Maps the distributions to resolve in the next level to the extras that they are required with.
+    frontier: dict[str, set[str]] = {}
+    for dependency in dependencies:
+        frontier.setdefault(dependency.name, set()).update(dependency.extras or [])
+
+    # Maps the distributions that have been expanded to the extras that they were expanded with.
+    expanded: dict[str, set[str]] = {}
+    requirements_memo: dict[str, Dependency] = {}
+
+    while frontier:
+        logger.info("Fetching requirements: <val>%s</val>", sorted(frontier))
+
+        fetch_distributions = frontier.keys() - metadata_cache.keys()
+        if fetch_distributions:
+            metadata_cache.update(env.get_distributions_metadata(fetch_distributions))
+
+        if resolved_callback:
+            resolved_callback({dist_name: metadata_cache[dist_name] for dist_name in frontier})
+
+        expanded.update(frontier)
+        next_frontier: dict[str, set[str]] = {}
+
+        for dist_name, dist_extras in frontier.items():
+            dist_meta = metadata_cache[dist_name]
+            if dist_meta is None:
+                graph.missing.add(dist_name)
+                continue
+
+            graph.metadata[dist_name] = dist_meta
+
             parsed_dependencies = filter_dependencies(
-                parse_dependencies(dist_meta.requirements), env.pep508, dist_extras
+                parse_dependencies_bulk(dist_meta.requirements, requirements_memo), env.pep508, dist_extras
             )
-            metadata[dist_name] = (dist_meta, parsed_dependencies)
-            prefetch_distributions |= {dependency.name for dependency in parsed_dependencies}
-
-    # Prefetch distributions.
-    prefetch_distributions -= dists_cache.keys()
-    if prefetch_distributions:
-        dists_cache.update(env.get_distributions(prefetch_distributions))
-
-    # Continue building the graph recursively.
-    for dist_name, (dist_meta, parsed_dependencies) in metadata.items():
-        graph.metadata[dist_name] = dist_meta
-
-        for dependency in parsed_dependencies:
-            graph.dependencies.setdefault(dist_name, set()).add(dependency.name)
-
-        # TODO (@NiklasRosenstein): Potential optimization here is to cache which distributions have already been
-        #   resolved; and to pre-fetch all distributions needed in the recursive call in the parent collectively
-        #   across all the dependencies of the current set of distributions.
-        new_graph = build_distribution_graph(
-            env=env,
-            dependencies=parsed_dependencies,
-            resolved_callback=resolved_callback,
-            dists_cache=dists_cache,
-        )
-
-        graph.update(new_graph)
+            for dependency in parsed_dependencies:
+                graph.dependencies.setdefault(dist_name, set()).add(dependency.name)
+                extras = set(dependency.extras or [])
+                if dependency.name not in expanded or not extras <= expanded[dependency.name]:
+                    next_frontier.setdefault(dependency.name, set()).update(extras)
+
+        if expanded_callback:
+            expanded_callback(graph, sorted(frontier))
+
+        # Distributions that need to be expanded again are expanded with all extras they have been required with.
+        frontier = {dist_name: extras | expanded.get(dist_name, set()) for dist_name, extras in next_frontier.items()}
 
     return graph
@@ -9,6 +9,22 @@ if t.TYPE_CHECKING:
     # NOTE (@NiklasRosenstein): For when we check the file individually
     from slap.python.dependency import Dependency  # type: ignore[import]
 
+#: The names of the variables that can be used in environment markers, in the order in which compiled markers
+#: receive their values (see #Pep508Environment._marker_values).
+_MARKER_VARIABLES = (
+    "python_version",
+    "python_full_version",
+    "os_name",
+    "sys_platform",
+    "platform_release",
+    "platform_system",
+    "platform_machine",
+    "platform_python_implementation",
+    "implementation_name",
+    "implementation_version",
+)
+_MARKER_VARIABLE_INDEX = {name: index for index, name in enumerate(_MARKER_VARIABLES)}
+
 
 class Pep508Environment:
     """Contains the variables for evaluating PEP 508 environment markers."""
@@ -41,6 +57,18 @@ class Pep508Environment:
         args = ", ".join([f"{k}={v!r}" for k, v in self.as_json().items()])
         return f"{type(self).__name__}({args})"
 
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        super().__setattr__(name, value)
+        if name in _MARKER_VARIABLE_INDEX:
+            self.__dict__.pop("_marker_values", None)
+
+    @functools.cached_property
+    def _marker_values(self) -> tuple[str, ...]:
+        """Internal. The values of the variables in the order of #_MARKER_VARIABLES, which is how compiled markers
+        look them up. Rebuilt when a variable is assigned."""
+
+        return tuple(getattr(self, name) for name in _MARKER_VARIABLES)
+
     @staticmethod
     def current() -> Pep508Environment:
         """Returns a #Pep508Environment for the current Python interpreter."""
@@ -70,12 +98,16 @@ class Pep508Environment:
             implementation_version=format_full_version(sys.implementation.version),
         )
 
-    def as_json(self) -> t.Dict[str, str]:
-        return dict(vars(self))
+    def as_json(self) -> dict[str, str]:
+        return {name: getattr(self, name) for name in _MARKER_VARIABLES}
+
+    def replace(self, **kwargs: str) -> Pep508Environment:
+        """Returns a copy of the environment with the given variables replaced. Useful to derive environments for
+        other platforms or Python versions, e.g. for #evaluate_matrix()."""
 
-    def evaluate_markers(
-        self, markers: str, extras: t.Optional[t.Set[str]] = None, source: t.Optional[str] = None
-    ) -> bool:
+        return Pep508Environment(**{**self.as_json(), **kwargs})
+
+    def evaluate_markers(self, markers: str, extras: set[str] | None = None, source: str | None = None) -> bool:
         """Evaluate a PEP 508 environment marker.
 
         Args:
@@ -86,85 +118,135 @@ class Pep508Environment:
             is invalid, this value will be included in the error message. If not specified, falls back to `<string>`.
         """
 
-        scope = self.as_json()
+        try:
+            compiled = compile_markers(markers)
+        except SyntaxError as exc:
+            exc.filename = source or "<string>"
+            raise
+        return compiled.evaluate(self, extras)
 
-        if extras is not None:
 
-            class ExtrasEq:
-                def __repr__(self) -> str:
-                    return f"ExtrasEq({extras!r})"
+#: Signature of a compiled environment marker expression. It receives the values of the variables of a
+#: #Pep508Environment in the order of #_MARKER_VARIABLES and the set of extras (or `None`).
+_MarkerFunc = t.Callable[[tuple[str, ...], set[str] | None], bool]
 
-                def __eq__(self, other) -> bool:
-                    if isinstance(other, str):
-                        assert extras is not None
-                        return other in extras
-                    return False
+_COMPARISON_OPERATORS: dict[type[ast.cmpop], t.Callable[[t.Any, t.Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
 
-            scope["extra"] = t.cast(str, ExtrasEq())
 
-        try:
-            return _eval_environment_marker_ast(ast.parse(markers, filename=source or "<string>", mode="eval"), scope)
-        except (ValueError, KeyError) as exc:
-            raise ValueError(f"invalid environment marker string: {markers!r}\n  hint: {exc}")
-
-
-def _eval_environment_marker_ast(node: ast.AST, scope: t.Dict[str, t.Any]) -> bool:
-    """Evaluates an environment marker AST using the given *scope*. This is safer than using #eval()
-    to avoid arbitrary code execution."""
-
-    if isinstance(node, ast.Expression):
-        return _eval_environment_marker_ast(node.body, scope)
-
-    if isinstance(node, ast.BoolOp):
-        op, initial = {
-            ast.And: (operator.and_, True),
-            ast.Or: (operator.or_, False),
-        }[type(node.op)]
-        return functools.reduce(lambda a, b: op(a, _eval_environment_marker_ast(b, scope)), node.values, initial)
-
-    elif isinstance(node, ast.Compare):
-        if len(node.ops) != 1 or len(node.comparators) != 1:
-            raise ValueError("multiple comparators are not supported in environment markers")
-        op = {
-            ast.Eq: operator.eq,
-            ast.NotEq: operator.ne,
-            ast.Lt: operator.lt,
-            ast.LtE: operator.le,
-            ast.Gt: operator.gt,
-            ast.GtE: operator.ge,
-        }[type(node.ops[0])]
-        return op(
-            _eval_environment_markers_ast_value(node.left, scope),
-            _eval_environment_markers_ast_value(node.comparators[0], scope),
-        )
+class CompiledMarkers:
+    """A PEP 508 environment marker expression that has been compiled into a closure. Use #compile_markers() to
+    get an instance of this class."""
 
-    raise ValueError(f"Node of type {type(node).__name__!r} not supported in environment markers")
+    def __init__(self, markers: str, func: _MarkerFunc, uses_extra: bool) -> None:
+        self.markers = markers
+        self.uses_extra = uses_extra
+        self._func = func
 
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.markers!r})"
 
-def _eval_environment_markers_ast_value(node: ast.expr, scope: t.Dict[str, t.Any]) -> t.Any:
-    """Resolve the value of an AST expression from the given *scope*."""
+    def evaluate(self, env: Pep508Environment, extras: set[str] | None = None) -> bool:
+        """Evaluate the markers against *env*. See #Pep508Environment.evaluate_markers() for the *extras* argument."""
 
-    if isinstance(node, ast.Name):
-        try:
-            return scope[node.id]
-        except KeyError:
-            raise ValueError(f"Marker {node.id!r} is not available in this context")
+        if self.uses_extra and extras is None:
+            raise ValueError(
+                f"invalid environment marker string: {self.markers!r}\n"
+                "  hint: Marker 'extra' is not available in this context"
+            )
+        return self._func(env._marker_values, extras)
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_markers(markers: str) -> CompiledMarkers:
+    """Compiles a PEP 508 environment marker expression. The result is cached by the marker text, so parsing the
+    same markers again (e.g. for the `Requires-Dist` entries of many distributions) is a dictionary lookup.
+
+    Raises:
+      SyntaxError: If *markers* is not a valid Python expression.
+      ValueError: If *markers* uses an expression or variable that is not supported in environment markers.
+    """
+
+    compiler = _MarkerCompiler()
+    try:
+        func = compiler.compile(ast.parse(markers, mode="eval"))
+    except (ValueError, KeyError) as exc:
+        raise ValueError(f"invalid environment marker string: {markers!r}\n  hint: {exc}") from exc
+    return CompiledMarkers(markers, func, compiler.uses_extra)
+
+
+class _MarkerCompiler:
+    """Compiles an environment marker AST into a closure. This is safer than using #eval() to avoid arbitrary code
+    execution."""
+
+    def __init__(self) -> None:
+        self.uses_extra = False
 
-    elif isinstance(node, ast.Constant):
-        return node.value
+    def compile(self, node: ast.AST) -> _MarkerFunc:
+        if isinstance(node, ast.Expression):
+            return self.compile(node.body)
 
-    raise ValueError(f"Node of type {type(node).__name__!r} not supported in environment markers")
+        if isinstance(node, ast.BoolOp):
+            funcs = [self.compile(value) for value in node.values]
+            if isinstance(node.op, ast.And):
+                return lambda scope, extras: all(func(scope, extras) for func in funcs)
+            if isinstance(node.op, ast.Or):
+                return lambda scope, extras: any(func(scope, extras) for func in funcs)
+
+        elif isinstance(node, ast.Compare):
+            if len(node.ops) != 1 or len(node.comparators) != 1:
+                raise ValueError("multiple comparators are not supported in environment markers")
+            op = _COMPARISON_OPERATORS[type(node.ops[0])]
+            left, right = node.left, node.comparators[0]
+
+            # The `extra` marker is compared against the set of extras instead of a single value.
+            if _is_extra(left) or _is_extra(right):
+                value = right if _is_extra(left) else left
+                if not isinstance(value, ast.Constant) or op not in (operator.eq, operator.ne):
+                    raise ValueError("the 'extra' marker can only be compared to a string with == or !=")
+                self.uses_extra = True
+                extra, negate = value.value, op is operator.ne
+                return lambda scope, extras: (extra in extras) != negate  # type: ignore[operator]
+
+            get_left, get_right = self._compile_value(left), self._compile_value(right)
+            return lambda scope, extras: op(get_left(scope), get_right(scope))
+
+        raise ValueError(f"Node of type {type(node).__name__!r} not supported in environment markers")
+
+    def _compile_value(self, node: ast.expr) -> t.Callable[[tuple[str, ...]], t.Any]:
+        """Compile an AST expression into a function that resolves the value from the environment variables."""
+
+        if isinstance(node, ast.Name):
+            if node.id not in _MARKER_VARIABLE_INDEX:
+                raise ValueError(f"Marker {node.id!r} is not available in this context")
+            return operator.itemgetter(_MARKER_VARIABLE_INDEX[node.id])
+
+        if isinstance(node, ast.Constant):
+            value = node.value
+            return lambda scope: value
+
+        raise ValueError(f"Node of type {type(node).__name__!r} not supported in environment markers")
+
+
+def _is_extra(node: ast.expr) -> bool:
+    return isinstance(node, ast.Name) and node.id == "extra"
 
 
 def filter_dependencies(
-    dependencies: t.Iterable["Dependency"], env: Pep508Environment, extras: t.Optional[t.Set[str]]
-) -> t.List["Dependency"]:
+    dependencies: t.Iterable[Dependency], env: Pep508Environment, extras: set[str] | None
+) -> list[Dependency]:
     """Filters a collection of dependencies according to their environment markers and Python requirements."""
 
     return [dependency for dependency in dependencies if test_dependency(dependency, env, extras)]
 
 
-def test_dependency(dependency: "Dependency", env: Pep508Environment, extras: t.Optional[t.Set[str]]) -> bool:
+def test_dependency(dependency: Dependency, env: Pep508Environment, extras: set[str] | None) -> bool:
     """Tests if the *dependency* should be included given the current environment and extras."""
 
     if dependency.python and not dependency.python.accepts(env.python_version):
@@ -172,5 +254,75 @@ def test_dependency(dependency: "Dependency", env: Pep508Environment, extras: t.
     return not dependency.markers or env.evaluate_markers(dependency.markers, extras)
 
 
+class MarkerMatrix:
+    """The result of #evaluate_matrix(). Stores for every dependency a bit mask of the environments that it applies
+    to, where bit *i* corresponds to the *i*-th environment."""
+
+    def __init__(
+        self, dependencies: t.Sequence[Dependency], environments: t.Sequence[Pep508Environment], rows: list[int]
+    ) -> None:
+        self.dependencies = dependencies
+        self.environments = environments
+        self.rows = rows
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(dependencies={len(self.dependencies)}, environments={len(self.environments)})"
+
+    def __getitem__(self, key: tuple[int, int]) -> bool:
+        """Returns `True` if the dependency at the first index applies to the environment at the second index."""
+
+        dependency_index, environment_index = key
+        return bool(self.rows[dependency_index] >> environment_index & 1)
+
+    def dependencies_for(self, environment_index: int) -> list[Dependency]:
+        """Returns the dependencies that apply to the environment at *environment_index*."""
+
+        mask = 1 << environment_index
+        return [dependency for dependency, row in zip(self.dependencies, self.rows, strict=True) if row & mask]
+
+    def environments_for(self, dependency_index: int) -> list[Pep508Environment]:
+        """Returns the environments that the dependency at *dependency_index* applies to."""
+
+        row = self.rows[dependency_index]
+        return [environment for index, environment in enumerate(self.environments) if row >> index & 1]
+
+    def to_list(self) -> list[list[bool]]:
+        """Returns the matrix as a list of rows, one per dependency, with one boolean per environment."""
+
+        return [[bool(row >> index & 1) for index in range(len(self.environments))] for row in self.rows]
+
+
+def evaluate_matrix(
+    dependencies: t.Iterable[Dependency],
+    environments: t.Sequence[Pep508Environment],
+    extras: set[str] | None,
+) -> MarkerMatrix:
+    """Evaluates the Python requirements and environment markers of all *dependencies* against all *environments* in
+    one pass. Every marker is compiled once and every distinct Python requirement is tested once per distinct Python
+    version, so evaluating a dependency list for many target platforms costs little more than for a single one."""
+
+    dependencies = list(dependencies)
+    python_accepts: dict[tuple[str, str], bool] = {}
+    rows = []
+
+    for dependency in dependencies:
+        row = (1 << len(environments)) - 1
+        if dependency.python:
+            for index, environment in enumerate(environments):
+                key = (str(dependency.python), environment.python_version)
+                if key not in python_accepts:
+                    python_accepts[key] = dependency.python.accepts(environment.python_version)
+                if not python_accepts[key]:
+                    row &= ~(1 << index)
+        if dependency.markers and row:
+            compiled = compile_markers(dependency.markers)
+            for index, environment in enumerate(environments):
+                if row >> index & 1 and not compiled.evaluate(environment, extras):
+                    row &= ~(1 << index)
+        rows.append(row)
+
+    return MarkerMatrix(dependencies, environments, rows)
+
+
 if __name__ == "__main__":
     print(Pep508Environment.current())
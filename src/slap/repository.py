@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import abc
 import dataclasses
+import functools
 import typing as t
 from pathlib import Path
 
@@ -57,6 +58,50 @@ class RepositoryHost(abc.ABC):
     @abc.abstractmethod
     def get_pull_request_by_reference(self, pr_reference: str) -> PullRequest: ...
 
+    def get_issues_by_reference(self, issue_references: t.Sequence[str]) -> list[Issue | ValueError]:
+        """Resolves many issue references at once. References that are invalid are returned as the #ValueError
+        instead of raising it. Implementations that need to query an API for references should override this
+        method to resolve them with fewer requests."""
+
+        return [_catch_value_error(self.get_issue_by_reference, reference) for reference in issue_references]
+
+    def get_pull_requests_by_reference(self, pr_references: t.Sequence[str]) -> list[PullRequest | ValueError]:
+        """Like #get_issues_by_reference(), but for pull requests."""
+
+        return [_catch_value_error(self.get_pull_request_by_reference, reference) for reference in pr_references]
+
+    def resolve_references(self, issues: t.Iterable[str] = (), pull_requests: t.Iterable[str] = ()) -> None:
+        """Resolves the given issue and pull request references that were not resolved yet and memoizes the results
+        for #resolve_issue() and #resolve_pull_request(). Each distinct reference is only resolved once, and
+        all of them are passed to #get_issues_by_reference() and #get_pull_requests_by_reference() in one call."""
+
+        resolved = self._resolved_references
+        for kind, references, func in (
+            ("issue", issues, self.get_issues_by_reference),
+            ("pr", pull_requests, self.get_pull_requests_by_reference),
+        ):
+            pending = [ref for ref in dict.fromkeys(references) if (kind, ref) not in resolved]
+            if pending:
+                resolved.update(((kind, ref), result) for ref, result in zip(pending, func(pending), strict=True))
+
+    def resolve_issue(self, issue_reference: str) -> Issue:
+        """Like #get_issue_by_reference(), but the result is memoized (see #resolve_references())."""
+
+        self.resolve_references(issues=[issue_reference])
+        return t.cast(Issue, _raise_value_error(self._resolved_references["issue", issue_reference]))
+
+    def resolve_pull_request(self, pr_reference: str) -> PullRequest:
+        """Like #get_pull_request_by_reference(), but the result is memoized (see #resolve_references())."""
+
+        self.resolve_references(pull_requests=[pr_reference])
+        return t.cast(PullRequest, _raise_value_error(self._resolved_references["pr", pr_reference]))
+
+    @functools.cached_property
+    def _resolved_references(self) -> dict[tuple[str, str], Issue | PullRequest | ValueError]:
+        """The memoized results of #resolve_references(), keyed by the kind and the reference."""
+
+        return {}
+
     @abc.abstractmethod
     def comment_on_issue(self, issue_reference: str, message: str) -> None: ...
 
@@ -68,6 +113,22 @@ class RepositoryHost(abc.ABC):
     def detect_repository_host(repository: Repository) -> RepositoryHost | None: ...
 
 
+T = t.TypeVar("T")
+
+
+def _catch_value_error(func: t.Callable[[str], T], arg: str) -> T | ValueError:
+    try:
+        return func(arg)
+    except ValueError as exc:
+        return exc
+
+
+def _raise_value_error(value: T | ValueError) -> T:
+    if isinstance(value, ValueError):
+        raise value
+    return value
+
+
 class Repository(Configuration):
     """A repository represents a directory that contains one or more projects. A repository represents one or more
     projects in one logical unit, usually tracked by a single version control repository. The class"""
@@ -155,7 +216,8 @@ class Repository(Configuration):
         return Optional(self._handler()).map(lambda h: h.get_repository_host(self)).or_else(None)
 
     def get_project_by_directory(self, directory: Path) -> Project:
+        directory = directory.resolve()
         for project in self.projects():
-            if project.directory == directory:
+            if project.directory.resolve() == directory:
                 return project
         raise ValueError(f"no project found for directory {directory}")
@@ -0,0 +1,43 @@
+"""Helpers for the on-disk caches of Slap."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def get_user_cache_directory() -> Path:
+    """Returns the directory for caches that are shared by all Slap invocations of the current user. This is the
+    `SLAP_CACHE_DIR` environment variable if it is set, otherwise a `slap` directory in the platform's cache
+    directory. The directory is not guaranteed to exist."""
+
+    if cache_dir := os.getenv("SLAP_CACHE_DIR"):
+        return Path(cache_dir)
+    if sys.platform == "win32":
+        return Path(os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local") / "slap" / "cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "slap"
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "slap"
+
+
+def prune_cache_directory(directory: Path, max_age: float) -> None:
+    """Removes the files in *directory* that were not modified in the last *max_age* seconds. Caches that should keep
+    files which are still in use must update their modification time when they are read. Files that cannot be removed
+    are ignored."""
+
+    deadline = time.time() - max_age
+    try:
+        files = list(directory.iterdir())
+    except OSError:
+        return
+    for file in files:
+        try:
+            if file.is_file() and file.stat().st_mtime < deadline:
+                file.unlink()
+        except OSError as exc:
+            logger.debug("Could not prune cache file <val>%s</val>: %s", file, exc)
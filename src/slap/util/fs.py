@@ -43,7 +43,8 @@ def atomic_write(
         else:
             rename_mode = "posix"
 
-    with tempfile.NamedTemporaryFile(mode, delete=False) as fp:
+    # NOTE: The temporary file is created in the same directory such that it can be renamed into place.
+    with tempfile.NamedTemporaryFile(mode, delete=False, dir=os.path.dirname(os.path.abspath(path))) as fp:
         try:
             yield fp
         except:  # noqa: E722
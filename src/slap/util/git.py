@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import subprocess as sp
+import threading
 import typing as t
 from pathlib import Path
 
@@ -42,6 +43,8 @@ class Git:
 
     def __init__(self, path: Path | str | None = None):
         self.path = Path(path) if path else Path.cwd()
+        self._lock = threading.Lock()
+        self._cat_file_sessions: dict[str, CatFileSession] = {}
 
     def check_call(self, command: list[str], stdout: t.Optional[int] = None) -> None:
         sp.check_call(command, cwd=self.path, stdout=stdout)
@@ -399,14 +402,140 @@ class Git:
 
     def get_file_contents(self, file: str, revision: str) -> bytes:
         """Returns the contents of a file at the given revision. Raises a #FileNotFoundError if the file did not
-        exist at the revision."""
+        exist at the revision, or a #GitError if the revision does not exist."""
 
-        file = os.path.relpath(file, str(self.path))
+        contents = self.get_files_contents([(file, revision)])[0]
+        if contents is None:
+            raise FileNotFoundError(os.path.relpath(file, str(self.path)))
+        return contents
 
+    def get_files_contents(self, files: t.Sequence[tuple[str, str]]) -> list[bytes | None]:
+        """Returns the contents of many files at once. Each item in *files* is a tuple of the file and the revision
+        to read it from. The contents are read through the #CatFileSession of this object. The result contains
+        `None` for each file that did not exist at its revision. Raises a #GitError if a revision does not exist."""
+
+        if not files:
+            return []
+
+        session = self.cat_file("--batch")
+        results = [session.read(f"{revision}:{os.path.relpath(file, str(self.path))}") for file, revision in files]
+
+        missing_revisions = {revision for (_, revision), result in zip(files, results, strict=True) if result is None}
+        for revision in sorted(missing_revisions):
+            if self.get_object_info(revision) is None:
+                raise GitError(f"revision does not exist: {revision!r}")
+        return [result[1] if result is not None else None for result in results]
+
+    def get_files_at_revision(self, revision: str, paths: t.Sequence[str]) -> list[str]:
+        """Returns the files in the given *paths* at the *revision*, recursively. Raises a #GitError if the revision
+        does not exist."""
+
+        if not paths:
+            return []
+
+        command = ["git", "ls-tree", "-r", "-z", "--name-only", revision, "--"]
+        command += [os.path.relpath(path, str(self.path)) for path in paths]
         try:
-            return self.check_output(["git", "show", f"{revision}:{file}"], stderr=sp.PIPE)
+            output = self.check_output(command, stderr=sp.PIPE)
         except sp.CalledProcessError as exc:
-            stderr = exc.stderr.decode()
-            if "does not exist" in stderr or "exists on disk, but not in" in stderr:
-                raise FileNotFoundError(file)
-            raise
+            raise GitError(f"could not list files in revision {revision!r}: {exc.stderr.decode().strip()}") from exc
+        return [str(self.path / name) for name in output.decode().split("\0") if name]
+
+    def get_object_info(self, obj: str) -> tuple[str, str, int] | None:
+        """Returns the ID, type and size of the Git object *obj*, or `None` if it does not exist."""
+
+        result = self.cat_file("--batch-check").read(obj)
+        return result[0] if result is not None else None
+
+    def cat_file(self, mode: t.Literal["--batch", "--batch-check"]) -> CatFileSession:
+        """Returns the #CatFileSession for the given `git cat-file` *mode* that is owned by this object. It is
+        started when it is first needed and restarted if it terminated."""
+
+        with self._lock:
+            session = self._cat_file_sessions.get(mode)
+            if session is None or not session.is_alive():
+                session = self._cat_file_sessions[mode] = CatFileSession(self.path, mode)
+            return session
+
+    def close(self) -> None:
+        """Terminates the `git cat-file` processes that are owned by this object."""
+
+        with self._lock:
+            for session in self._cat_file_sessions.values():
+                session.close()
+            self._cat_file_sessions.clear()
+
+
+class CatFileSession:
+    """A long-running `git cat-file --batch` or `--batch-check` process to read Git objects without starting a new
+    process for every object. Requests are sent to the process one at a time, so a session can be shared between
+    threads. The process terminates when its stdin is closed, which happens at the latest when the program exits."""
+
+    def __init__(self, path: Path, mode: t.Literal["--batch", "--batch-check"]) -> None:
+        import atexit
+
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._process = sp.Popen(["git", "cat-file", mode], cwd=path, stdin=sp.PIPE, stdout=sp.PIPE)
+        atexit.register(self.close)
+
+    def read(self, obj: str) -> tuple[tuple[str, str, int], bytes | None] | None:
+        """Reads the Git object *obj* (e.g. `HEAD:README.md`). Returns `None` if the object does not exist, otherwise
+        a tuple of the object ID, type and size and its contents. The contents are `None` in `--batch-check` mode.
+
+        Raises:
+          GitError: If the `git cat-file` process terminated unexpectedly.
+        """
+
+        if "\n" in obj:
+            raise ValueError(f"invalid object name: {obj!r}")
+
+        with self._lock:
+            try:
+                return self._read(obj)
+            except (OSError, EOFError) as exc:
+                raise GitError(f"git cat-file {self.mode} terminated unexpectedly in {self.path}") from exc
+
+    def _read(self, obj: str) -> tuple[tuple[str, str, int], bytes | None] | None:
+        """Implements #read() without locking. Raises #EOFError if the process closed its output before the response
+        was complete."""
+
+        stdin, stdout = self._process.stdin, self._process.stdout
+        assert stdin is not None
+        assert stdout is not None
+        stdin.write(obj.encode() + b"\n")
+        stdin.flush()
+        header = stdout.readline().decode()
+        if not header.endswith("\n"):
+            raise EOFError
+
+        # The header is "<oid> <type> <size>", or "<object> missing" (or ambiguous).
+        parts = header[:-1].split(" ")
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+        oid, type_, size = parts
+        contents = None
+        if self.mode == "--batch":
+            contents = stdout.read(int(size) + 1)[:-1]
+            if len(contents) != int(size):
+                raise EOFError
+        return (oid, type_, int(size)), contents
+
+    def is_alive(self) -> bool:
+        return self._process.poll() is None
+
+    def close(self) -> None:
+        """Terminates the `git cat-file` process."""
+
+        if self._process.poll() is not None:
+            return
+        assert self._process.stdin is not None
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, sp.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        assert self._process.stdout is not None
+        self._process.stdout.close()
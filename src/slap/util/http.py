@@ -0,0 +1,59 @@
+"""Helpers for HTTP requests made by Slap."""
+
+from __future__ import annotations
+
+import functools
+import typing as t
+
+if t.TYPE_CHECKING:
+    import requests
+
+#: The number of times that a request is retried on connection errors or on one of the #RETRY_STATUS_CODES.
+RETRY_TOTAL = 3
+
+#: The backoff factor between retries. The n-th retry waits `RETRY_BACKOFF_FACTOR * 2 ** (n - 1)` seconds, unless
+#: the server sends a `Retry-After` header.
+RETRY_BACKOFF_FACTOR = 0.5
+
+#: The HTTP status codes on which requests are retried.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def create_session(retry_connect: bool = True) -> requests.Session:
+    """Creates a #requests.Session that retries idempotent requests with an exponential backoff, honoring the
+    `Retry-After` header of the server. Non-idempotent requests (such as `POST`) are not retried on an error status
+    code, as they may already have taken effect. Requests that time out while reading the response are not retried.
+
+    Args:
+      retry_connect: Whether to retry requests that fail to connect to the server, including when connecting times
+        out. Disable this for requests that the caller can do without, so that the timeout of a request bounds the
+        time that the caller waits for an unreachable server.
+    """
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=None if retry_connect else 0,
+        read=False,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@functools.lru_cache
+def get_session(retry_connect: bool = True) -> requests.Session:
+    """Returns the #requests.Session created by #create_session() that is shared in the current process, so that
+    connections to the same host are pooled and kept alive between requests. Do not modify the session's headers or
+    authentication; pass them with each request instead."""
+
+    return create_session(retry_connect)
@@ -77,6 +77,30 @@ class Vcs(abc.ABC):
     def get_file_contents(self, file: Path, revision: str) -> bytes | None:
         """Return the contents of the file in a given revision. Return `None` if the file does not exist."""
 
+    def get_files_contents(self, files: t.Sequence[tuple[Path, str]]) -> list[bytes | None]:
+        """Return the contents of many files, given as tuples of the file and the revision to read it from. Return
+        `None` for each file that does not exist. Implementations should fetch all contents at once if the VCS
+        supports it."""
+
+        import itertools
+
+        return list(itertools.starmap(self.get_file_contents, files))
+
+    def get_files_at_revision(self, revision: str, directories: t.Sequence[Path]) -> list[Path]:
+        """Return the files in the *directories* at the given revision, recursively.
+
+        The default implementation can only find files that are also known to the VCS in the working tree (see
+        #get_all_files()), and checks with #get_files_contents() which of them exist at the revision. Implementations
+        should list the files at the revision directly if the VCS supports it."""
+
+        candidates = [
+            file
+            for file in self.get_all_files()
+            if any(directory == file or directory in file.parents for directory in directories)
+        ]
+        contents = self.get_files_contents([(file, revision) for file in candidates])
+        return [file for file, data in zip(candidates, contents, strict=True) if data is not None]
+
     @abc.abstractmethod
     def commit_files(
         self,
@@ -163,6 +187,12 @@ class Git(Vcs):
         except FileNotFoundError:
             return None
 
+    def get_files_contents(self, files: t.Sequence[tuple[Path, str]]) -> list[bytes | None]:
+        return self._git.get_files_contents([(str(file), revision) for file, revision in files])
+
+    def get_files_at_revision(self, revision: str, directories: t.Sequence[Path]) -> list[Path]:
+        return [Path(file) for file in self._git.get_files_at_revision(revision, [str(d) for d in directories])]
+
     def commit_files(
         self,
         files: t.Sequence[Path],
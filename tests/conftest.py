@@ -0,0 +1,25 @@
+import typing as t
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def slap_cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Points Slap's user cache directory to a temporary directory, so that tests do not read from or write to the
+    cache of the developer."""
+
+    cache_dir = tmp_path_factory.mktemp("slap-cache")
+    monkeypatch.setenv("SLAP_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture
+def set_command_options(monkeypatch: pytest.MonkeyPatch) -> t.Callable[[t.Any, dict[str, t.Any]], None]:
+    """Returns a function that makes a command or command plugin return the values from a dictionary for its options
+    instead of reading them from the command-line input."""
+
+    def _set_command_options(command: t.Any, options: dict[str, t.Any]) -> None:
+        monkeypatch.setattr(command, "option", options.get, raising=False)
+
+    return _set_command_options
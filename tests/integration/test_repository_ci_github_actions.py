@@ -1,13 +1,15 @@
+import hashlib
 import json
 import os
 import re
 from dataclasses import dataclass
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from threading import Thread
 from typing import Any, Iterator
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
 from git.repo import Repo
 from git.util import Actor
@@ -18,6 +20,7 @@ from slap.ext.repository_ci.github_actions import (
     PullRequestFromForkedRepositoryNotSupported,
     SimpleGithubClient,
 )
+from slap.util.http import get_session
 
 
 @dataclass
@@ -31,15 +34,22 @@ class MockPullRequestData:
 
 class MockGitHubApiServer:
     """
-    A simple mock for the GitHub API.
+    A simple mock for the GitHub API. It supports conditional requests with ETags, paginates comments and can be
+    told to fail requests to test retries.
     """
 
     class Handler(BaseHTTPRequestHandler):
-        def __init__(self, *args, pulls: list[MockPullRequestData], **kwargs):
-            self._pulls = pulls
+        protocol_version = "HTTP/1.1"
+
+        def __init__(self, *args, api: "MockGitHubApiServer", **kwargs):
+            self._api = api
             super().__init__(*args, **kwargs)
 
         def do_GET(self):
+            self._api.requests.append(("GET", self.path, self.client_address[1]))
+            if self._api.failures:
+                self._send_json(self._api.failures.pop(0), {"message": "failure"}, {"Retry-After": "0"})
+                return
             match = re.match(r"/repos/(.+)/pulls/([^/]+)", self.path)
             if match:
                 self._handle_pull_request(match.group(1), match.group(2))
@@ -53,6 +63,7 @@ class MockGitHubApiServer:
             self.send_error(404)
 
         def do_POST(self):
+            self._api.requests.append(("POST", self.path, self.client_address[1]))
             match = re.match(r"/repos/(.+)/issues/([^/]+)/comments", self.path)
             if match:
                 self._handle_comment_post(match.group(1), match.group(2))
@@ -60,57 +71,80 @@ class MockGitHubApiServer:
 
             self.send_error(404)
 
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send_json(self, status: int, data: Any, headers: dict[str, str] | None = None) -> None:
+            body = json.dumps(data).encode("utf-8")
+            etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+                self._api.not_modified += 1
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
         def _handle_pull_request(self, repository: str, pr_id: str) -> None:
-            for pull in self._pulls:
+            for pull in self._api.pulls:
                 if repository == pull.repository and pr_id == pull.id:
                     break
             else:
                 self.send_error(404)
                 return
 
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(
-                json.dumps(
-                    {
-                        "html_url": pull.html_url,
-                        "head": {
-                            "repo": {
-                                "full_name": pull.head_repository,
-                                "html_url": pull.head_html_url,
-                            }
-                        },
-                    }
-                ).encode("utf-8")
+            self._send_json(
+                200,
+                {
+                    "html_url": pull.html_url,
+                    "head": {
+                        "repo": {
+                            "full_name": pull.head_repository,
+                            "html_url": pull.head_html_url,
+                        }
+                    },
+                },
             )
 
         def _handle_comments_get(self, repository: str, pr_id: str) -> None:
-            self.send_response(200)
-            self.end_headers()
-            self.wfile.write(b"[]")
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            comments = self._api.comments[(page - 1) * per_page : page * per_page]
+            headers = {}
+            if page * per_page < len(self._api.comments):
+                headers["Link"] = f'<{self._api.addr}{url.path}?per_page={per_page}&page={page + 1}>; rel="next"'
+            self._send_json(200, comments, headers)
 
         def _handle_comment_post(self, repository: str, pr_id: str) -> None:
-            self.send_response(201)
-            self.end_headers()
-            self.wfile.write(b'{"id": "foobar", "body": "foobar"}')
+            self._send_json(201, {"id": "foobar", "body": "foobar"})
 
     def __init__(self) -> None:
-        self._pulls: list[MockPullRequestData] = []
-        self._server = HTTPServer(("localhost", 0), self.handler)
+        self.pulls: list[MockPullRequestData] = []
+        self.comments: list[dict[str, str]] = []
+        self.failures: list[int] = []
+        self.requests: list[tuple[str, str, int]] = []
+        self.not_modified = 0
+        self._server = ThreadingHTTPServer(("localhost", 0), self.handler)
         self._thread = Thread(target=self._server.serve_forever)
 
     def add_pull_request(self, pull: MockPullRequestData) -> None:
-        self._pulls.append(pull)
+        self.pulls.append(pull)
 
     def handler(self, *args: Any, **kwargs: Any) -> Handler:
-        return self.Handler(*args, pulls=self._pulls, **kwargs)
+        return self.Handler(*args, api=self, **kwargs)
 
     def start(self) -> None:
         self._thread.start()
 
     def stop(self) -> None:
         self._server.shutdown()
+        self._server.server_close()
         self._thread.join()
 
     @property
@@ -125,6 +159,8 @@ def mock_api() -> Iterator[MockGitHubApiServer]:
     try:
         yield api
     finally:
+        # Drop the connections to the server that are kept alive in the shared session.
+        get_session().close()
         api.stop()
 
 
@@ -159,6 +195,60 @@ def test__SimpleGithubClient__get_pull_request(mock_api: MockGitHubApiServer) ->
     )
 
 
+def test__SimpleGithubClient__get_pull_request__uses_etag(mock_api: MockGitHubApiServer) -> None:
+    mock_api.add_pull_request(
+        MockPullRequestData(
+            repository="octodad/octo-repo",
+            id="123",
+            html_url="https://github.com/octodad/octo-repo/pull/123",
+            head_repository="octodad/octo-repo",
+            head_html_url="https://github.com/octodad/octo-repo/pull/123",
+        )
+    )
+
+    client = SimpleGithubClient(github_api_url=mock_api.addr, token="")
+    first = client.get_pull_request(repository="octodad/octo-repo", pull_request_id="123")
+    assert client.get_pull_request(repository="octodad/octo-repo", pull_request_id="123") == first
+
+    # The second request was answered with 304 Not Modified, and both were sent over the same connection.
+    assert len(mock_api.requests) == 2
+    assert mock_api.not_modified == 1
+    assert len({port for _, _, port in mock_api.requests}) == 1
+
+    # Responses are cached on disk, so a new client (e.g. of a later invocation) sends conditional requests as well.
+    client = SimpleGithubClient(github_api_url=mock_api.addr, token="")
+    assert client.get_pull_request(repository="octodad/octo-repo", pull_request_id="123") == first
+    assert mock_api.not_modified == 2
+
+    mock_api.pulls[0].html_url = "https://github.com/octodad/octo-repo/pull/124"
+    assert client.get_pull_request(repository="octodad/octo-repo", pull_request_id="123").html_url.endswith("/124")
+
+
+def test__SimpleGithubClient__get_pr_comments__follows_pagination(mock_api: MockGitHubApiServer) -> None:
+    mock_api.comments = [{"id": str(idx), "body": f"comment {idx}"} for idx in range(250)]
+
+    client = SimpleGithubClient(github_api_url=mock_api.addr, token="")
+    comments = client.get_pr_comments(repository="octodad/octo-repo", pull_request_id="123")
+    assert [comment.id for comment in comments] == [str(idx) for idx in range(250)]
+    assert len(mock_api.requests) == 3
+
+    # Unmodified pages are served from the response cache.
+    assert client.get_pr_comments(repository="octodad/octo-repo", pull_request_id="123") == comments
+    assert len(mock_api.requests) == 6
+    assert mock_api.not_modified == 3
+
+
+def test__SimpleGithubClient__retries_failed_requests(mock_api: MockGitHubApiServer) -> None:
+    mock_api.comments = [{"id": "1", "body": "comment"}]
+    mock_api.failures = [503, 429]
+
+    client = SimpleGithubClient(github_api_url=mock_api.addr, token="")
+    assert client.get_pr_comments(repository="octodad/octo-repo", pull_request_id="123") == [
+        SimpleGithubClient.Comment(id="1", body="comment")
+    ]
+    assert len(mock_api.requests) == 3
+
+
 @mark.parametrize("event_name", ["pull_request", "pull_request_target"])
 def test__GithubActionsRepositoryCIPlugin__forked_pr_push_changes(
     mock_api: MockGitHubApiServer, tempdir: Path, event_name: str
@@ -247,3 +337,93 @@ def test__GithubActionsRepositoryCIPlugin__forked_pr_push_changes(
         # Expect that the forked_repo has been updated.
         forked_git.git.checkout(forked_git_active_branch)
         assert forked_readme.read_text() == expect_readme_content
+
+
+@fixture
+def pull_request_remote(tempdir: Path) -> Path:
+    """
+    Creates a bare repository that stands in for the GitHub remote. The `feature` branch forks off `main` after ten
+    commits and has three commits of its own, while `main` has four more commits since then.
+    """
+
+    upstream = Repo.init(tempdir / "upstream", initial_branch="main")
+    author = Actor("Jane Doe", "jane@doe.com")
+
+    def commit(name: str) -> None:
+        (tempdir / "upstream" / f"{name}.txt").write_text(f"{name}\n")
+        upstream.index.add([f"{name}.txt"])
+        upstream.index.commit(name, author=author, committer=author)
+
+    for idx in range(10):
+        commit(f"main-{idx}")
+    upstream.git.checkout("-b", "feature")
+    for idx in range(3):
+        commit(f"feature-{idx}")
+    upstream.git.checkout("main")
+    for idx in range(10, 14):
+        commit(f"main-{idx}")
+
+    remote = tempdir / "remote.git"
+    Repo.clone_from(str(tempdir / "upstream"), remote, bare=True)
+    Repo(remote).git.config("uploadpack.allowFilter", "true")
+    return remote
+
+
+@mark.parametrize(
+    ("fetch_environ", "expect_base_commits", "expect_merge_base"),
+    [
+        ({}, 14, True),
+        ({"GIT_FETCH_DEPTH": "1"}, 1, False),
+        ({"GIT_FETCH_DEPTH": "1", "GIT_FETCH_FILTER": "blob:none"}, 1, False),
+        ({"GIT_FETCH_DEPTH": "1", "GIT_FETCH_MERGE_BASE": "true"}, 8, True),
+    ],
+)
+def test__GithubActionsRepositoryCIPlugin__fetch_options(
+    mock_api: MockGitHubApiServer,
+    tempdir: Path,
+    pull_request_remote: Path,
+    fetch_environ: dict[str, str],
+    expect_base_commits: int,
+    expect_merge_base: bool,
+) -> None:
+    mock_api.add_pull_request(
+        MockPullRequestData(
+            repository="main-repo",
+            id="123",
+            html_url="https://github.com/main-repo/pull/123",
+            head_repository="main-repo",
+            head_html_url=str(pull_request_remote),
+        )
+    )
+    work = Repo.init(tempdir / "work", initial_branch="main")
+    work.create_remote("origin", str(pull_request_remote))
+
+    environ = {
+        "GITHUB_API_URL": mock_api.addr,
+        "GITHUB_REPOSITORY": "main-repo",
+        "GITHUB_HEAD_REF": "feature",
+        "GITHUB_BASE_REF": "main",
+        "GITHUB_TOKEN": "foo",
+        "GITHUB_EVENT_NAME": "pull_request",
+        "GITHUB_REF": "refs/pull/123/merge",
+        **fetch_environ,
+    }
+    with patch.dict("os.environ", environ):
+        os.chdir(tempdir / "work")
+        plugin = GithubActionsRepositoryCIPlugin()
+        plugin.initialize()
+
+    assert plugin.get_base_ref() == "origin/main"
+    assert work.active_branch.name == "slap-changelog-update-pr-123-head"
+    assert (tempdir / "work" / "feature-2.txt").read_text() == "feature-2\n"
+    assert int(work.git.rev_list("--count", "origin/main")) == expect_base_commits
+
+    merge_base = plugin._get_merge_base()
+    if expect_merge_base:
+        assert merge_base == Repo(pull_request_remote).git.merge_base("main", "feature")
+    else:
+        assert merge_base is None
+
+    # With a partial clone filter, the files that are only in the base ref have not been downloaded.
+    missing = work.git.rev_list("--objects", "--missing=print", "origin/main").splitlines()
+    assert any(line.startswith("?") for line in missing) == ("GIT_FETCH_FILTER" in fetch_environ)
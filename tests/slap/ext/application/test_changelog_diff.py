@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from slap.changelog import Changelog, ChangelogEntry, ChangelogManager
+from slap.ext.application.changelog import ChangelogDiffBaseCommand
+from slap.util.git import Git
+from slap.util.vcs import Git as Vcs
+
+
+def test__ChangelogDiffBaseCommand__diff_changelogs_is_stable() -> None:
+    def entry(id: str, description: str = "Fix") -> ChangelogEntry:
+        return ChangelogEntry(id, "fix", description, "@me")
+
+    old = Changelog([entry("e"), entry("a"), entry("d"), entry("c"), entry("b")])
+    new = Changelog([entry("g"), entry("d", "Changed"), entry("f"), entry("a"), entry("c", "Changed")])
+
+    diff = ChangelogDiffBaseCommand._diff_changelogs(old, new)
+    assert [e.id for e in diff.added_entries] == ["g", "f"]
+    assert [e.id for e in diff.removed_entries] == ["e", "b"]
+    assert [(o.description, n.id, n.description) for o, n in diff.updated_entries] == [
+        ("Fix", "d", "Changed"),
+        ("Fix", "c", "Changed"),
+    ]
+    assert [e.id for e in diff.unchanged_entries] == ["a"]
+
+    diff = ChangelogDiffBaseCommand._diff_changelogs(None, new)
+    assert [e.id for e in diff.added_entries] == ["g", "d", "f", "a", "c"]
+    assert ChangelogDiffBaseCommand._diff_changelogs(old, None).removed_entries == old.entries
+
+
+def test__ChangelogDiffBaseCommand__get_diffs_includes_entry_files(tmp_path: Path) -> None:
+    git = Git(tmp_path)
+    git.check_call(["git", "init", "-q", "."])
+    git.check_call(["git", "config", "user.name", "Test"])
+    git.check_call(["git", "config", "user.email", "test@example.org"])
+
+    def entry(id: str, description: str = "Fix") -> ChangelogEntry:
+        return ChangelogEntry(id, "fix", description, "@me")
+
+    managers = [ChangelogManager(tmp_path / name / ".changelog", None) for name in ("a", "b", "c")]
+    managers[0].unreleased().save(Changelog([entry("a1"), entry("a2")]))
+    managers[1].entry_files = True
+    managers[1].unreleased().save(Changelog([entry("b1")]))
+    git.add(["."])
+    git.commit("base")
+
+    managers[0].unreleased().add_entry(entry("a3"))
+    managers[1].unreleased().add_entry(entry("b2"))
+    managers[1].unreleased().add_entry(entry("b0"))
+    managers[2].entry_files = True
+    managers[2].unreleased().add_entry(entry("c1"))
+    git.add(["."])
+    git.commit("head")
+    managers[0].unreleased().add_entry(entry("a4"))
+
+    command = object.__new__(ChangelogDiffBaseCommand)
+    command.vcs = Vcs(tmp_path)
+    command.base_ref, command.head_ref = "HEAD~1", "HEAD"
+    diffs = command.get_diffs(managers)
+    assert [[e.id for e in diff.added_entries] for diff in diffs] == [["a3"], ["b2", "b0"], ["c1"]]
+    assert [[e.id for e in diff.unchanged_entries] for diff in diffs] == [["a1", "a2"], ["b1"], []]
+
+    command.head_ref = None
+    diffs = command.get_diffs(managers)
+    assert [[e.id for e in diff.added_entries] for diff in diffs] == [["a3", "a4"], ["b2", "b0"], ["c1"]]
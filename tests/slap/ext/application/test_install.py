@@ -0,0 +1,177 @@
+import sys
+import typing as t
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from slap.ext.application.install import InstallCommandPlugin, InstallConfig
+from slap.install.installer import Indexes, InstallOptions, PipInstaller
+from slap.python.dependency import Dependency, PathDependency, PypiDependency, VersionSpec
+from slap.python.environment import PythonEnvironment
+
+
+class FakeProject:
+    def __init__(self, directory: Path, name: str, dependencies: list[Dependency]) -> None:
+        self.directory = directory
+        self.name = name
+        self.run = dependencies
+        self.calls = 0
+
+    def dist_name(self) -> str:
+        return self.name
+
+    def dependencies(self) -> SimpleNamespace:
+        self.calls += 1
+        return SimpleNamespace(run=self.run)
+
+
+def make_plugin(tmp_path: Path, graph: dict[str, list[str]]) -> tuple[InstallCommandPlugin, dict[str, FakeProject]]:
+    """Creates an install command for a repository with a project for every key in *graph*. Each project depends
+    on the projects listed in *graph* and on `requests`."""
+
+    projects = {}
+    for name, dependencies in graph.items():
+        (tmp_path / name).mkdir()
+        projects[name] = FakeProject(
+            tmp_path / name,
+            name,
+            [PypiDependency(dep, VersionSpec("*")) for dep in [*dependencies, "requests"]],
+        )
+
+    calls: list[str] = []
+
+    def get_projects() -> list[FakeProject]:
+        calls.append("projects")
+        return list(projects.values())
+
+    repository = SimpleNamespace(
+        projects=get_projects,
+        get_project_by_directory=lambda directory: next(p for p in projects.values() if p.directory == directory),
+        calls=calls,
+    )
+    return InstallCommandPlugin(t.cast(t.Any, SimpleNamespace(repository=repository))), projects
+
+
+def get_pip_arguments(plugin: InstallCommandPlugin, root: FakeProject) -> tuple[list[str], list[Path]]:
+    installer = PipInstaller(symlink_helper=plugin)
+    options = InstallOptions(indexes=Indexes(), quiet=True, upgrade=False)
+    return installer._get_pip_arguments(
+        [PathDependency(root.name, root.directory, link=True)], PythonEnvironment.of(sys.executable), options
+    )
+
+
+def test__InstallCommandPlugin__get_dependencies_for_project__is_memoized(tmp_path: Path) -> None:
+    plugin, projects = make_plugin(tmp_path, {"a": ["b"], "b": []})
+
+    dependencies = plugin.get_dependencies_for_project(tmp_path / "a")
+    assert dependencies == [
+        PathDependency("b", (tmp_path / "b").resolve(), link=True),
+        PypiDependency("requests", VersionSpec("*")),
+    ]
+    assert plugin.get_dependencies_for_project(tmp_path / "a" / ".." / "a") is dependencies
+    plugin.get_dependencies_for_project(tmp_path / "b")
+    assert projects["a"].calls == 1
+    assert t.cast(t.Any, plugin.app).repository.calls == ["projects"]
+
+
+def test__PipInstaller__expands_every_linked_project_once(tmp_path: Path) -> None:
+    # Every project depends on the next two, so there are exponentially many paths through the graph.
+    names = [f"p{idx}" for idx in range(20)]
+    plugin, projects = make_plugin(tmp_path, {name: names[idx + 1 : idx + 3] for idx, name in enumerate(names)})
+
+    pip_arguments, link_projects = get_pip_arguments(plugin, projects["p0"])
+    assert sorted(link_projects) == sorted(project.directory for project in projects.values())
+    assert pip_arguments.count("requests") == len(names)
+    assert all(project.calls == 1 for project in projects.values())
+
+
+def test__PipInstaller__stops_at_cyclic_linked_projects(tmp_path: Path) -> None:
+    plugin, projects = make_plugin(tmp_path, {"a": ["b"], "b": ["c"], "c": ["a"]})
+
+    pip_arguments, link_projects = get_pip_arguments(plugin, projects["a"])
+    assert sorted(link_projects) == [tmp_path / "a", tmp_path / "b", tmp_path / "c"]
+    assert pip_arguments.count("requests") == 3
+
+
+class FakeUvProject(FakeProject):
+    def __init__(self, directory: Path, pyproject_toml: dict[str, t.Any]) -> None:
+        super().__init__(directory, "a", [])
+        self.id = self.name
+        self.pyproject_toml = pyproject_toml
+
+
+def make_uv_plugin(
+    tmp_path: Path,
+    pyproject: dict[str, t.Any],
+    set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None],
+    options: dict[str, t.Any] | None = None,
+    dev_extras: list[str] | None = None,
+) -> tuple[InstallCommandPlugin, FakeUvProject]:
+    """Creates an install command for a uv-managed repository with a single project configured by *pyproject*."""
+
+    (tmp_path / "uv.lock").touch()
+    project = FakeUvProject(tmp_path, pyproject)
+    repository = SimpleNamespace(directory=tmp_path, is_monorepo=False, projects=lambda: [project])
+    plugin = InstallCommandPlugin(t.cast(t.Any, SimpleNamespace(repository=repository)))
+    plugin.config = {t.cast(t.Any, project): InstallConfig(dev_extras=dev_extras)}
+    set_command_options(plugin, options or {})
+    return plugin, project
+
+
+VENV = t.cast(PythonEnvironment, SimpleNamespace(is_venv=lambda: True, executable="/venv/bin/python"))
+
+
+@pytest.mark.parametrize(
+    ("install_extras", "dev_extras", "options", "extras", "groups"),
+    [
+        ({"dev"}, None, {}, set(), set()),
+        ({"docs"}, None, {}, {"docs"}, set()),
+        ({"lint"}, None, {}, set(), {"lint"}),
+        (set(), ["docs", "lint"], {}, {"docs"}, {"lint"}),
+        (set(), ["docs", "lint"], {"no-dev": True}, set(), set()),
+    ],
+)
+def test__InstallCommandPlugin__get_uv_sync_installer__maps_extras(
+    tmp_path: Path,
+    install_extras: set[str],
+    dev_extras: list[str] | None,
+    options: dict[str, t.Any],
+    extras: set[str],
+    groups: set[str],
+    set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None],
+) -> None:
+    pyproject = {"project": {"optional-dependencies": {"docs": ["mkdocs"]}}, "dependency-groups": {"lint": ["ruff"]}}
+    plugin, project = make_uv_plugin(tmp_path, pyproject, set_command_options, options, dev_extras)
+
+    result = plugin._get_uv_sync_installer([t.cast(t.Any, project)], install_extras, VENV)
+    assert result is not None
+    installer, sync_options = result
+    assert installer.directory == tmp_path
+    assert sync_options.extras == extras
+    assert sync_options.groups == groups
+    assert sync_options.no_dev == bool(options.get("no-dev"))
+
+
+def test__InstallCommandPlugin__get_uv_sync_installer__falls_back_on_unknown_extra(
+    tmp_path: Path, set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None]
+) -> None:
+    plugin, project = make_uv_plugin(tmp_path, {}, set_command_options)
+    assert plugin._get_uv_sync_installer([t.cast(t.Any, project)], {"unknown"}, VENV) is None
+
+
+@pytest.mark.parametrize("option", ["no-sync", "upgrade", "only-extras", "locked"])
+def test__InstallCommandPlugin__get_uv_sync_installer__falls_back_on_option(
+    tmp_path: Path, option: str, set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None]
+) -> None:
+    plugin, project = make_uv_plugin(tmp_path, {}, set_command_options, {option: True})
+    assert plugin._get_uv_sync_installer([t.cast(t.Any, project)], set(), VENV) is None
+
+
+def test__InstallCommandPlugin__get_uv_sync_installer__falls_back_outside_of_venv(
+    tmp_path: Path, set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None]
+) -> None:
+    plugin, project = make_uv_plugin(tmp_path, {}, set_command_options)
+    target = t.cast(PythonEnvironment, SimpleNamespace(is_venv=lambda: False, executable="/usr/bin/python"))
+    assert plugin._get_uv_sync_installer([t.cast(t.Any, project)], set(), target) is None
+    assert plugin._get_uv_sync_installer([t.cast(t.Any, project)], set(), VENV) is not None
@@ -0,0 +1,238 @@
+import copy
+import subprocess as sp
+import sys
+import typing as t
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import tomli
+from flit_core.config import prep_toml_config  # type: ignore[import]
+
+from slap.ext.application.link import (
+    LinkManifest,
+    _install_requirements,
+    _Link,
+    _setup_flit_config,
+    link_repository,
+)
+
+PYPROJECT_TOML = """
+[tool.poetry]
+name = "my-package"
+version = "1.2.3"
+description = "My package"
+
+[tool.poetry.scripts]
+my-package = "my_package.__main__:main"
+
+[tool.poetry.plugins."slap.plugins.application"]
+my-plugin = "my_package.plugin:MyPlugin"
+"""
+
+
+def make_link(directory: Path, config: dict | None = None) -> _Link:
+    directory.mkdir(parents=True, exist_ok=True)
+    return _Link("my-package", "my_package", directory / "pyproject.toml", config or {"project": {"name": "a"}})
+
+
+def test__setup_flit_config__does_not_modify_pyproject(tmp_path: Path) -> None:
+    (tmp_path / "src" / "my_package").mkdir(parents=True)
+    (tmp_path / "src" / "my_package" / "__init__.py").write_text("")
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT_TOML)
+    original = tomli.loads(PYPROJECT_TOML)
+
+    config = copy.deepcopy(original)
+    _setup_flit_config("my_package", "my-package", config)
+    assert config["project"] == {
+        "name": "my-package",
+        "version": "1.2.3",
+        "description": "",
+        "scripts": {"my-package": "my_package.__main__:main"},
+        "entry-points": {"slap.plugins.application": {"my-plugin": "my_package.plugin:MyPlugin"}},
+    }
+    assert config["tool"]["flit"] == {"module": {"name": "my_package"}}
+    assert tomli.loads(PYPROJECT_TOML) == original
+    assert (tmp_path / "pyproject.toml").read_text() == PYPROJECT_TOML
+
+    loaded = prep_toml_config(config, tmp_path / "pyproject.toml")
+    assert loaded.module == "my_package"
+    assert loaded.metadata["name"] == "my-package"
+    assert loaded.metadata["version"] == "1.2.3"
+
+
+def test__LinkManifest__is_up_to_date(tmp_path: Path) -> None:
+    link = make_link(tmp_path / "project")
+    (tmp_path / "project" / "my_package").mkdir()
+    installed_file = tmp_path / "site-packages" / "my_package"
+    installed_file.parent.mkdir()
+    installed_file.symlink_to(tmp_path / "project" / "my_package")
+
+    manifest = LinkManifest.load(tmp_path / LinkManifest.FILENAME)
+    assert not manifest.is_up_to_date(link, sys.executable)
+    manifest.record(link, sys.executable, [installed_file])
+    manifest.save()
+
+    manifest = LinkManifest.load(tmp_path / LinkManifest.FILENAME)
+    assert manifest.is_up_to_date(link, sys.executable)
+    assert not manifest.is_up_to_date(link, "/usr/bin/python")
+    assert not manifest.is_up_to_date(make_link(tmp_path / "project", {"project": {"name": "b"}}), sys.executable)
+    assert not manifest.is_up_to_date(make_link(tmp_path / "moved"), sys.executable)
+
+
+def test__LinkManifest__is_up_to_date__with_dangling_symlink(tmp_path: Path) -> None:
+    link = make_link(tmp_path / "project")
+    (tmp_path / "project" / "my_package").mkdir()
+    installed_file = tmp_path / "my_package"
+    installed_file.symlink_to(tmp_path / "project" / "my_package")
+
+    manifest = LinkManifest(tmp_path / LinkManifest.FILENAME, {})
+    manifest.record(link, sys.executable, [installed_file])
+    assert manifest.is_up_to_date(link, sys.executable)
+
+    (tmp_path / "project" / "my_package").rmdir()
+    assert installed_file.is_symlink()
+    assert not manifest.is_up_to_date(link, sys.executable)
+
+
+def test__LinkManifest__load__ignores_invalid_file(tmp_path: Path) -> None:
+    (tmp_path / LinkManifest.FILENAME).write_text("{")
+    assert LinkManifest.load(tmp_path / LinkManifest.FILENAME).entries == {}
+    (tmp_path / "directory" / LinkManifest.FILENAME).mkdir(parents=True)
+    assert LinkManifest.load(tmp_path / "directory" / LinkManifest.FILENAME).entries == {}
+
+
+class FakeInstaller:
+    def __init__(self, python: str, import_error: bool = False) -> None:
+        self.python = python
+        self.deps = "all"
+        self.import_error = import_error
+        self.calls: list[tuple[str, str]] = []
+
+    def install_requirements(self) -> None:
+        self.calls.append(("install_requirements", self.deps))
+
+    def install_reqs_my_python_if_needed(self) -> None:
+        self.calls.append(("install_reqs_my_python_if_needed", self.deps))
+        if self.import_error:
+            raise ImportError("my_package")
+
+
+def test__install_requirements__installs_into_flit_environment_before_disabling_deps() -> None:
+    installer = FakeInstaller("/other/python")
+    _install_requirements(installer, True)
+    assert installer.calls == [("install_requirements", "all"), ("install_reqs_my_python_if_needed", "all")]
+    assert installer.deps == "none"
+
+    installer = FakeInstaller("/other/python")
+    _install_requirements(installer, False)
+    assert installer.calls == [("install_reqs_my_python_if_needed", "all")]
+    assert installer.deps == "none"
+
+    installer = FakeInstaller(sys.executable)
+    _install_requirements(installer, True)
+    assert installer.calls == [("install_requirements", "all")]
+    assert installer.deps == "none"
+
+
+def test__install_requirements__keeps_deps_if_requirements_are_not_installed() -> None:
+    installer = FakeInstaller("/other/python", import_error=True)
+    with pytest.raises(ImportError):
+        _install_requirements(installer, False)
+    assert installer.deps == "all"
+
+
+DYNAMIC_PYPROJECT_TOML = """
+[project]
+name = "slap-test-link"
+dynamic = ["version"]
+dependencies = ["slap-test-link-dep"]
+"""
+
+DYNAMIC_INIT_PY = """
+import slap_test_link_dep
+
+__version__ = slap_test_link_dep.VERSION
+"""
+
+
+@pytest.fixture
+def dynamic_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> t.Iterator[tuple[t.Any, list[str]]]:
+    """Creates a project whose version Flit can only read by importing it, which requires a dependency that is not
+    installed. Flit's installation of requirements into its own environment is faked: it makes the dependency
+    importable. Yields the project and the list of Python executables that Flit installed requirements for."""
+
+    from flit.install import Installer  # type: ignore[import]
+
+    from slap.util.toml_file import TomlFile
+
+    directory = tmp_path / "project"
+    (directory / "slap_test_link").mkdir(parents=True)
+    (directory / "slap_test_link" / "__init__.py").write_text(DYNAMIC_INIT_PY)
+    (directory / "pyproject.toml").write_text(DYNAMIC_PYPROJECT_TOML)
+    (tmp_path / "deps").mkdir()
+    requirements_installed_for: list[str] = []
+
+    def install_requirements(self: t.Any) -> None:
+        if self.deps != "none":
+            requirements_installed_for.append(self.python)
+            (tmp_path / "deps" / "slap_test_link_dep.py").write_text("VERSION = '1.2.3'\n")
+            monkeypatch.syspath_prepend(str(tmp_path / "deps"))
+
+    monkeypatch.setattr(Installer, "install_requirements", install_requirements)
+    project = SimpleNamespace(
+        directory=directory,
+        is_python_project=True,
+        pyproject_toml=TomlFile(directory / "pyproject.toml"),
+        packages=lambda: [SimpleNamespace(name="slap_test_link")],
+        dist_name=lambda: "slap-test-link",
+    )
+    yield project, requirements_installed_for
+    sys.modules.pop("slap_test_link_dep", None)
+
+
+@pytest.fixture
+def venv_python(tmp_path: Path) -> str:
+    sp.check_call([sys.executable, "-m", "venv", "--without-pip", str(tmp_path / "venv")])
+    return str(tmp_path / "venv" / "bin" / "python")
+
+
+def test__link_repository__without_dependencies_links_dynamic_version(
+    tmp_path: Path,
+    dynamic_project: tuple[t.Any, list[str]],
+    venv_python: str,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from cleo.io.buffered_io import BufferedIO  # type: ignore[import]
+
+    project, requirements_installed_for = dynamic_project
+
+    # Writing the manifest fails, but that must not undo the link.
+    def save(self: LinkManifest) -> None:
+        raise PermissionError(13, "Permission denied", str(self.path))
+
+    monkeypatch.setattr(LinkManifest, "save", save)
+    link_repository(BufferedIO(), [project], python=venv_python, install_dependencies=False)
+
+    # Flit installed the requirements that it needs to import the package into its own environment only.
+    assert requirements_installed_for == [sys.executable]
+    (site_packages,) = (tmp_path / "venv" / "lib").glob("python*/site-packages")
+    assert (site_packages / "slap_test_link").resolve() == project.directory / "slap_test_link"
+    assert (site_packages / "slap_test_link-1.2.3.dist-info").is_dir()
+    assert "Could not write link manifest" in caplog.text
+
+
+def test__link_repository__does_not_keep_manifest_outside_of_venv(
+    tmp_path: Path, dynamic_project: tuple[t.Any, list[str]], venv_python: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from cleo.io.buffered_io import BufferedIO
+
+    from slap.python.environment import PythonEnvironment
+
+    project, _ = dynamic_project
+    monkeypatch.setattr(PythonEnvironment, "is_venv", lambda self: False)
+    link_repository(BufferedIO(), [project], python=venv_python, install_dependencies=False)
+    (site_packages,) = (tmp_path / "venv" / "lib").glob("python*/site-packages")
+    assert (site_packages / "slap_test_link").is_symlink()
+    assert not (tmp_path / "venv" / LinkManifest.FILENAME).exists()
@@ -0,0 +1,67 @@
+import hashlib
+import typing as t
+from pathlib import Path
+from types import SimpleNamespace
+
+from slap.ext.application.install import InstallConfig
+from slap.ext.application.lock import get_lock_dependencies, get_lock_requirements, get_requirements_digest
+from slap.python.dependency import MultiDependency, PathDependency, PypiDependency, VersionSpec
+
+
+def make_project(name: str, run: list, dev: list | None = None, extra: dict | None = None) -> SimpleNamespace:
+    dependencies = SimpleNamespace(run=run, dev=dev or [], extra=extra or {})
+    return SimpleNamespace(dist_name=lambda: name, dependencies=lambda: dependencies)
+
+
+def test__get_lock_dependencies__collects_all_except_projects_and_paths() -> None:
+    projects = [
+        make_project(
+            "a",
+            [PypiDependency("b", VersionSpec("*")), PypiDependency("requests", VersionSpec(">=2"))],
+            dev=[PypiDependency("pytest", VersionSpec("*"))],
+            extra={"docs": [PypiDependency("mkdocs", VersionSpec("*"))]},
+        ),
+        make_project("b", [PathDependency("vendored", Path("vendored")), PypiDependency("attrs", VersionSpec("*"))]),
+    ]
+    app = SimpleNamespace(repository=SimpleNamespace(projects=lambda: projects))
+    config = {t.cast(t.Any, "repository"): InstallConfig(extras={"lint": ["ruff ^0.5"]})}
+
+    dependencies = get_lock_dependencies(t.cast(t.Any, app), config)
+    assert sorted(dependency.name for dependency in dependencies) == ["attrs", "mkdocs", "pytest", "requests", "ruff"]
+
+
+def test__get_lock_requirements__keeps_markers() -> None:
+    dependencies = [
+        PypiDependency("requests", VersionSpec(">=2"), hashes=["sha256:abc"]),
+        PypiDependency("pywin32", VersionSpec("*"), markers='sys_platform == "win32"'),
+        PypiDependency("tomli", VersionSpec("*"), python=VersionSpec("<3.11")),
+        MultiDependency(
+            "numpy",
+            [
+                PypiDependency("numpy", VersionSpec("<2"), python=VersionSpec("<3.9")),
+                PypiDependency("numpy", VersionSpec(">=2"), python=VersionSpec(">=3.9")),
+            ],
+            markers='platform_machine != "armv7l"',
+        ),
+        PypiDependency("requests", VersionSpec(">=2")),
+    ]
+
+    assert get_lock_requirements(dependencies) == [
+        'numpy <2 ; (platform_machine != "armv7l") and (python_version < "3.9")',
+        'numpy >=2 ; (platform_machine != "armv7l") and (python_version >= "3.9")',
+        'pywin32 ; sys_platform == "win32"',
+        "requests >=2",
+        'tomli ; python_version < "3.11"',
+    ]
+
+
+def test__get_requirements_digest__is_stable() -> None:
+    dependencies = [
+        PypiDependency("pywin32", VersionSpec("*"), markers='sys_platform == "win32"'),
+        PypiDependency("requests", VersionSpec(">=2")),
+    ]
+
+    # The digest does not depend on the order of the dependencies, nor on the environment they are collected in.
+    digest = get_requirements_digest(get_lock_requirements(dependencies))
+    assert digest == get_requirements_digest(get_lock_requirements(dependencies[::-1]))
+    assert digest == hashlib.sha256(b'pywin32 ; sys_platform == "win32"\nrequests >=2').hexdigest()
@@ -0,0 +1,120 @@
+import json
+import sys
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from slap.ext.application.report import ReportDependenciesCommand, read_license_text
+from slap.python.dependency import PypiDependency
+from slap.python.environment import DistributionGraph, DistributionMetadata, PythonEnvironment, build_distribution_graph
+
+
+def make_metadata(location: str | None, requirements: list[str] | None = None) -> DistributionMetadata:
+    return DistributionMetadata(location, "1.0.0", "MIT", None, None, requirements or [], set())
+
+
+def make_command(
+    options: dict[str, t.Any], set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None]
+) -> ReportDependenciesCommand:
+    command = object.__new__(ReportDependenciesCommand)
+    set_command_options(command, options)
+    return command
+
+
+def read_records(capsys: pytest.CaptureFixture[str]) -> list[dict[str, t.Any]]:
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def write_ndjson(
+    graph: DistributionGraph,
+    options: dict[str, t.Any],
+    capsys: pytest.CaptureFixture[str],
+    set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None],
+) -> list[dict[str, t.Any]]:
+    with ThreadPoolExecutor() as executor:
+        make_command(options, set_command_options)._write_ndjson(
+            graph, sorted(graph.metadata.keys() | graph.missing), executor
+        )
+    return read_records(capsys)
+
+
+def test__read_license_text(tmp_path: Path) -> None:
+    dist_info = tmp_path / "a-1.0.0.dist-info"
+    (dist_info / "licenses").mkdir(parents=True)
+    assert read_license_text(str(dist_info)) is None
+    assert read_license_text(None) is None
+    assert read_license_text(str(tmp_path / "a.egg-info")) is None
+
+    (dist_info / "licenses" / "LICENSE.txt").write_text("License from licenses/")
+    assert read_license_text(str(dist_info)) == "License from licenses/"
+    (dist_info / "LICENSE").write_text("License")
+    (dist_info / "LICENSE-THIRD-PARTY").write_text("Third-party licenses")
+    assert read_license_text(str(dist_info)) == "License"
+
+
+def test__ReportDependenciesCommand__write_ndjson(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None],
+) -> None:
+    monkeypatch.setattr(ReportDependenciesCommand, "NDJSON_CHUNK_SIZE", 2)
+    (tmp_path / "a-1.0.0.dist-info").mkdir()
+    (tmp_path / "a-1.0.0.dist-info" / "LICENSE").write_text("License of a")
+    graph = DistributionGraph(
+        metadata={
+            "c": make_metadata(None),
+            "a": make_metadata(str(tmp_path / "a-1.0.0.dist-info"), ["b", "c"]),
+            "b": make_metadata(str(tmp_path / "b-1.0.0.dist-info")),
+        },
+        dependencies={"a": {"b", "c", "d"}},
+        missing={"d"},
+    )
+
+    records = write_ndjson(graph, {}, capsys, set_command_options)
+    assert [record["name"] for record in records] == ["a", "b", "c", "d"]
+    assert records[0]["dependencies"] == ["b", "c", "d"]
+    assert records[1]["dependencies"] == []
+    assert records[0]["metadata"]["requirements"] == ["b", "c"]
+    assert all("license_text" not in record.get("metadata", {}) for record in records)
+    assert records[3] == {"name": "d", "missing": True}
+
+    records = write_ndjson(graph, {"with-license-text": True}, capsys, set_command_options)
+    assert [record["metadata"]["license_text"] for record in records[:3]] == ["License of a", None, None]
+
+
+def test__ReportDependenciesCommand__write_ndjson__streams_every_level_of_the_graph(
+    capsys: pytest.CaptureFixture[str], set_command_options: t.Callable[[t.Any, dict[str, t.Any]], None]
+) -> None:
+    dists = {
+        "a": make_metadata(None, ["c", "b"]),
+        "b": make_metadata(None, ["d"]),
+        "c": make_metadata(None, ["d", "missing"]),
+        "d": make_metadata(None),
+    }
+    # The names of the records that were written before each level of the graph was fetched.
+    written_before_fetch: list[list[str]] = []
+
+    class FakeEnvironment:
+        pep508 = PythonEnvironment.of(sys.executable).pep508
+
+        def get_distributions_metadata(self, names: t.Iterable[str]) -> dict[str, DistributionMetadata | None]:
+            records = read_records(capsys)
+            written_before_fetch.append([record["name"] for record in records])
+            assert all(record["dependencies"] == sorted(dists[record["name"]].requirements) for record in records)
+            return {name: dists.get(name) for name in names}
+
+    command = make_command({}, set_command_options)
+    with ThreadPoolExecutor() as executor:
+        build_distribution_graph(
+            env=FakeEnvironment(),  # type: ignore[arg-type]
+            dependencies=[PypiDependency.parse("a")],
+            expanded_callback=lambda graph, dist_names: command._write_ndjson(graph, dist_names, executor),
+        )
+
+    assert written_before_fetch == [[], ["a"], ["b", "c"]]
+    records = read_records(capsys)
+    assert [record["name"] for record in records] == ["d", "missing"]
+    assert records[1] == {"name": "missing", "missing": True}
@@ -0,0 +1,125 @@
+import json
+import socket
+import threading
+import time
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from slap.ext.repository_hosts import github
+from slap.ext.repository_hosts.github import github_get_username_from_email
+from slap.util import http
+
+
+@pytest.fixture
+def search_api(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> t.Iterator[tuple[str, list[str], dict[str, t.Any]]]:
+    """Serves a stand-in for the GitHub user search API. Yields its base URL, the list of queries that it received
+    and a dictionary of settings for the server."""
+
+    monkeypatch.setenv("SLAP_CACHE_DIR", str(tmp_path / "cache"))
+    queries: list[str] = []
+    settings: dict[str, t.Any] = {"users": {"me@example.org": "me"}, "delay": 0.0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            assert url.path == "/search/users"
+            query = parse_qs(url.query)["q"][0]
+            queries.append(query)
+            time.sleep(settings["delay"])
+            login = settings["users"].get(query)
+            body = json.dumps({"items": [{"login": login}] if login else []}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: t.Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    github_get_username_from_email.cache_clear()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", queries, settings
+    finally:
+        github_get_username_from_email.cache_clear()
+        server.shutdown()
+        server.server_close()
+
+
+def test__github_get_username_from_email__caches_on_disk(
+    search_api: tuple[str, list[str], dict[str, t.Any]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url, queries, settings = search_api
+
+    assert github_get_username_from_email(url, "me@example.org") == "me"
+    assert github_get_username_from_email(url, "nobody@example.org") is None
+    assert queries == ["me@example.org", "nobody@example.org"]
+
+    # A new process reads the results, including the negative result, from the cache on disk.
+    github_get_username_from_email.cache_clear()
+    settings["users"]["nobody@example.org"] = "nobody"
+    assert github_get_username_from_email(url, "me@example.org") == "me"
+    assert github_get_username_from_email(url, "nobody@example.org") is None
+    assert len(queries) == 2
+
+    # Negative results expire earlier than usernames.
+    github_get_username_from_email.cache_clear()
+    monkeypatch.setattr(github, "USERNAME_NEGATIVE_CACHE_TTL", 0)
+    assert github_get_username_from_email(url, "me@example.org") == "me"
+    assert github_get_username_from_email(url, "nobody@example.org") == "nobody"
+    assert queries == ["me@example.org", "nobody@example.org", "nobody@example.org"]
+
+
+def test__github_get_username_from_email__times_out(
+    search_api: tuple[str, list[str], dict[str, t.Any]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url, queries, settings = search_api
+    monkeypatch.setattr(github, "USERNAME_LOOKUP_TIMEOUT", 0.1)
+    settings["delay"] = 1.0
+
+    with pytest.raises(requests.Timeout):
+        github_get_username_from_email(url, "me@example.org")
+
+    # Failed lookups are not cached.
+    settings["delay"] = 0.0
+    assert github_get_username_from_email(url, "me@example.org") == "me"
+    assert len(queries) == 2
+
+
+def test__github_get_username_from_email__does_not_retry_connect_timeouts(
+    search_api: tuple[str, list[str], dict[str, t.Any]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import urllib3.util.connection
+
+    url, queries, _ = search_api
+    attempts: list[t.Any] = []
+
+    def create_connection(address: t.Any, *args: t.Any, **kwargs: t.Any) -> socket.socket:
+        attempts.append(address)
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(urllib3.util.connection, "create_connection", create_connection)
+    monkeypatch.setattr(http, "RETRY_BACKOFF_FACTOR", 0)
+    http.get_session.cache_clear()
+    try:
+        with pytest.raises(requests.ConnectTimeout):
+            github_get_username_from_email(url, "me@example.org")
+        assert len(attempts) == 1
+
+        # Other requests still retry connecting.
+        with pytest.raises(requests.ConnectTimeout):
+            http.get_session().get(f"{url}/search/users", timeout=0.1)
+        assert len(attempts) == 2 + http.RETRY_TOTAL
+    finally:
+        http.get_session(retry_connect=False).close()
+        http.get_session().close()
+        http.get_session.cache_clear()
+    assert queries == []
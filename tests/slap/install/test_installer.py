@@ -0,0 +1,143 @@
+import base64
+import hashlib
+import subprocess as sp
+import sys
+import typing as t
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from slap.ext.application.venv import UvVenv
+from slap.install.installer import Indexes, InstallOptions, PipInstaller, UvSyncInstaller, UvSyncOptions
+from slap.python.dependency import PypiDependency, VersionSpec
+from slap.python.environment import PythonEnvironment
+
+
+def make_wheel(directory: Path, name: str, version: str, requires: list[str] | None = None) -> Path:
+    """Writes a minimal pure-Python wheel for the distribution *name* into *directory*."""
+
+    dist_info = f"{name}-{version}.dist-info"
+    files = {
+        f"{name}/__init__.py": f"__version__ = {version!r}\n",
+        f"{dist_info}/METADATA": "\n".join(
+            ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+            + [f"Requires-Dist: {req}" for req in requires or ()]
+        )
+        + "\n",
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = []
+    for filename, content in files.items():
+        digest = base64.urlsafe_b64encode(hashlib.sha256(content.encode()).digest()).rstrip(b"=").decode()
+        record.append(f"{filename},sha256={digest},{len(content.encode())}")
+    record.append(f"{dist_info}/RECORD,,")
+    files[f"{dist_info}/RECORD"] = "\n".join(record) + "\n"
+
+    path = directory / f"{name}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as zfile:
+        for filename, content in files.items():
+            zfile.writestr(filename, content)
+    return path
+
+
+@pytest.fixture
+def uv_venv(tmp_path: Path) -> PythonEnvironment:
+    sp.check_call([str(UvVenv.find_uv_bin()), "venv", "-q", str(tmp_path / "venv")])
+    return PythonEnvironment.of(str(tmp_path / "venv" / "bin" / "python"))
+
+
+def test__PipInstaller__install_from_wheelhouse_without_index(
+    tmp_path: Path, uv_venv: PythonEnvironment, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("UV_OFFLINE", "1")
+    wheelhouse = tmp_path / "wheelhouse"
+    wheelhouse.mkdir()
+    make_wheel(wheelhouse, "slap_test_a", "1.0.0", requires=["slap_test_b>=2.0"])
+    make_wheel(wheelhouse, "slap_test_b", "2.1.0")
+
+    options = InstallOptions(
+        indexes=Indexes(default="pypi", urls={"pypi": "http://127.0.0.1:9/simple"}),
+        quiet=True,
+        upgrade=False,
+        find_links=[wheelhouse],
+        no_index=True,
+    )
+    installer = PipInstaller(use_uv=True)
+    assert installer.install([PypiDependency("slap_test_a", VersionSpec(">=1.0"))], uv_venv, options) == 0
+
+    distributions = uv_venv.get_distributions(["slap_test_a", "slap_test_b"])
+    assert distributions["slap_test_a"] is not None
+    assert distributions["slap_test_a"].version == "1.0.0"
+    assert distributions["slap_test_b"] is not None
+    assert distributions["slap_test_b"].version == "2.1.0"
+
+
+def test__PipInstaller__build_wheels_from_local_wheels(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    make_wheel(source, "slap_test_a", "1.0.0", requires=["slap_test_b"])
+    make_wheel(source, "slap_test_b", "2.1.0")
+
+    # Build a wheelhouse from the local source directory with the Pip of the current interpreter.
+    wheelhouse = tmp_path / "wheelhouse"
+    options = InstallOptions(indexes=Indexes(), quiet=True, upgrade=False, find_links=[source], no_index=True)
+    installer = PipInstaller(use_uv=False)
+    environment = PythonEnvironment.of(sys.executable)
+    assert (
+        installer.build_wheels([PypiDependency("slap_test_a", VersionSpec("*"))], environment, options, wheelhouse) == 0
+    )
+    assert sorted(path.name for path in wheelhouse.iterdir()) == [
+        "slap_test_a-1.0.0-py3-none-any.whl",
+        "slap_test_b-2.1.0-py3-none-any.whl",
+    ]
+
+
+def test__UvSyncInstaller__sync__requires_venv(tmp_path: Path) -> None:
+    environment = t.cast(PythonEnvironment, SimpleNamespace(is_venv=lambda: False, executable="/usr/bin/python"))
+    with pytest.raises(ValueError, match="virtual environment"):
+        UvSyncInstaller(tmp_path).sync(environment, UvSyncOptions())
+
+
+def test__UvSyncInstaller__get_command(tmp_path: Path) -> None:
+    installer = UvSyncInstaller(tmp_path)
+    environment = PythonEnvironment.of(sys.executable)
+    uv = str(UvVenv.find_uv_bin())
+
+    assert installer.get_command(environment, UvSyncOptions()) == [
+        uv,
+        "sync",
+        "--frozen",
+        "--inexact",
+        "--python",
+        environment.executable,
+    ]
+
+    options = UvSyncOptions(
+        extras={"docs", "cli"},
+        groups={"lint"},
+        no_dev=True,
+        no_install_workspace=True,
+        packages=["a", "b"],
+        quiet=True,
+    )
+    assert installer.get_command(environment, options)[6:] == [
+        "--extra",
+        "cli",
+        "--extra",
+        "docs",
+        "--group",
+        "lint",
+        "--no-dev",
+        "--no-install-workspace",
+        "--package",
+        "a",
+        "--package",
+        "b",
+        "-q",
+    ]
+
+    options.all_packages = True
+    assert "--all-packages" in installer.get_command(environment, options)
+    assert "--package" not in installer.get_command(environment, options)
@@ -1,14 +1,20 @@
+import re
+import typing as t
 from pathlib import Path
 
 import pytest
 
 from slap.python.dependency import (
+    PARSE_CACHE_SIZE,
     GitDependency,
     MultiDependency,
     PathDependency,
     PypiDependency,
     UrlDependency,
     VersionSpec,
+    _parse_version,
+    _parse_version_spec,
+    parse_dependencies_bulk,
     parse_dependency_config,
     parse_dependency_string,
     split_package_name_with_extras,
@@ -156,3 +162,119 @@ def test__PypiDependency__parse():
 
     # TODO (@NiklasRosenstein): This is actually a bad example and we should start raising an error for it.
     assert PypiDependency.parse("foo 1.0.0") == PypiDependency("foo 1.0.0", VersionSpec("*"))
+
+
+def test__VersionSpec__parses_each_spec_and_version_once():
+    """Parsing the same version specs and versions again must be a cache lookup."""
+
+    specs = [">=2.0", "^1.2", "~=3.1", "==1.*", ">=1.0,<2.0", "*", " >=2.0 ", "^1.2"]
+    versions = ["2.1.0", "1.4", "3.1.5", "1.0.0", "1.5", "0.1", "1.9", "2.0.0"]
+    expected = [True, True, True, True, True, True, False, False]
+    rounds = 10
+
+    _parse_version_spec.cache_clear()
+    _parse_version.cache_clear()
+    for _ in range(rounds):
+        assert [VersionSpec(spec).accepts(version) for spec, version in zip(specs, versions, strict=True)] == expected
+
+    # Specs are stripped before they are parsed, so " >=2.0 " and ">=2.0" share the same cache entry.
+    info = _parse_version_spec.cache_info()
+    unique_specs = len({spec.strip() for spec in specs})
+    assert (info.misses, info.hits) == (unique_specs, rounds * len(specs) - unique_specs)
+    info = _parse_version.cache_info()
+    assert (info.misses, info.hits) == (len(set(versions)), rounds * len(versions) - len(set(versions)))
+    assert _parse_version_spec.cache_info().maxsize == _parse_version.cache_info().maxsize == PARSE_CACHE_SIZE
+
+
+def test__VersionSpec__compares_cached_constraints() -> None:
+    spec = VersionSpec(">=1.0,<2.0")
+    assert spec == VersionSpec(" >=1.0,<2.0")
+    assert spec != VersionSpec(">=1.0")
+    assert spec.to_pep_508() == ">=1.0,<2.0"
+
+
+def test__parse_dependencies_bulk__parses_each_line_once(monkeypatch: pytest.MonkeyPatch):
+    """Identical lines are parsed only once, also across calls that share the same memo."""
+
+    from slap.python import dependency as dependency_module
+
+    lines = ["requests >=2", 'tomli ; python_version < "3.11"', "requests >=2", "foo @ git+https://g.com/foo"] * 5
+    single = [parse_dependency_string(line) for line in lines]
+
+    calls: list[str] = []
+
+    def parse(line: str) -> t.Any:
+        calls.append(line)
+        return parse_dependency_string(line)
+
+    monkeypatch.setattr(dependency_module, "parse_dependency_string", parse)
+    memo: dict[str, t.Any] = {}
+    bulk = parse_dependencies_bulk(lines, memo)
+    assert bulk == single
+    assert calls == ["requests >=2", 'tomli ; python_version < "3.11"', "foo @ git+https://g.com/foo"]
+    assert bulk[0] is bulk[2]
+    assert parse_dependencies_bulk(lines[:2], memo) == single[:2]
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "requests",
+        "requests>=2",
+        "requests >=2.0,<3",
+        "Requests [socks, security] >= 2.0 ; python_version < '3.8'",
+        "foo (>=1.0)",
+        "foo ( >=1.0 )",
+        "foo~=1.2",
+        "foo==1.*",
+        "foo !=1.0",
+        "foo ^1.0",
+        "foo *",
+        'foo ; sys_platform == "win32"',
+        'foo>=1;python_version<"3.8" and os_name=="nt"',
+        "foo.bar_baz-qux[a]",
+        "foo[a,b]>1",
+        "  foo  ",
+    ],
+)
+def test__PypiDependency__parse__fast_path_matches_full_parser(value: str, monkeypatch: pytest.MonkeyPatch):
+    from slap.python import dependency as dependency_module
+
+    assert dependency_module._PYPI_REQUIREMENT_RE.match(value), "expected the value to take the fast path"
+    fast = PypiDependency.parse(value)
+
+    # A pattern that never matches forces the full parser.
+    monkeypatch.setattr(dependency_module, "_PYPI_REQUIREMENT_RE", re.compile(r"(?!)"))
+    assert PypiDependency.parse(value) == fast
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["name[a=a]", "foo[a,]", "foo[,a]", "foo[]", "foo[a b]", "foo[a;b]", "foo[a]]", "foo[[a]"],
+)
+def test__PypiDependency__parse__fast_path_does_not_match_malformed_extras(
+    value: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from slap.python import dependency as dependency_module
+
+    assert dependency_module._PYPI_REQUIREMENT_RE.match(value) is None
+    try:
+        expected: PypiDependency | type[Exception] = PypiDependency.parse(value)
+    except ValueError as exc:
+        expected = type(exc)
+
+    # A pattern that never matches forces the full parser.
+    monkeypatch.setattr(dependency_module, "_PYPI_REQUIREMENT_RE", re.compile(r"(?!)"))
+    if isinstance(expected, PypiDependency):
+        assert PypiDependency.parse(value) == expected
+    else:
+        with pytest.raises(expected):
+            PypiDependency.parse(value)
+
+
+def test__PypiDependency__parse__rejects_invalid_extras() -> None:
+    with pytest.raises(ValueError, match="Could not parse version constraint"):
+        PypiDependency.parse("name[a=a]")
+    with pytest.raises(ValueError, match="invalid package name with extras"):
+        PypiDependency.parse("foo[a,]")
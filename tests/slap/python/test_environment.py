@@ -1,7 +1,11 @@
 import platform
+import subprocess as sp
 import sys
+from pathlib import Path
 
-from slap.python.environment import PythonEnvironment
+import pytest
+
+from slap.python.environment import PythonEnvironment, get_distribution_metadata
 
 
 def test__PythonEnvironment__with_current_python_instance():
@@ -14,3 +18,225 @@ def test__PythonEnvironment__with_current_python_instance():
     assert environment.real_prefix == getattr(sys, "real_prefix", None)
     assert environment.has_importlib_metadata()
     assert environment.get_distribution("setuptools") is not None
+
+
+def test__PythonEnvironment__of__uses_persistent_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SLAP_CACHE_DIR", str(tmp_path))
+    PythonEnvironment.of.cache_clear()
+    environment = PythonEnvironment.of(sys.executable)
+    assert len(list((tmp_path / "python-environments").iterdir())) == 1
+
+    # A new process would not have the in-memory cache, but it must not need to run the interpreter again.
+    def check_output(*args, **kwargs):
+        raise AssertionError("the interpreter should not be run")
+
+    PythonEnvironment.of.cache_clear()
+    monkeypatch.setattr(sp, "check_output", check_output)
+    cached_environment = PythonEnvironment.of(sys.executable)
+    assert cached_environment.executable == environment.executable
+    assert cached_environment.version_tuple == environment.version_tuple
+    assert cached_environment.pep508.as_json() == environment.pep508.as_json()
+    PythonEnvironment.of.cache_clear()
+
+
+def test__PythonEnvironment__of__cache_depends_on_sys_path_variables(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from slap.python.environment import _get_introspection_cache_file
+
+    monkeypatch.delenv("PYTHONPATH", raising=False)
+    cache_file = _get_introspection_cache_file(sys.executable)
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    assert _get_introspection_cache_file(sys.executable) != cache_file
+
+    PythonEnvironment.of.cache_clear()
+    try:
+        environment = PythonEnvironment.of(sys.executable)
+    finally:
+        PythonEnvironment.of.cache_clear()
+    assert environment.distribution_paths is not None
+    assert str(tmp_path) in environment.distribution_paths
+
+
+def test__PythonEnvironment__of__prunes_unused_cache_files(slap_cache_dir: Path) -> None:
+    import os
+    import time
+
+    from slap.python.environment import INTROSPECTION_CACHE_MAX_AGE, _get_introspection_cache_file
+
+    cache_directory = slap_cache_dir / "python-environments"
+    cache_directory.mkdir()
+    stale_file, used_file = cache_directory / "stale.json", cache_directory / "used.json"
+    stale_file.write_text("{}")
+    used_file.write_text("{}")
+    past = time.time() - INTROSPECTION_CACHE_MAX_AGE - 60
+    os.utime(stale_file, (past, past))
+
+    PythonEnvironment.of.cache_clear()
+    try:
+        PythonEnvironment.of(sys.executable)
+        cache_file = _get_introspection_cache_file(sys.executable)
+        assert cache_file is not None
+        assert sorted(cache_directory.iterdir()) == sorted([cache_file, used_file])
+
+        # Reading the cache file marks it as used.
+        os.utime(cache_file, (past, past))
+        PythonEnvironment.of.cache_clear()
+        PythonEnvironment.of(sys.executable)
+        assert cache_file.stat().st_mtime > past + 60
+    finally:
+        PythonEnvironment.of.cache_clear()
+
+
+def test__PythonEnvironment__get_distributions__matches_interpreter() -> None:
+    environment = PythonEnvironment.of(sys.executable)
+    assert environment.distribution_paths is not None
+
+    names = ["setuptools", "pytest", "Importlib_Metadata", "this-distribution-does-not-exist"]
+    in_process = environment.get_distributions(names)
+    from_interpreter = environment._get_distributions_from_interpreter(names)
+    assert {k: v and v.version for k, v in in_process.items()} == {
+        k: v and v.version for k, v in from_interpreter.items()
+    }
+    assert in_process["this-distribution-does-not-exist"] is None
+
+    # The location of a distribution is known no matter where it was looked up, so its license can be read.
+    for name in ("setuptools", "pytest"):
+        in_process_dist, interpreter_dist = in_process[name], from_interpreter[name]
+        assert in_process_dist is not None
+        assert interpreter_dist is not None
+        location = get_distribution_metadata(interpreter_dist).location
+        assert location is not None
+        assert location == get_distribution_metadata(in_process_dist).location
+
+
+def test__PythonEnvironment__get_distributions__sees_new_pth_paths(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SLAP_CACHE_DIR", str(tmp_path / "cache"))
+    sp.check_call([sys.executable, "-m", "venv", "--without-pip", str(tmp_path / "venv")])
+    python = str(tmp_path / "venv" / "bin" / "python")
+
+    PythonEnvironment.of.cache_clear()
+    assert PythonEnvironment.of(python).get_distribution("slap-test-dist") is None
+
+    # Simulate an editable install that adds a path with the distribution metadata through a `.pth` file.
+    project = tmp_path / "project"
+    (project / "slap_test_dist-1.0.dist-info").mkdir(parents=True)
+    (project / "slap_test_dist-1.0.dist-info" / "METADATA").write_text("Name: slap-test-dist\nVersion: 1.0\n")
+    (site_packages,) = (tmp_path / "venv" / "lib").glob("python*/site-packages")
+    (site_packages / "slap_test_dist.pth").write_text(str(project) + "\n")
+
+    PythonEnvironment.of.cache_clear()
+    dist = PythonEnvironment.of(python).get_distribution("slap-test-dist")
+    PythonEnvironment.of.cache_clear()
+    assert dist is not None
+    assert dist.version == "1.0"
+
+
+def test__PythonEnvironment__get_worker__is_reused() -> None:
+    environment = PythonEnvironment.of(sys.executable)
+    worker = environment.get_worker()
+    try:
+        names = ["setuptools", "this-distribution-does-not-exist"]
+        first = environment._get_distributions_from_interpreter(names)
+        assert environment.get_worker() is worker
+        assert environment._get_distributions_from_interpreter(names).keys() == first.keys()
+        assert first["setuptools"] is not None
+        assert first["this-distribution-does-not-exist"] is None
+        assert worker.call("has_importlib_metadata") is True
+
+        with pytest.raises(RuntimeError, match="KeyError"):
+            worker.call("no_such_method")
+        assert worker._process.poll() is None
+    finally:
+        worker.close()
+    assert not worker.is_alive()
+    assert environment.get_worker() is not worker
+
+
+def test__build_distribution_graph__is_breadth_first(tmp_path: Path) -> None:
+    from importlib_metadata import PathDistribution
+
+    from slap.python.dependency import PypiDependency
+    from slap.python.environment import build_distribution_graph, get_distribution_metadata
+
+    def make_dist(name: str, requires: list[str]) -> PathDistribution:
+        path = tmp_path / f"{name}-1.0.dist-info"
+        path.mkdir()
+        lines = [f"Name: {name}", "Version: 1.0"] + [f"Requires-Dist: {req}" for req in requires]
+        (path / "METADATA").write_text("\n".join(lines) + "\n")
+        return PathDistribution(path)
+
+    # A chain that is deeper than the recursion limit, plus a distribution that is required with an extra late.
+    depth = sys.getrecursionlimit() + 100
+    dists = {f"d{i}": make_dist(f"d{i}", [f"d{i + 1}"]) for i in range(depth)}
+    dists[f"d{depth}"] = make_dist(f"d{depth}", ["b"])
+    dists["a"] = make_dist("a", ["b", "c"])
+    dists["b"] = make_dist("b", ["e; extra == 'x'"])
+    dists["c"] = make_dist("c", ["b[x]"])
+    dists["e"] = make_dist("e", [])
+
+    class FakeEnvironment:
+        pep508 = PythonEnvironment.of(sys.executable).pep508
+
+        def __init__(self) -> None:
+            self.queries: list[set[str]] = []
+
+        def get_distributions_metadata(self, names):
+            self.queries.append(set(names))
+            return {name: get_distribution_metadata(dists[name]) if name in dists else None for name in names}
+
+    env = FakeEnvironment()
+    graph = build_distribution_graph(
+        env,  # type: ignore[arg-type]
+        [PypiDependency.parse("d0"), PypiDependency.parse("a"), PypiDependency.parse("missing")],
+    )
+
+    assert graph.missing == {"missing"}
+    assert graph.dependencies["b"] == {"e"}
+    assert "e" in graph.metadata
+    assert len(graph.metadata) == depth + 1 + 4
+    assert len(env.queries) == depth + 1  # One query per level of the chain d0 -> d{depth}.
+    assert sum(len(query) for query in env.queries) == len(graph.metadata) + 1
+
+
+def test__PythonEnvironment__get_distribution_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from importlib_metadata import MetadataPathFinder
+
+    from slap.python.environment import DistributionIndex
+
+    monkeypatch.setenv("SLAP_CACHE_DIR", str(tmp_path / "cache"))
+    sp.check_call([sys.executable, "-m", "venv", "--without-pip", str(tmp_path / "venv")])
+    (site_packages,) = (tmp_path / "venv" / "lib").glob("python*/site-packages")
+
+    def add_dist(name: str, version: str) -> None:
+        path = site_packages / f"{name}-{version}.dist-info"
+        path.mkdir()
+        (path / "METADATA").write_text(f"Name: {name}\nVersion: {version}\nRequires-Dist: foo; extra == 'x'\n")
+
+    add_dist("Slap_Test_A", "1.0")
+    PythonEnvironment.of.cache_clear()
+    environment = PythonEnvironment.of(str(tmp_path / "venv" / "bin" / "python"))
+    PythonEnvironment.of.cache_clear()
+
+    # The index is only maintained for Slap-managed environments.
+    assert environment.get_distribution_index() is None
+    (tmp_path / "venv" / "slap.json").write_text("{}")
+
+    metadata = environment.get_distributions_metadata(["slap-test-a", "slap-test-b"])
+    assert metadata["slap-test-a"] is not None
+    assert metadata["slap-test-a"].requirements == ["foo; extra == 'x'"]
+    assert metadata["slap-test-b"] is None
+    assert (tmp_path / "venv" / DistributionIndex.FILENAME).is_file()
+
+    # A valid index is read without scanning the environment.
+    with monkeypatch.context() as m:
+        m.setattr(MetadataPathFinder, "find_distributions", None)
+        assert environment.get_distributions_metadata(["SLAP.test_a"])["SLAP.test_a"] == metadata["slap-test-a"]
+
+    # Installing a distribution changes the site-packages directory, which invalidates the index.
+    add_dist("slap_test_b", "2.0")
+    metadata_b = environment.get_distributions_metadata(["slap-test-b"])["slap-test-b"]
+    assert metadata_b is not None
+    assert metadata_b.version == "2.0"
@@ -1,4 +1,8 @@
-from slap.python.pep508 import Pep508Environment
+import pytest
+
+from slap.python import pep508
+from slap.python.dependency import PypiDependency, VersionSpec
+from slap.python.pep508 import Pep508Environment, compile_markers, evaluate_matrix
 
 
 def test__Pep508Environment__sample_markers():
@@ -38,3 +42,103 @@ def test__Pep508Environment__sample_markers():
     # All fields are supposed to be strings
     for key, value in env.as_json().items():
         assert isinstance(value, str)
+
+
+def make_env() -> Pep508Environment:
+    return Pep508Environment(
+        python_version="3.10",
+        python_full_version="3.10.2",
+        os_name="posix",
+        sys_platform="darwin",
+        platform_release="21.3.0",
+        platform_system="Darwin",
+        platform_machine="arm64",
+        platform_python_implementation="CPython",
+        implementation_name="cpython",
+        implementation_version="3.10.2",
+    )
+
+
+def test__Pep508Environment__invalid_markers():
+    env = make_env()
+
+    with pytest.raises(ValueError, match="'extra' is not available"):
+        env.evaluate_markers('extra == "docs"')
+    with pytest.raises(ValueError, match="'foo' is not available"):
+        env.evaluate_markers('foo == "bar"')
+    with pytest.raises(ValueError, match="not supported"):
+        env.evaluate_markers('os_name == "posix" + "x"')
+    with pytest.raises(SyntaxError) as excinfo:
+        env.evaluate_markers('os_name == "posix', source="<requirements.txt>")
+    assert excinfo.value.filename == "<requirements.txt>"
+
+    assert env.evaluate_markers('extra != "docs"', {"dev"})
+    assert not env.evaluate_markers('"docs" != extra', {"docs"})
+
+
+def test__compile_markers__is_cached():
+    compiled = compile_markers('os_name == "posix" and python_version >= "3.10"')
+    assert compile_markers('os_name == "posix" and python_version >= "3.10"') is compiled
+    assert compiled.evaluate(make_env())
+
+
+def test__CompiledMarkers__evaluate__sees_reassigned_variables():
+    env = make_env()
+    compiled = compile_markers('sys_platform == "darwin"')
+    assert compiled.evaluate(env)
+    env.sys_platform = "linux"
+    assert not compiled.evaluate(env)
+    assert env.as_json()["sys_platform"] == "linux"
+    assert set(env.as_json()) == set(vars(make_env()))
+
+
+def test__evaluate_markers__compiles_each_marker_once():
+    """Evaluating the same markers again must be a cache lookup instead of parsing them again."""
+
+    env = make_env()
+    markers = [
+        f'(extra == "e{i}" or python_version < "3.{i % 12}") and sys_platform != "win32" and os_name == "posix"'
+        for i in range(500)
+    ]
+    rounds = 10
+
+    compile_markers.cache_clear()
+    results = [[env.evaluate_markers(marker, {"e1"}) for marker in markers] for _ in range(rounds)]
+    info = compile_markers.cache_info()
+    assert (info.misses, info.hits) == (len(markers), (rounds - 1) * len(markers))
+    assert all(result == results[0] for result in results)
+    assert results[0][:2] == [False, True]
+
+
+def test__evaluate_matrix__agrees_with_test_dependency():
+    platforms = [
+        {"sys_platform": "linux", "platform_system": "Linux", "os_name": "posix"},
+        {"sys_platform": "darwin", "platform_system": "Darwin", "os_name": "posix"},
+        {"sys_platform": "win32", "platform_system": "Windows", "os_name": "nt"},
+    ]
+    environments = [
+        make_env().replace(python_version=f"3.{minor}", python_full_version=f"3.{minor}.0", **platform)
+        for platform in platforms
+        for minor in range(10, 14)
+    ]
+    dependencies = [
+        PypiDependency.parse("requests"),
+        PypiDependency.parse('pywin32>=300; sys_platform == "win32"'),
+        PypiDependency.parse('tomli; python_version < "3.11"'),
+        PypiDependency.parse('uvloop; os_name == "posix" and extra == "fast"'),
+        PypiDependency("typing-extensions", VersionSpec("*"), python=VersionSpec(">=3.12")),
+    ]
+
+    for extras in [set(), {"fast"}]:
+        matrix = evaluate_matrix(dependencies, environments, extras)
+        assert matrix.to_list() == [
+            [pep508.test_dependency(dependency, environment, extras) for environment in environments]
+            for dependency in dependencies
+        ]
+
+    matrix = evaluate_matrix(dependencies, environments, set())
+    assert matrix[0, 0]
+    assert not matrix[1, 0]
+    assert matrix[1, 8]
+    assert [e.sys_platform for e in matrix.environments_for(1)] == ["win32"] * 4
+    assert matrix.dependencies_for(8) == [dependencies[0], dependencies[1], dependencies[2]]
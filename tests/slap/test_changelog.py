@@ -0,0 +1,319 @@
+import datetime
+import json
+import pickle
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from slap.changelog import Changelog, ChangelogEntry, ChangelogIndex, ChangelogManager, TomlChangelogDeser
+
+
+def make_manager(tmp_path: Path) -> ChangelogManager:
+    return ChangelogManager(tmp_path / ".changelog", None, cache_directory=tmp_path / "cache")
+
+
+def test__ChangelogManager__caches_parsed_changelogs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    manager = make_manager(tmp_path)
+    for minor in range(20):
+        changelog = Changelog([ChangelogEntry(f"id-{minor}", "fix", f"Fix {minor}", "@me")])
+        changelog.release_date = datetime.date(2022, 1, minor + 1)
+        manager.version(f"1.{minor}.0").save(changelog)
+    manager.unreleased().save(Changelog([ChangelogEntry("id-x", "feature", "Unreleased", "@me")]))
+
+    parsed: list[str] = []
+    load = TomlChangelogDeser.load
+
+    def counting_load(self, fp, filename):
+        parsed.append(Path(fp.name).name)
+        return load(self, fp, filename)
+
+    monkeypatch.setattr(TomlChangelogDeser, "load", counting_load)
+
+    # Listing the changelogs does not parse them, #ChangelogManager.preload() does and writes the index.
+    changelogs = manager.all()
+    assert parsed == []
+    manager.preload(changelogs)
+    expected = [(c.path.name, c.content) for c in changelogs]
+    assert len(parsed) == 21
+    (index_file,) = (tmp_path / "cache" / "changelog-index").iterdir()
+    assert json.loads(index_file.read_text())["format"] == ChangelogIndex.FORMAT
+
+    # A new manager (e.g. in the next Slap invocation) reads the contents from the index.
+    parsed.clear()
+    manager = make_manager(tmp_path)
+    changelogs = manager.all()
+    assert [(c.path.name, c.content) for c in changelogs] == expected
+    assert parsed == []
+
+    # Only changed files are parsed again, removed files are dropped from the index.
+    other_manager = make_manager(tmp_path)
+    unreleased = other_manager.unreleased()
+    unreleased.content.entries.append(ChangelogEntry("id-y", "fix", "Another one", "@me"))
+    unreleased.save(None)
+    manager.version("1.0.0").path.unlink()
+    parsed.clear()
+    manager = make_manager(tmp_path)
+    changelogs = manager.all()
+    manager.preload(changelogs)
+    assert parsed == ["_unreleased.toml"]
+    assert len(changelogs) == 20
+    assert [e.id for e in changelogs[0].content.entries] == ["id-x", "id-y"]
+    assert "1.0.0.toml" not in json.loads(index_file.read_text())["entries"]
+
+
+def test__ChangelogManager__index_is_not_written_by_readonly_manager(tmp_path: Path) -> None:
+    manager = make_manager(tmp_path)
+    manager.unreleased().save(Changelog([ChangelogEntry("id-x", "feature", "Unreleased", "@me")]))
+
+    reader = ChangelogManager(manager.directory, None, readonly=True, cache_directory=tmp_path / "cache")
+    changelogs = reader.all()
+    reader.preload(changelogs)
+    assert [e.id for e in changelogs[0].content.entries] == ["id-x"]
+    assert not (tmp_path / "cache").exists()
+
+
+def test__ChangelogIndex__ignores_invalid_files(tmp_path: Path) -> None:
+    manager = make_manager(tmp_path)
+    manager.unreleased().save(Changelog([ChangelogEntry("id-x", "feature", "Unreleased", "@me")]))
+    manager.preload([manager.unreleased()])
+    (index_file,) = (tmp_path / "cache" / "changelog-index").iterdir()
+
+    # An index that is not JSON (e.g. a pickle file) is ignored, as is an entry that does not deserialize.
+    index_file.write_bytes(pickle.dumps({"format": ChangelogIndex.FORMAT, "entries": {}}))
+    assert ChangelogIndex(index_file)._entries == {}
+    stat = manager.unreleased().path.stat()
+    entries = {"_unreleased.toml": [stat.st_mtime_ns, stat.st_size, {"entries": "not a list"}]}
+    index_file.write_text(json.dumps({"format": ChangelogIndex.FORMAT, "entries": entries}))
+    assert ChangelogIndex(index_file).get("_unreleased.toml", stat) is None
+    manager = make_manager(tmp_path)
+    assert [e.id for e in manager.unreleased().content.entries] == ["id-x"]
+
+
+def test__ChangelogManager__preload_in_worker_processes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import tomli
+
+    from slap import changelog as changelog_module
+
+    monkeypatch.setattr(changelog_module, "PARALLEL_LOAD_THRESHOLD", 2)
+    manager = make_manager(tmp_path)
+    for minor in range(10):
+        entries = [ChangelogEntry(f"id-{minor}-{i}", "fix", f"Fix {i}", "@me", issues=[f"#{i}"]) for i in range(5)]
+        manager.version(f"1.{minor}.0").save(Changelog(entries, datetime.date(2022, 1, minor + 1)))
+    manager.version("2.0.0").path.write_text("entries = [")
+
+    # Without a cache directory, #ChangelogManager.all() does not load the changelogs.
+    reader = ChangelogManager(manager.directory, None)
+    changelogs = reader.all()
+    reader.preload(changelogs, jobs=2)
+    assert [c.path.name for c in changelogs if c._content is None] == ["2.0.0.toml"]
+    assert [c.content for c in changelogs[1:]] == [manager.load(c.path) for c in changelogs[1:]]
+    with pytest.raises(tomli.TOMLDecodeError):
+        changelogs[0].load()
+
+
+def test__load_changelog_file__only_ignores_invalid_files(tmp_path: Path) -> None:
+    from slap.changelog import _load_changelog_file
+
+    deser = TomlChangelogDeser()
+    (tmp_path / "decode.toml").write_text("entries = [")
+    (tmp_path / "convert.toml").write_text("entries = 1")
+    assert _load_changelog_file(deser, tmp_path / "decode.toml") is None
+    assert _load_changelog_file(deser, tmp_path / "convert.toml") is None
+    assert _load_changelog_file(deser, tmp_path / "missing.toml") is None
+
+    class BrokenDeser(TomlChangelogDeser):
+        def load(self, _fp: t.TextIO, _filename: str) -> Changelog:
+            raise RuntimeError("bug")
+
+    with pytest.raises(RuntimeError, match="bug"):
+        _load_changelog_file(BrokenDeser(), tmp_path / "decode.toml")
+
+
+def test__ChangelogManager__validate_entries_normalizes_each_reference_once() -> None:
+    from slap.repository import Issue, PullRequest, RepositoryHost
+
+    lookups: list[str] = []
+    batches: list[list[str]] = []
+
+    class FakeRepositoryHost(RepositoryHost):
+        def get_issue_by_reference(self, reference: str) -> Issue:
+            lookups.append(reference)
+            if not reference.startswith("#"):
+                raise ValueError(f"bad reference: {reference!r}")
+            return Issue(reference[1:], f"https://example.org/issues/{reference[1:]}", reference)
+
+        def get_issues_by_reference(self, references: t.Sequence[str]) -> list[Issue | ValueError]:
+            batches.append(list(references))
+            return super().get_issues_by_reference(references)
+
+        def get_pull_request_by_reference(self, reference: str) -> PullRequest:
+            issue = self.get_issue_by_reference(reference)
+            return PullRequest(issue.id, issue.url, issue.shortform)
+
+        get_username = comment_on_issue = create_release = detect_repository_host = None  # type: ignore[assignment]
+
+    manager = ChangelogManager(Path(), FakeRepositoryHost())
+    entries = [ChangelogEntry(str(i), "fix", "Fix", "@me", pr="#1", issues=["#2", "#3"]) for i in range(100)]
+    entries.extend(
+        [
+            ChangelogEntry("bad-1", "fix", "Fix", "@me", issues=["2"]),
+            ChangelogEntry("bad-2", "fix", "Fix", None, issues=["#2"]),
+            ChangelogEntry("bad-3", "fix", "Fix", "@me", issues=["2"]),
+        ]
+    )
+
+    errors = manager.validate_entries(entries)
+    assert errors[:100] == [None] * 100
+    assert [str(error) for error in errors[100:]] == [
+        "bad reference: '2'",
+        'entry has no "author" or "authors"',
+        "bad reference: '2'",
+    ]
+    assert sorted(lookups) == ["#1", "#2", "#3", "2"]
+    assert batches == [["#2", "#3", "2"]]
+    assert entries[0].pr == "https://example.org/issues/1"
+    assert entries[0].issues == ["https://example.org/issues/2", "https://example.org/issues/3"]
+
+    # Resolved references are memoized on the repository host.
+    manager.validate_entries([ChangelogEntry("x", "fix", "Fix", "@me", pr="#1", issues=["#3", "2"])])
+    assert sorted(lookups) == ["#1", "#2", "#3", "2"]
+
+
+def test__Changelog__find_entry_stays_in_sync_with_entries() -> None:
+    changelog = Changelog([ChangelogEntry(str(i), "fix", f"Fix {i}", "@me") for i in range(5)])
+    changelog.entries.append(ChangelogEntry("1", "fix", "Duplicate", "@me"))
+    assert changelog.find_entry("1") is changelog.entries[1]
+    assert changelog.find_entry("5") is None
+
+    # Misses do not rebuild the index.
+    index = changelog._entry_index
+    assert changelog.find_entry("7") is None
+    assert changelog._entry_index == index
+
+    changelog.entries.append(ChangelogEntry("5", "fix", "Fix 5", "@me"))
+    assert changelog.find_entry("5") is changelog.entries[-1]
+    del changelog.entries[0]
+    assert changelog.find_entry("1") is changelog.entries[0]
+    assert changelog.find_entry("0") is None
+    changelog.entries[0] = ChangelogEntry("6", "fix", "Fix 6", "@me")
+    assert changelog.find_entry("1") is changelog.entries[4]
+    changelog.invalidate_entry_index()
+    assert changelog.find_entry("6") is changelog.entries[0]
+    changelog.entries = []
+    assert changelog.find_entry("6") is None
+
+
+def test__ManagedChangelog__add_entry_appends_to_the_changelog_file(tmp_path: Path) -> None:
+    manager = ChangelogManager(tmp_path, None)
+    unreleased = manager.unreleased()
+    entries = [ChangelogEntry(str(i), "fix", f'Fix "{i}"\nin two lines', "@me", issues=["#1"]) for i in range(3)]
+    for entry in entries:
+        assert unreleased.add_entry(entry) == unreleased.path
+    assert unreleased.path.read_text() == manager.deser.dump(Changelog(entries))
+    assert unreleased.load(reload=True) == Changelog(entries)
+
+    # Files that do not end with a newline are continued correctly.
+    unreleased.path.write_text(unreleased.path.read_text().rstrip())
+    entries.append(ChangelogEntry("3", "feature", "Feature", "@me"))
+    unreleased.add_entry(entries[-1])
+    assert unreleased.load(reload=True) == Changelog(entries)
+
+    # An inline array of entries cannot be appended to, so the whole file is written.
+    unreleased.path.write_text('entries = [{id = "0", type = "fix", description = "Fix", author = "@me"}]\n')
+    unreleased.add_entry(entries[1])
+    assert unreleased.path.read_text() == manager.deser.dump(
+        Changelog([ChangelogEntry("0", "fix", "Fix", "@me"), *entries[1:2]])
+    )
+
+
+def test__ChangelogManager__entry_files(tmp_path: Path) -> None:
+    manager = make_manager(tmp_path)
+    manager.entry_files = True
+    unreleased = manager.unreleased()
+    assert not unreleased.exists()
+    unreleased.save(Changelog([ChangelogEntry("a", "fix", "Fix", "@me")]))
+    (path_a,) = unreleased.files()
+    assert path_a.parent == manager.directory / "_unreleased"
+    assert path_a.name.endswith("Z-a.toml")
+
+    # Entries in the changelog file and in entry files are combined. Entry files are read in the order in which
+    # they were added, regardless of their ID.
+    manager.entry_files = False
+    manager.save(Changelog([ChangelogEntry("b", "fix", "Fix", "@me")]), unreleased.path)
+    manager.entry_files = True
+    path_0 = unreleased.add_entry(ChangelogEntry("0", "fix", "Fix", "@me"))
+    assert path_0.parent == manager.directory / "_unreleased"
+    assert path_0.name > path_a.name
+    reader = make_manager(tmp_path)
+    assert [e.id for e in reader.unreleased().load().entries] == ["b", "a", "0"]
+    assert [[e.id for e in c.content.entries] for c in reader.all()] == [["b", "a", "0"]]
+
+    # Saving writes only the files of changed entries, every entry stays in its file.
+    files = {path: path.read_text() for path in unreleased.files()}
+    changelog = reader.unreleased().load()
+    changelog.entries[0].pr = "https://example.org/pull/1"
+    changelog.entries.append(ChangelogEntry("c", "fix", "Fix", "@me"))
+    unreleased.save(changelog)
+    assert unreleased.path.read_text() == manager.deser.dump(Changelog(changelog.entries[:1]))
+    assert all(path.read_text() == text for path, text in files.items() if path != unreleased.path)
+    assert [p.name.split("Z-")[-1] for p in unreleased.files()] == ["_unreleased.toml", "a.toml", "0.toml", "c.toml"]
+    assert unreleased.load(reload=True).entries == changelog.entries
+
+    # Removing an entry removes its entry file.
+    del changelog.entries[1]
+    unreleased.save(changelog)
+    assert [p.name.split("Z-")[-1] for p in unreleased.files()] == ["_unreleased.toml", "0.toml", "c.toml"]
+    assert unreleased.load(reload=True).entries == changelog.entries
+
+    # Migrating moves the entries of the changelog file into entry files and keeps their order.
+    paths = unreleased.entry_paths()
+    assert [p.name.split("Z-")[1] for p in unreleased.migrate_to_entry_files()] == ["b.toml", "0.toml", "c.toml"]
+    assert not unreleased.path.exists()
+    assert not any(path.exists() for path in paths)
+    assert unreleased.load(reload=True).entries == changelog.entries
+
+    # Entries that do not change their position keep their file.
+    paths = unreleased.files()
+    assert unreleased.migrate_to_entry_files() == []
+    assert unreleased.files() == paths
+
+    # Releasing the changelog includes all entries.
+    unreleased.release("1.0.0")
+    assert not unreleased.exists()
+    assert unreleased.files() == []
+    assert manager.version("1.0.0").load().entries == changelog.entries
+
+    with pytest.raises(ValueError, match="cannot be used as a filename"):
+        manager.get_entry_path(ChangelogEntry("../a", "fix", "Fix", "@me"))
+
+
+def test__changelog_from_index_data__is_the_inverse_of_the_object_mapper() -> None:
+    import dataclasses
+
+    from slap.changelog import _changelog_from_index_data, _get_entry_value_types, _get_object_mapper
+
+    # An entry that sets every field to a value that is not the default, so that new fields are covered as well.
+    values: dict[str, t.Any] = {}
+    for field in dataclasses.fields(ChangelogEntry):
+        value_type, _ = _get_entry_value_types()[field.name]
+        values[field.name] = [f"{field.name}-1", f"{field.name}-2"] if value_type is list else f"{field.name}-value"
+        assert values[field.name] != field.default
+    changelog = Changelog(
+        [ChangelogEntry(**values), ChangelogEntry("b", "feature", "Feature")],
+        datetime.date(2022, 1, 2),
+    )
+
+    mapper = _get_object_mapper()
+    for value in (changelog, Changelog()):
+        data = json.loads(json.dumps(mapper.serialize(value, Changelog)))
+        assert _changelog_from_index_data(data) == mapper.deserialize(data, Changelog) == value
+
+    data = mapper.serialize(changelog, Changelog)
+    data["entries"][0]["issues"] = [1]
+    with pytest.raises(ValueError, match="field 'issues'"):
+        _changelog_from_index_data(data)
+    data = mapper.serialize(changelog, Changelog)
+    data["entries"][1]["id"] = None
+    with pytest.raises(ValueError, match="field 'id'"):
+        _changelog_from_index_data(data)
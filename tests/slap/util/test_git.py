@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+from slap.util.git import Git, GitError
+
+
+def init_repository(path: Path) -> Git:
+    git = Git(path)
+    git.check_call(["git", "init", "-q", "."])
+    git.check_call(["git", "config", "user.name", "Test"])
+    git.check_call(["git", "config", "user.email", "test@example.org"])
+    return git
+
+
+def test__Git__get_files_contents(tmp_path: Path) -> None:
+    git = init_repository(tmp_path)
+    (tmp_path / "a.txt").write_bytes(b"first\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.bin").write_bytes(b"\x00\nmissing\n\n")
+    git.add(["a.txt", "sub/b.bin"])
+    git.commit("first")
+    first = git.rev_parse("HEAD")
+    assert first is not None
+    (tmp_path / "a.txt").write_bytes(b"second")
+    (tmp_path / "c.txt").write_bytes(b"")
+    git.add(["a.txt", "c.txt"])
+    git.commit("second")
+
+    files = [
+        (str(tmp_path / "a.txt"), first),
+        (str(tmp_path / "a.txt"), "HEAD"),
+        (str(tmp_path / "sub" / "b.bin"), "HEAD"),
+        (str(tmp_path / "c.txt"), first),
+        (str(tmp_path / "c.txt"), "HEAD"),
+    ]
+    assert git.get_files_contents(files) == [b"first\n", b"second", b"\x00\nmissing\n\n", None, b""]
+    assert git.get_files_contents(files) == [
+        git.get_file_contents(file, revision) if revision == "HEAD" or file.endswith("a.txt") else None
+        for file, revision in files
+    ]
+    assert git.get_files_contents([]) == []
+
+    with pytest.raises(GitError):
+        git.get_files_contents([(str(tmp_path / "a.txt"), "does-not-exist")])
+
+
+def test__Git__reuses_cat_file_session(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    git = init_repository(tmp_path)
+    for i in range(20):
+        (tmp_path / f"file-{i}.txt").write_text(f"{i}\n" * i)
+    git.add([f"file-{i}.txt" for i in range(20)])
+    git.commit("files")
+
+    session = git.cat_file("--batch")
+    with ThreadPoolExecutor(8) as executor:
+        contents = list(
+            executor.map(lambda i: git.get_file_contents(str(tmp_path / f"file-{i % 20}.txt"), "HEAD"), range(400))
+        )
+    assert contents == [f"{i % 20}\n".encode() * (i % 20) for i in range(400)]
+    assert git.cat_file("--batch") is session
+    assert session.is_alive()
+
+    info = git.get_object_info("HEAD:file-3.txt")
+    assert info is not None
+    assert info[1:] == ("blob", 6)
+    assert git.get_object_info("HEAD:file-20.txt") is None
+    with pytest.raises(FileNotFoundError):
+        git.get_file_contents(str(tmp_path / "file-20.txt"), "HEAD")
+    with pytest.raises(GitError):
+        git.get_file_contents(str(tmp_path / "file-1.txt"), "does-not-exist")
+
+    # A terminated session is replaced with a new one.
+    git.close()
+    assert not session.is_alive()
+    assert git.get_file_contents(str(tmp_path / "file-2.txt"), "HEAD") == b"2\n2\n"
+    assert git.cat_file("--batch") is not session
+    git.close()
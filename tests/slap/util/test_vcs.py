@@ -0,0 +1,51 @@
+import typing as t
+from pathlib import Path
+
+from slap.util.vcs import Author, FileInfo, Remote, Vcs
+
+
+class DictVcs(Vcs):
+    """A minimal #Vcs that only implements the abstract methods, like a third-party implementation would."""
+
+    def __init__(self, files: dict[str, dict[Path, bytes]]) -> None:
+        self.files = files
+
+    def get_toplevel(self) -> Path:
+        return Path("/repo")
+
+    def get_web_url(self) -> str | None:
+        return None
+
+    def get_remotes(self) -> t.Sequence[Remote]:
+        return []
+
+    def get_current_branch(self) -> str | None:
+        return None
+
+    def get_author(self) -> Author:
+        return Author(None, None)
+
+    def get_all_files(self) -> t.Sequence[Path]:
+        return list(self.files["WORKTREE"])
+
+    def get_changed_files(self) -> t.Sequence[FileInfo]:
+        return []
+
+    def get_file_contents(self, file: Path, revision: str) -> bytes | None:
+        return self.files[revision].get(file)
+
+    def commit_files(self, files: t.Sequence[Path], commit_message: str, **kwargs: t.Any) -> None:
+        raise NotImplementedError
+
+
+def test__Vcs__get_files_at_revision__default_implementation() -> None:
+    unreleased = Path("/repo/.changelog/_unreleased")
+    vcs = DictVcs(
+        {
+            "WORKTREE": {unreleased / "a.toml": b"", unreleased / "b.toml": b"", Path("/repo/README.md"): b""},
+            "HEAD": {unreleased / "a.toml": b"", Path("/repo/README.md"): b""},
+        }
+    )
+    assert vcs.get_files_at_revision("HEAD", [unreleased]) == [unreleased / "a.toml"]
+    assert vcs.get_files_at_revision("WORKTREE", [unreleased]) == [unreleased / "a.toml", unreleased / "b.toml"]
+    assert vcs.get_files_at_revision("HEAD", []) == []